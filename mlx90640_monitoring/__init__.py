@@ -0,0 +1,8 @@
+"""
+Overheat monitoring and thermal imaging with the MLX90640 camera.
+
+The programs are the ``main()`` of :mod:`.monitoring`, :mod:`.image_VFINAL`,
+:mod:`.replay`, :mod:`.batch`, :mod:`.tune` and :mod:`.benchmark`, installed
+as the ``mlx-*`` commands. Nothing is imported here, so each program only
+pays for the modules it uses at start-up.
+"""
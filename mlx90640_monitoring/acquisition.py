@@ -0,0 +1,190 @@
+"""
+Supervised frame acquisition.
+
+:class:`SensorSupervisor` wraps ``MLX90640.getFrame`` and turns I2C glitches
+into a short recovery instead of a crash and a restart. Errors are
+classified, retried with bounded exponential backoff and, when the bus or
+the sensor state is suspect, the bus is re-opened and the control register
+(refresh rate, resolution, reading pattern) written back with
+``MLX90640.reconnect``. The calibration extracted at start-up is kept, so
+a recovery costs a few I2C transactions instead of a full EEPROM read and
+parameter extraction. While a fault lasts, ``on_fault`` is called on the
+first failure and then every ``fault_interval`` seconds, so an outage shows
+up while it is happening and not only once it is over.
+"""
+
+import time
+
+from .adafruitmlx90640_librairie import FrameError, FrameTimeoutError
+
+try:
+    from typing import Callable, Dict, List, Optional
+except ImportError:
+    pass
+
+# Error classes, in increasing order of how much state has to be restored
+DATA = "data"  # Corrupted words made the conversion fail (math domain error...)
+FRAME = "frame"  # The sensor overwrote the subpage while it was being read
+TIMEOUT = "timeout"  # No new data flagged: the sensor lost its configuration
+BUS = "bus"  # I2C transaction failed (NACK, remote I/O error, bus stuck)
+
+
+def classify(error: Exception) -> Optional[str]:
+    """Error class of an exception raised by ``getFrame``, or None when it
+    is not an acquisition fault and must propagate."""
+    if isinstance(error, FrameTimeoutError):
+        return TIMEOUT
+    if isinstance(error, FrameError):
+        return FRAME
+    if isinstance(error, OSError):
+        return BUS
+    if isinstance(error, (ValueError, ZeroDivisionError, OverflowError)):
+        return DATA
+    return None
+
+
+class SensorSupervisor:
+    """Reads frames from an ``MLX90640``, recovering from acquisition faults.
+
+    :param mlx: the sensor driver, already configured.
+    :param bus: the I2C bus the driver currently uses.
+    :param open_bus: callable returning a freshly opened I2C bus.
+    :param base_backoff: first retry delay in seconds.
+    :param max_backoff: upper bound of the retry delay in seconds.
+    :param max_failures: consecutive failures before the last error is
+        re-raised, None to retry forever.
+    :param fault_interval: seconds between two ``on_fault`` calls during the
+        same fault.
+    :param clock: monotonic clock, replaceable by simulated time.
+    :param sleep: sleep function, replaceable by simulated time.
+    """
+
+    def __init__(
+        self,
+        mlx,
+        bus,
+        open_bus: Callable[[], object],
+        base_backoff: float = 0.05,
+        max_backoff: float = 5.0,
+        max_failures: Optional[int] = None,
+        fault_interval: float = 60.0,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+    ) -> None:
+        self.mlx = mlx
+        self.bus = bus
+        self.open_bus = open_bus
+        self.base_backoff = base_backoff
+        self.max_backoff = max_backoff
+        self.max_failures = max_failures
+        self.fault_interval = fault_interval
+        self.clock = clock
+        self.sleep = sleep
+        # Called with (error class, consecutive failures, seconds since the fault started, error)
+        self.on_fault: Optional[Callable[[str, int, float, Exception], None]] = None
+
+        self.faults: Dict[str, int] = {DATA: 0, FRAME: 0, TIMEOUT: 0, BUS: 0}
+        self.reconnects = 0
+        self.recoveries = 0
+        self.last_recovery_time = 0.0
+        self.max_recovery_time = 0.0
+
+    def read(self, framebuf: List[float]) -> Optional[float]:
+        """Fill ``framebuf`` with the next frame. Returns the time in seconds
+        spent recovering when this read ended a fault, None otherwise."""
+        failures = 0
+        fault_start = None
+        last_report = None
+        needs_reconnect = False
+
+        while True:
+            try:
+                if needs_reconnect:
+                    self._reconnect()
+                    needs_reconnect = False
+                self.mlx.getFrame(framebuf)
+            except Exception as e:  # noqa: BLE001
+                if needs_reconnect and isinstance(e, (OSError, ValueError, RuntimeError)):
+                    kind = BUS  # Re-opening failed, the device did not answer the probe
+                else:
+                    kind = classify(e)
+                if kind is None:
+                    raise
+                self.faults[kind] += 1
+                failures += 1
+                now = self.clock()
+                if fault_start is None:
+                    fault_start = now
+                if self.on_fault is not None and (last_report is None or now - last_report >= self.fault_interval):
+                    last_report = now
+                    self.on_fault(kind, failures, now - fault_start, e)
+                if self.max_failures is not None and failures >= self.max_failures:
+                    raise
+
+                # A corrupted frame is simply read again. Anything that may have
+                # left the bus or the sensor in a bad state, or a frame error
+                # that keeps repeating, gets the bus re-opened.
+                if kind in (BUS, TIMEOUT) or failures >= 3:
+                    needs_reconnect = True
+                if kind != DATA or failures > 1:
+                    self.sleep(min(self.base_backoff * (1 << min(failures - 1, 16)), self.max_backoff))
+                continue
+
+            if fault_start is None:
+                return None
+            elapsed = self.clock() - fault_start
+            self.recoveries += 1
+            self.last_recovery_time = elapsed
+            self.max_recovery_time = max(self.max_recovery_time, elapsed)
+            return elapsed
+
+    def _reconnect(self) -> None:
+        try:
+            self.bus.deinit()
+        except Exception:  # noqa: BLE001
+            pass  # The old bus may already be unusable
+        self.bus = self.open_bus()
+        self.mlx.reconnect(self.bus)
+        self.reconnects += 1
+
+
+class PollSchedule:
+    """Cadence at which a site takes its frames.
+
+    Combined with ``MLX90640.step_mode``, the sensor measures only for the
+    frames actually taken, e.g. one every 5 s for a rack checked at low duty
+    cycle, and faster while an alarm is building up.
+
+    :param interval: seconds from the start of one frame to the start of the
+        next, 0 to take frames back to back.
+    :param alert_interval: cadence while :meth:`wait` is told of an alert,
+        None to keep ``interval``.
+    :param clock: monotonic clock, replaceable by simulated time.
+    :param sleep: sleep function, replaceable by simulated time.
+    """
+
+    def __init__(
+        self,
+        interval: float,
+        alert_interval: Optional[float] = None,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+    ) -> None:
+        self.interval = interval
+        self.alert_interval = alert_interval
+        self.clock = clock
+        self.sleep = sleep
+        self._last: Optional[float] = None
+
+    def wait(self, alert: bool = False) -> float:
+        """Sleep until the next frame is due. Returns the seconds slept."""
+        interval = self.interval
+        if alert and self.alert_interval is not None:
+            interval = self.alert_interval
+        now = self.clock()
+        delay = 0.0 if self._last is None else max(0.0, self._last + interval - now)
+        if delay:
+            self.sleep(delay)
+        # A late frame delays the next ones instead of bunching them up
+        self._last = now + delay
+        return delay
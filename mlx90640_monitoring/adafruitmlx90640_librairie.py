@@ -0,0 +1,1286 @@
+# SPDX-FileCopyrightText: 2019 ladyada for Adafruit Industries
+#
+# SPDX-License-Identifier: MIT
+
+"""
+`adafruit_mlx90640`
+================================================================================
+
+Driver for the MLX90640 thermal camera
+
+
+* Author(s): ladyada
+
+Implementation Notes
+--------------------
+
+**Software and Dependencies:**
+
+* Adafruit CircuitPython firmware for the supported boards:
+  https://github.com/adafruit/circuitpython/releases
+* Adafruit's Bus Device library: https://github.com/adafruit/Adafruit_CircuitPython_BusDevice
+* Adafruit's Register library: https://github.com/adafruit/Adafruit_CircuitPython_Register
+"""
+
+import math
+import struct
+import time
+from array import array
+
+from adafruit_bus_device.i2c_device import I2CDevice
+
+try:
+    import numpy as np
+except ImportError:
+    np = None  # CircuitPython: the per-pixel loops are used instead
+
+try:
+    from typing import List, Optional, Tuple, Union
+
+    from busio import I2C
+except ImportError:
+    pass
+
+__version__ = "0.0.0+auto.0"
+__repo__ = "https://github.com/adafruit/Adafruit_CircuitPython_MLX90640.git"
+
+# We match the melexis library naming, and don't want to change
+
+I2C_READ_LEN = 2048
+SCALEALPHA = 0.000001
+MLX90640_DEVICEID1 = 0x2407
+OPENAIR_TA_SHIFT = 8
+
+
+class FrameError(RuntimeError):
+    """Raised when a subpage could not be read consistently from the sensor."""
+
+
+class FrameTimeoutError(FrameError):
+    """Raised when the sensor does not flag new data within two subpage
+    periods, e.g. after a power glitch reset its control register."""
+
+
+class RefreshRate:
+    """Enum-like class for MLX90640's refresh rate"""
+
+    REFRESH_0_5_HZ = 0b000  # 0.5Hz
+    REFRESH_1_HZ = 0b001  # 1Hz
+    REFRESH_2_HZ = 0b010  # 2Hz
+    REFRESH_4_HZ = 0b011  # 4Hz
+    REFRESH_8_HZ = 0b100  # 8Hz
+    REFRESH_16_HZ = 0b101  # 16Hz
+    REFRESH_32_HZ = 0b110  # 32Hz
+    REFRESH_64_HZ = 0b111  # 64Hz
+
+
+class Resolution:
+    """Enum-like class for MLX90640's ADC resolution"""
+
+    ADC_16_BIT = 0b00
+    ADC_17_BIT = 0b01
+    ADC_18_BIT = 0b10  # Factory calibration
+    ADC_19_BIT = 0b11
+
+
+class ReadingPattern:
+    """Enum-like class for MLX90640's reading pattern"""
+
+    INTERLEAVED = 0
+    CHESS = 1  # Factory calibration
+
+
+class Calibration:
+    """Parameters extracted from the 832-word EEPROM image of one sensor.
+
+    Scalars keep the Melexis names. The per-pixel ``alpha``, ``offset``,
+    ``kta`` and ``kv`` are typed contiguous arrays (``array.array``) rather
+    than lists of boxed ints: a calibration takes about 14KB instead of
+    some 80KB, and NumPy can view the tables without copying
+    (``numpy.frombuffer``).
+
+    With NumPy, the per-pixel tables and the deviating pixels are decoded
+    for the whole image at once (``bulk``), which yields the same values as
+    the per-pixel loops kept for boards without NumPy.
+
+    Broken and outlier pixels are flagged in ``badPixelMask``, one byte per
+    pixel. Each of them is interpolated from its valid neighbours:
+    ``defectPixels[i]`` is the average of pixels
+    ``defectNeighbours[4 * i : 4 * i + 4]`` weighted by ``defectWeights``
+    (weight 0 for the padding of pixels with fewer neighbours)."""
+
+    __slots__ = (
+        "kVdd",
+        "vdd25",
+        "KvPTAT",
+        "KtPTAT",
+        "vPTAT25",
+        "alphaPTAT",
+        "gainEE",
+        "tgc",
+        "KsTa",
+        "resolutionEE",
+        "calibrationModeEE",
+        "ksTo",
+        "ct",
+        "alpha",
+        "alphaScale",
+        "offset",
+        "kta",
+        "ktaScale",
+        "kv",
+        "kvScale",
+        "cpAlpha",
+        "cpOffset",
+        "ilChessC",
+        "brokenPixels",
+        "outlierPixels",
+        "badPixelMask",
+        "defectPixels",
+        "defectNeighbours",
+        "defectWeights",
+        "cpKta",
+        "cpKv",
+    )
+
+    def __init__(self, eeData: List[int], bulk: bool = np is not None) -> None:
+        self.ksTo = [0] * 5
+        self.ct = [0] * 5
+        self.alpha = array("i", bytes(4 * 768))  # Scaled by 2**alphaScale, < 65536
+        self.offset = array("i", bytes(4 * 768))
+        self.kta = array("h", bytes(2 * 768))  # Scaled by 2**ktaScale, |kta| < 128
+        self.kv = array("h", bytes(2 * 768))  # Scaled by 2**kvScale, |kv| < 128
+        self.cpAlpha = [0] * 2
+        self.cpOffset = [0] * 2
+        self.brokenPixels = []
+        self.outlierPixels = []
+        self._ExtractParameters(eeData, bulk)
+
+    def _ExtractParameters(self, eeData: List[int], bulk: bool = False) -> None:
+        self._ExtractVDDParameters(eeData)
+        self._ExtractPTATParameters(eeData)
+        self._ExtractGainParameters(eeData)
+        self._ExtractTgcParameters(eeData)
+        self._ExtractResolutionParameters(eeData)
+        self._ExtractKsTaParameters(eeData)
+        self._ExtractKsToParameters(eeData)
+        self._ExtractCPParameters(eeData)
+        if bulk:
+            self._ExtractPixelParametersBulk(eeData)
+        else:
+            self._ExtractAlphaParameters(eeData)
+            self._ExtractOffsetParameters(eeData)
+            self._ExtractKtaPixelParameters(eeData)
+            self._ExtractKvPixelParameters(eeData)
+            self._ExtractDeviatingPixels(eeData)
+        self._ExtractCILCParameters(eeData)
+        self._BuildDefectCorrection()
+
+        # debug output
+        # print('-'*40)
+        # print("kVdd = %d, vdd25 = %d" % (self.kVdd, self.vdd25))
+        # print("KvPTAT = %f, KtPTAT = %f, vPTAT25 = %d, alphaPTAT = %f" %
+        #      (self.KvPTAT, self.KtPTAT, self.vPTAT25, self.alphaPTAT))
+        # print("Gain = %d, Tgc = %f, Resolution = %d" % (self.gainEE, self.tgc, self.resolutionEE))
+        # print("KsTa = %f, ksTo = %s, ct = %s" % (self.KsTa, self.ksTo, self.ct))
+        # print("cpAlpha:", self.cpAlpha, "cpOffset:", self.cpOffset)
+        # print("alpha: ", self.alpha)
+        # print("alphascale: ", self.alphaScale)
+        # print("offset: ", self.offset)
+        # print("kta:", self.kta)
+        # print("ktaScale:", self.ktaScale)
+        # print("kv:", self.kv)
+        # print("kvScale:", self.kvScale)
+        # print("calibrationModeEE:", self.calibrationModeEE)
+        # print("ilChessC:", self.ilChessC)
+        # print('-'*40)
+
+    def _ExtractVDDParameters(self, eeData: List[int]) -> None:
+        # extract VDD
+        self.kVdd = (eeData[51] & 0xFF00) >> 8
+        if self.kVdd > 127:
+            self.kVdd -= 256  # convert to signed
+        self.kVdd *= 32
+        self.vdd25 = eeData[51] & 0x00FF
+        self.vdd25 = ((self.vdd25 - 256) << 5) - 8192
+
+    def _ExtractPTATParameters(self, eeData: List[int]) -> None:
+        # extract PTAT
+        self.KvPTAT = (eeData[50] & 0xFC00) >> 10
+        if self.KvPTAT > 31:
+            self.KvPTAT -= 64
+        self.KvPTAT /= 4096
+        self.KtPTAT = eeData[50] & 0x03FF
+        if self.KtPTAT > 511:
+            self.KtPTAT -= 1024
+        self.KtPTAT /= 8
+        self.vPTAT25 = eeData[49]
+        self.alphaPTAT = (eeData[16] & 0xF000) / math.pow(2, 14) + 8
+
+    def _ExtractGainParameters(self, eeData: List[int]) -> None:
+        # extract Gain
+        self.gainEE = eeData[48]
+        if self.gainEE > 32767:
+            self.gainEE -= 65536
+
+    def _ExtractTgcParameters(self, eeData: List[int]) -> None:
+        # extract Tgc
+        self.tgc = eeData[60] & 0x00FF
+        if self.tgc > 127:
+            self.tgc -= 256
+        self.tgc /= 32
+
+    def _ExtractResolutionParameters(self, eeData: List[int]) -> None:
+        # extract resolution
+        self.resolutionEE = (eeData[56] & 0x3000) >> 12
+
+    def _ExtractKsTaParameters(self, eeData: List[int]) -> None:
+        # extract KsTa
+        self.KsTa = (eeData[60] & 0xFF00) >> 8
+        if self.KsTa > 127:
+            self.KsTa -= 256
+        self.KsTa /= 8192
+
+    def _ExtractKsToParameters(self, eeData: List[int]) -> None:
+        # extract ksTo
+        step = ((eeData[63] & 0x3000) >> 12) * 10
+        self.ct[0] = -40
+        self.ct[1] = 0
+        self.ct[2] = (eeData[63] & 0x00F0) >> 4
+        self.ct[3] = (eeData[63] & 0x0F00) >> 8
+        self.ct[2] *= step
+        self.ct[3] = self.ct[2] + self.ct[3] * step
+
+        KsToScale = (eeData[63] & 0x000F) + 8
+        KsToScale = 1 << KsToScale
+
+        self.ksTo[0] = eeData[61] & 0x00FF
+        self.ksTo[1] = (eeData[61] & 0xFF00) >> 8
+        self.ksTo[2] = eeData[62] & 0x00FF
+        self.ksTo[3] = (eeData[62] & 0xFF00) >> 8
+
+        for i in range(4):
+            if self.ksTo[i] > 127:
+                self.ksTo[i] -= 256
+            self.ksTo[i] /= KsToScale
+        self.ksTo[4] = -0.0002
+
+    def _ExtractCPParameters(self, eeData: List[int]) -> None:
+        # extract CP
+        offsetSP = [0] * 2
+        alphaSP = [0] * 2
+
+        alphaScale = ((eeData[32] & 0xF000) >> 12) + 27
+
+        offsetSP[0] = eeData[58] & 0x03FF
+        if offsetSP[0] > 511:
+            offsetSP[0] -= 1024
+
+        offsetSP[1] = (eeData[58] & 0xFC00) >> 10
+        if offsetSP[1] > 31:
+            offsetSP[1] -= 64
+        offsetSP[1] += offsetSP[0]
+
+        alphaSP[0] = eeData[57] & 0x03FF
+        if alphaSP[0] > 511:
+            alphaSP[0] -= 1024
+        alphaSP[0] /= math.pow(2, alphaScale)
+
+        alphaSP[1] = (eeData[57] & 0xFC00) >> 10
+        if alphaSP[1] > 31:
+            alphaSP[1] -= 64
+        alphaSP[1] = (1 + alphaSP[1] / 128) * alphaSP[0]
+
+        cpKta = eeData[59] & 0x00FF
+        if cpKta > 127:
+            cpKta -= 256
+        ktaScale1 = ((eeData[56] & 0x00F0) >> 4) + 8
+        self.cpKta = cpKta / math.pow(2, ktaScale1)
+
+        cpKv = (eeData[59] & 0xFF00) >> 8
+        if cpKv > 127:
+            cpKv -= 256
+        kvScale = (eeData[56] & 0x0F00) >> 8
+        self.cpKv = cpKv / math.pow(2, kvScale)
+
+        self.cpAlpha[0] = alphaSP[0]
+        self.cpAlpha[1] = alphaSP[1]
+        self.cpOffset[0] = offsetSP[0]
+        self.cpOffset[1] = offsetSP[1]
+
+    def _ExtractAlphaParameters(self, eeData: List[int]) -> None:
+        # extract alpha
+        accRemScale = eeData[32] & 0x000F
+        accColumnScale = (eeData[32] & 0x00F0) >> 4
+        accRowScale = (eeData[32] & 0x0F00) >> 8
+        alphaScale = ((eeData[32] & 0xF000) >> 12) + 30
+        alphaRef = eeData[33]
+        accRow = [0] * 24
+        accColumn = [0] * 32
+        alphaTemp = [0] * 768
+
+        for i in range(6):
+            p = i * 4
+            accRow[p + 0] = eeData[34 + i] & 0x000F
+            accRow[p + 1] = (eeData[34 + i] & 0x00F0) >> 4
+            accRow[p + 2] = (eeData[34 + i] & 0x0F00) >> 8
+            accRow[p + 3] = (eeData[34 + i] & 0xF000) >> 12
+
+        for i in range(24):
+            if accRow[i] > 7:
+                accRow[i] -= 16
+
+        for i in range(8):
+            p = i * 4
+            accColumn[p + 0] = eeData[40 + i] & 0x000F
+            accColumn[p + 1] = (eeData[40 + i] & 0x00F0) >> 4
+            accColumn[p + 2] = (eeData[40 + i] & 0x0F00) >> 8
+            accColumn[p + 3] = (eeData[40 + i] & 0xF000) >> 12
+
+        for i in range(32):
+            if accColumn[i] > 7:
+                accColumn[i] -= 16
+
+        for i in range(24):
+            for j in range(32):
+                p = 32 * i + j
+                alphaTemp[p] = (eeData[64 + p] & 0x03F0) >> 4
+                if alphaTemp[p] > 31:
+                    alphaTemp[p] -= 64
+                alphaTemp[p] *= 1 << accRemScale
+                alphaTemp[p] += (
+                    alphaRef + (accRow[i] << accRowScale) + (accColumn[j] << accColumnScale)
+                )
+                alphaTemp[p] /= math.pow(2, alphaScale)
+                alphaTemp[p] -= self.tgc * (self.cpAlpha[0] + self.cpAlpha[1]) / 2
+                alphaTemp[p] = SCALEALPHA / alphaTemp[p]
+        # print("alphaTemp: ", alphaTemp)
+
+        temp = max(alphaTemp)
+        # print("temp", temp)
+
+        alphaScale = 0
+        while temp < 32768:
+            temp *= 2
+            alphaScale += 1
+
+        for i in range(768):
+            temp = alphaTemp[i] * math.pow(2, alphaScale)
+            self.alpha[i] = int(temp + 0.5)
+
+        self.alphaScale = alphaScale
+
+    def _ExtractOffsetParameters(self, eeData: List[int]) -> None:
+        # extract offset
+        occRow = [0] * 24
+        occColumn = [0] * 32
+
+        occRemScale = eeData[16] & 0x000F
+        occColumnScale = (eeData[16] & 0x00F0) >> 4
+        occRowScale = (eeData[16] & 0x0F00) >> 8
+        offsetRef = eeData[17]
+        if offsetRef > 32767:
+            offsetRef -= 65536
+
+        for i in range(6):
+            p = i * 4
+            occRow[p + 0] = eeData[18 + i] & 0x000F
+            occRow[p + 1] = (eeData[18 + i] & 0x00F0) >> 4
+            occRow[p + 2] = (eeData[18 + i] & 0x0F00) >> 8
+            occRow[p + 3] = (eeData[18 + i] & 0xF000) >> 12
+
+        for i in range(24):
+            if occRow[i] > 7:
+                occRow[i] -= 16
+
+        for i in range(8):
+            p = i * 4
+            occColumn[p + 0] = eeData[24 + i] & 0x000F
+            occColumn[p + 1] = (eeData[24 + i] & 0x00F0) >> 4
+            occColumn[p + 2] = (eeData[24 + i] & 0x0F00) >> 8
+            occColumn[p + 3] = (eeData[24 + i] & 0xF000) >> 12
+
+        for i in range(32):
+            if occColumn[i] > 7:
+                occColumn[i] -= 16
+
+        for i in range(24):
+            for j in range(32):
+                p = 32 * i + j
+                self.offset[p] = (eeData[64 + p] & 0xFC00) >> 10
+                if self.offset[p] > 31:
+                    self.offset[p] -= 64
+                self.offset[p] *= 1 << occRemScale
+                self.offset[p] += (
+                    offsetRef + (occRow[i] << occRowScale) + (occColumn[j] << occColumnScale)
+                )
+
+    def _ExtractKtaPixelParameters(self, eeData: List[int]) -> None:
+        # extract KtaPixel
+        KtaRC = [0] * 4
+        ktaTemp = [0] * 768
+
+        KtaRoCo = (eeData[54] & 0xFF00) >> 8
+        if KtaRoCo > 127:
+            KtaRoCo -= 256
+        KtaRC[0] = KtaRoCo
+
+        KtaReCo = eeData[54] & 0x00FF
+        if KtaReCo > 127:
+            KtaReCo -= 256
+        KtaRC[2] = KtaReCo
+
+        KtaRoCe = (eeData[55] & 0xFF00) >> 8
+        if KtaRoCe > 127:
+            KtaRoCe -= 256
+        KtaRC[1] = KtaRoCe
+
+        KtaReCe = eeData[55] & 0x00FF
+        if KtaReCe > 127:
+            KtaReCe -= 256
+        KtaRC[3] = KtaReCe
+
+        ktaScale1 = ((eeData[56] & 0x00F0) >> 4) + 8
+        ktaScale2 = eeData[56] & 0x000F
+
+        for i in range(24):
+            for j in range(32):
+                p = 32 * i + j
+                split = 2 * (p // 32 - (p // 64) * 2) + p % 2
+                ktaTemp[p] = (eeData[64 + p] & 0x000E) >> 1
+                if ktaTemp[p] > 3:
+                    ktaTemp[p] -= 8
+                ktaTemp[p] *= 1 << ktaScale2
+                ktaTemp[p] += KtaRC[split]
+                ktaTemp[p] /= math.pow(2, ktaScale1)
+                # ktaTemp[p] = ktaTemp[p] * mlx90640->offset[p];
+
+        temp = abs(ktaTemp[0])
+        for kta in ktaTemp:
+            temp = max(temp, abs(kta))
+
+        ktaScale1 = 0
+        while temp < 64:
+            temp *= 2
+            ktaScale1 += 1
+
+        for i in range(768):
+            temp = ktaTemp[i] * math.pow(2, ktaScale1)
+            if temp < 0:
+                self.kta[i] = int(temp - 0.5)
+            else:
+                self.kta[i] = int(temp + 0.5)
+        self.ktaScale = ktaScale1
+
+    def _ExtractKvPixelParameters(self, eeData: List[int]) -> None:
+        KvT = [0] * 4
+        kvTemp = [0] * 768
+
+        KvRoCo = (eeData[52] & 0xF000) >> 12
+        if KvRoCo > 7:
+            KvRoCo -= 16
+        KvT[0] = KvRoCo
+
+        KvReCo = (eeData[52] & 0x0F00) >> 8
+        if KvReCo > 7:
+            KvReCo -= 16
+        KvT[2] = KvReCo
+
+        KvRoCe = (eeData[52] & 0x00F0) >> 4
+        if KvRoCe > 7:
+            KvRoCe -= 16
+        KvT[1] = KvRoCe
+
+        KvReCe = eeData[52] & 0x000F
+        if KvReCe > 7:
+            KvReCe -= 16
+        KvT[3] = KvReCe
+
+        kvScale = (eeData[56] & 0x0F00) >> 8
+
+        for i in range(24):
+            for j in range(32):
+                p = 32 * i + j
+                split = 2 * (p // 32 - (p // 64) * 2) + p % 2
+                kvTemp[p] = KvT[split]
+                kvTemp[p] /= math.pow(2, kvScale)
+                # kvTemp[p] = kvTemp[p] * mlx90640->offset[p];
+
+        temp = abs(kvTemp[0])
+        for kv in kvTemp:
+            temp = max(temp, abs(kv))
+
+        kvScale = 0
+        while temp < 64:
+            temp *= 2
+            kvScale += 1
+
+        for i in range(768):
+            temp = kvTemp[i] * math.pow(2, kvScale)
+            if temp < 0:
+                self.kv[i] = int(temp - 0.5)
+            else:
+                self.kv[i] = int(temp + 0.5)
+        self.kvScale = kvScale
+
+    def _ExtractCILCParameters(self, eeData: List[int]) -> None:
+        ilChessC = [0] * 3
+
+        self.calibrationModeEE = (eeData[10] & 0x0800) >> 4
+        self.calibrationModeEE = self.calibrationModeEE ^ 0x80
+
+        ilChessC[0] = eeData[53] & 0x003F
+        if ilChessC[0] > 31:
+            ilChessC[0] -= 64
+        ilChessC[0] /= 16.0
+
+        ilChessC[1] = (eeData[53] & 0x07C0) >> 6
+        if ilChessC[1] > 15:
+            ilChessC[1] -= 32
+        ilChessC[1] /= 2.0
+
+        ilChessC[2] = (eeData[53] & 0xF800) >> 11
+        if ilChessC[2] > 15:
+            ilChessC[2] -= 32
+        ilChessC[2] /= 8.0
+
+        self.ilChessC = ilChessC
+
+    def _ExtractDeviatingPixels(self, eeData: List[int]) -> None:
+        pixCnt = 0
+
+        while (pixCnt < 768) and (len(self.brokenPixels) < 5) and (len(self.outlierPixels) < 5):
+            if eeData[pixCnt + 64] == 0:
+                self.brokenPixels.append(pixCnt)
+            elif (eeData[pixCnt + 64] & 0x0001) != 0:
+                self.outlierPixels.append(pixCnt)
+            pixCnt += 1
+
+        self._CheckDeviatingPixels()
+
+    def _CheckDeviatingPixels(self) -> None:
+        if len(self.brokenPixels) > 4:
+            raise RuntimeError("More than 4 broken pixels")
+        if len(self.outlierPixels) > 4:
+            raise RuntimeError("More than 4 outlier pixels")
+        if (len(self.brokenPixels) + len(self.outlierPixels)) > 4:
+            raise RuntimeError("More than 4 faulty pixels")
+        # print("Found %d broken pixels, %d outliers"
+        #         % (len(self.brokenPixels), len(self.outlierPixels)))
+
+        for brokenPixel1, brokenPixel2 in self._UniqueListPairs(self.brokenPixels):
+            if self._ArePixelsAdjacent(brokenPixel1, brokenPixel2):
+                raise RuntimeError("Adjacent broken pixels")
+
+        for outlierPixel1, outlierPixel2 in self._UniqueListPairs(self.outlierPixels):
+            if self._ArePixelsAdjacent(outlierPixel1, outlierPixel2):
+                raise RuntimeError("Adjacent outlier pixels")
+
+        for brokenPixel in self.brokenPixels:
+            for outlierPixel in self.outlierPixels:
+                if self._ArePixelsAdjacent(brokenPixel, outlierPixel):
+                    raise RuntimeError("Adjacent broken and outlier pixels")
+
+    def _ExtractPixelParametersBulk(self, eeData: List[int]) -> None:
+        # alpha, offset, kta, kv and deviating pixels as decoded by the loops
+        # above, on the whole 24x32 image at once. Integer steps are exact and
+        # the float steps are the same operations in the same order, so the
+        # tables are identical.
+        ee = np.asarray(eeData, dtype=np.int64)
+        pixels = ee[64:832].reshape(24, 32)
+        # Signed nibbles of words 16 to 47: occRow, occColumn, accRow, accColumn
+        nibbles = (ee[16:48, None] >> np.array([0, 4, 8, 12])) & 0x000F
+        nibbles = ((nibbles ^ 8) - 8).reshape(-1)
+        # Index of the Kta/Kv constant of each pixel: row parity, column parity
+        split = 2 * (np.arange(24)[:, None] % 2) + np.arange(32) % 2
+
+        # alpha
+        accRemScale = eeData[32] & 0x000F
+        accColumnScale = (eeData[32] & 0x00F0) >> 4
+        accRowScale = (eeData[32] & 0x0F00) >> 8
+        alphaScale = ((eeData[32] & 0xF000) >> 12) + 30
+        alphaTemp = ((((pixels & 0x03F0) >> 4) ^ 32) - 32) * (1 << accRemScale)
+        alphaTemp += (
+            eeData[33]
+            + (nibbles[72:96, None] << accRowScale)
+            + (nibbles[96:128] << accColumnScale)
+        )
+        alphaTemp = alphaTemp / math.pow(2, alphaScale)
+        alphaTemp -= self.tgc * (self.cpAlpha[0] + self.cpAlpha[1]) / 2
+        alphaTemp = SCALEALPHA / alphaTemp
+
+        temp = float(alphaTemp.max())
+        alphaScale = 0
+        while temp < 32768:
+            temp *= 2
+            alphaScale += 1
+        alpha = (alphaTemp * math.pow(2, alphaScale) + 0.5).astype(np.int32)
+        np.frombuffer(self.alpha, dtype=np.int32)[:] = alpha.reshape(-1)
+        self.alphaScale = alphaScale
+
+        # offset
+        occRemScale = eeData[16] & 0x000F
+        occColumnScale = (eeData[16] & 0x00F0) >> 4
+        occRowScale = (eeData[16] & 0x0F00) >> 8
+        offsetRef = eeData[17]
+        if offsetRef > 32767:
+            offsetRef -= 65536
+        offset = ((((pixels & 0xFC00) >> 10) ^ 32) - 32) * (1 << occRemScale)
+        offset += (
+            offsetRef + (nibbles[8:32, None] << occRowScale) + (nibbles[32:64] << occColumnScale)
+        )
+        np.frombuffer(self.offset, dtype=np.int32)[:] = offset.reshape(-1)
+
+        # kta: KtaRoCo, KtaRoCe, KtaReCo, KtaReCe
+        KtaRC = np.array([eeData[54] >> 8, eeData[55] >> 8, eeData[54] & 0xFF, eeData[55] & 0xFF])
+        KtaRC = (KtaRC ^ 0x80) - 0x80
+        ktaScale1 = ((eeData[56] & 0x00F0) >> 4) + 8
+        ktaScale2 = eeData[56] & 0x000F
+        ktaTemp = ((((pixels & 0x000E) >> 1) ^ 4) - 4) * (1 << ktaScale2) + KtaRC[split]
+        ktaTemp = ktaTemp / math.pow(2, ktaScale1)
+        self.ktaScale = self._ScaleBulk(self.kta, ktaTemp)
+
+        # kv: KvRoCo, KvRoCe, KvReCo, KvReCe
+        KvT = (eeData[52] >> np.array([12, 4, 8, 0])) & 0x000F
+        KvT = (KvT ^ 8) - 8
+        kvScale = (eeData[56] & 0x0F00) >> 8
+        kvTemp = KvT[split] / math.pow(2, kvScale)
+        self.kvScale = self._ScaleBulk(self.kv, kvTemp)
+
+        # deviating pixels, scanned until either list holds 5 pixels
+        words = ee[64:832]
+        broken = np.flatnonzero(words == 0)
+        outliers = np.flatnonzero(words & 0x0001)
+        end = 768
+        for found in (broken, outliers):
+            if len(found) >= 5:
+                end = min(end, found[4] + 1)
+        self.brokenPixels = broken[broken < end].tolist()
+        self.outlierPixels = outliers[outliers < end].tolist()
+        self._CheckDeviatingPixels()
+
+    def _ScaleBulk(self, table: array, values) -> int:  # noqa: PLR6301
+        # Fixed point scaling of the kta/kv loops, largest magnitude in [64, 128).
+        # Fills the int16 table and returns the scale.
+        temp = float(np.abs(values).max())
+        scale = 0
+        while temp < 64:
+            temp *= 2
+            scale += 1
+        values = values * math.pow(2, scale)
+        values = np.where(values < 0, values - 0.5, values + 0.5).astype(np.int16)
+        np.frombuffer(table, dtype=np.int16)[:] = values.reshape(-1)
+        return scale
+
+    def _BuildDefectCorrection(self) -> None:
+        self.badPixelMask = bytearray(768)
+        for pixel in self.brokenPixels + self.outlierPixels:
+            self.badPixelMask[pixel] = 1
+
+        self.defectPixels = array("H")
+        self.defectNeighbours = array("H")
+        self.defectWeights = array("d")
+        for pixel in sorted(self.brokenPixels + self.outlierPixels):
+            row, column = divmod(pixel, 32)
+            # Direct neighbours; diagonal ones only when none is valid
+            for offsets in (
+                ((-1, 0), (1, 0), (0, -1), (0, 1)),
+                ((-1, -1), (-1, 1), (1, -1), (1, 1)),
+            ):
+                neighbours = [
+                    32 * (row + dy) + column + dx
+                    for dy, dx in offsets
+                    if 0 <= row + dy < 24
+                    and 0 <= column + dx < 32
+                    and not self.badPixelMask[32 * (row + dy) + column + dx]
+                ]
+                if neighbours:
+                    break
+            else:
+                continue  # Left at -273.15
+            self.defectPixels.append(pixel)
+            self.defectNeighbours.extend(neighbours + [neighbours[0]] * (4 - len(neighbours)))
+            self.defectWeights.extend(
+                [1 / len(neighbours)] * len(neighbours) + [0.0] * (4 - len(neighbours))
+            )
+
+    def _UniqueListPairs(self, inputList: List[int]) -> Tuple[int, int]:  # noqa: PLR6301
+        for i, listValue1 in enumerate(inputList):
+            for listValue2 in inputList[i + 1 :]:
+                yield listValue1, listValue2
+
+    def _ArePixelsAdjacent(self, pix1: int, pix2: int) -> bool:  # noqa: PLR6301
+        pixPosDif = pix1 - pix2
+
+        if -34 < pixPosDif < -30:
+            return True
+        if -2 < pixPosDif < 2:
+            return True
+        if 30 < pixPosDif < 34:
+            return True
+
+        return False
+
+
+class MLX90640:
+    """Interface to the MLX90640 temperature sensor."""
+
+    def __init__(self, i2c_bus: I2C, address: int = 0x33) -> None:
+        self.address = address
+        # Clock for subpage timestamps and timeouts, and sleep while waiting for
+        # a triggered measurement, replaceable by simulated time
+        self.clock = time.monotonic
+        self.sleep = time.sleep
+        self.subpage_times = [None, None]  # When each subpage was last read
+        self.subpages_read = 0
+        self.duplicated_subpages = 0  # Same subpage read twice in a row
+        self.dropped_subpages = 0  # Subpages the sensor produced but were never read
+        self._lastSubPage = None
+        self._emissivity = 0.95
+        self._reflectedTemperature = None
+        self._mapTerms = None  # (emissivity, tr, 1/emissivity, tr4 * (1 - 1/emissivity))
+        self._taTr = None  # (ta, taTr of each pixel)
+        # Interpolate broken and outlier pixels from their neighbours instead
+        # of leaving them at -273.15
+        self.correct_defects = True
+        # Integrity checks of each subpage (integrity.FrameValidator), None: off
+        self.validator = None
+        self.i2c_device = I2CDevice(i2c_bus, address)
+        eeData = array("H", bytes(2 * 832))
+        self._I2CReadWords(0x2400, eeData)
+        # print(eeData)
+        self.calibration = Calibration(eeData)
+        controlRegister = [0]
+        self._I2CReadWords(0x800D, controlRegister)
+        self._controlRegister = controlRegister[0]
+
+    def __getattr__(self, name: str):
+        # Calibration parameters stay readable under their Melexis names
+        if name in Calibration.__slots__:
+            return getattr(self.calibration, name)
+        raise AttributeError(name)
+
+    def reconnect(self, i2c_bus: I2C) -> None:
+        """Attach to a freshly opened bus after an I2C fault and write back the
+        last control register (refresh rate, resolution, reading pattern).
+        The calibration extracted at init is kept, the EEPROM is not re-read."""
+        self.i2c_device = I2CDevice(i2c_bus, self.address)
+        self._I2CWriteWord(0x800D, self._controlRegister)
+
+    @property
+    def serial_number(self) -> Tuple[int, int, int]:
+        """3-item tuple of hex values that are unique to each MLX90640"""
+        serialWords = [0, 0, 0]
+        self._I2CReadWords(MLX90640_DEVICEID1, serialWords)
+        return serialWords
+
+    @property
+    def refresh_rate(self) -> int:
+        """How fast the MLX90640 will spit out data. Start at lowest speed in
+        RefreshRate and then slowly increase I2C clock rate and rate until you
+        max out. The sensor does not like it if the I2C host cannot 'keep up'!"""
+        controlRegister = [0]
+        self._I2CReadWords(0x800D, controlRegister)
+        return (controlRegister[0] >> 7) & 0x07
+
+    @refresh_rate.setter
+    def refresh_rate(self, rate: int) -> None:
+        self._SetControlBits(0x0380, (rate & 0x7) << 7)
+
+    @property
+    def resolution(self) -> int:
+        """ADC resolution of the measurements, one of Resolution. Lower
+        resolutions are noisier; the factory calibration is done at 18 bits
+        and the Vdd compensation corrects for the difference."""
+        controlRegister = [0]
+        self._I2CReadWords(0x800D, controlRegister)
+        return (controlRegister[0] >> 10) & 0x03
+
+    @resolution.setter
+    def resolution(self, resolution: int) -> None:
+        self._SetControlBits(0x0C00, (resolution & 0x3) << 10)
+
+    @property
+    def reading_pattern(self) -> int:
+        """Which pixels belong to each subpage, one of ReadingPattern. The
+        factory calibration is done in chess mode; in interleaved mode the
+        EEPROM correction coefficients are applied during conversion."""
+        controlRegister = [0]
+        self._I2CReadWords(0x800D, controlRegister)
+        return (controlRegister[0] >> 12) & 0x01
+
+    @reading_pattern.setter
+    def reading_pattern(self, pattern: int) -> None:
+        self._SetControlBits(0x1000, (pattern & 0x1) << 12)
+
+    @property
+    def step_mode(self) -> bool:
+        """Triggered measurements. In step mode the sensor measures only when
+        asked: ``getFrame`` starts the measurement of each subpage and sleeps
+        through it, and the sensor stays idle between frames, so a slow
+        polling cadence costs no bus traffic, no host CPU spinning on the
+        data-ready bit and less self-heating than continuous measurements.
+        A frame then takes two :attr:`subpage_period` from the call."""
+        controlRegister = [0]
+        self._I2CReadWords(0x800D, controlRegister)
+        return bool(controlRegister[0] & 0x0002)
+
+    @step_mode.setter
+    def step_mode(self, enabled: bool) -> None:
+        self._SetControlBits(0x0002, 0x0002 if enabled else 0)
+
+    @property
+    def subpage_period(self) -> float:
+        """Seconds between two subpages at the configured refresh rate. A full
+        frame (both subpages) takes twice as long."""
+        return 2.0 / (1 << ((self._controlRegister >> 7) & 0x07))
+
+    @property
+    def emissivity(self) -> Union[float, Tuple[float, ...]]:
+        """Emissivity of the observed surfaces: one value for the whole scene
+        (0.95 by default) or a map of 768 values in frame order, e.g. to
+        measure aluminium casings (0.2 to 0.7) next to painted surfaces. Maps
+        are stored as tuples; assign a new map to change it."""
+        return self._emissivity
+
+    @emissivity.setter
+    def emissivity(self, emissivity: Union[float, List[float]]) -> None:
+        emissivity = self._PixelMap(emissivity)
+        for value in emissivity if isinstance(emissivity, tuple) else (emissivity,):
+            if not 0 < value <= 1:
+                raise ValueError("Emissivity must be in ]0, 1]")
+        self._emissivity = emissivity
+
+    @property
+    def reflected_temperature(self) -> Union[None, float, Tuple[float, ...]]:
+        """Temperature in C of the surroundings reflected by the observed
+        surfaces, one value or a map of 768 values in frame order. None (the
+        default) estimates it from the sensor ambient temperature, 8C lower
+        for a sensor in the open air."""
+        return self._reflectedTemperature
+
+    @reflected_temperature.setter
+    def reflected_temperature(self, tr: Union[None, float, List[float]]) -> None:
+        self._reflectedTemperature = None if tr is None else self._PixelMap(tr)
+
+    def pixel_age(self, now: Optional[float] = None) -> List[float]:
+        """Seconds since each of the 768 pixels was last read from the sensor,
+        measured on :attr:`clock`. A pixel whose subpage was never read is
+        infinitely old. Ages well above two :attr:`subpage_period` mean the
+        host is not keeping up with the refresh rate."""
+        if now is None:
+            now = self.clock()
+        ages = [math.inf, math.inf]
+        for subPage in range(2):
+            if self.subpage_times[subPage] is not None:
+                ages[subPage] = now - self.subpage_times[subPage]
+
+        chess = self._controlRegister & 0x1000
+        result = [0.0] * 768
+        for pixelNumber in range(768):
+            ilPattern = pixelNumber // 32 - (pixelNumber // 64) * 2
+            if chess:
+                result[pixelNumber] = ages[ilPattern ^ (pixelNumber % 2)]
+            else:
+                result[pixelNumber] = ages[ilPattern]
+        return result
+
+    def getFrame(self, framebuf: List[int]) -> None:
+        """Request both 'halves' of a frame from the sensor, merge them
+        and calculate the temperature in C for each of 32x24 pixels. Placed
+        into the 768-element array passed in!"""
+        mlx90640Frame = [0] * 834
+        validator = self.validator
+
+        for _ in range(2):
+            status = self._GetFrameData(mlx90640Frame)
+            if status < 0:
+                raise FrameError("Frame data error")
+            self._TrackSubPage(status, self.clock())
+            if validator is None:
+                self._CalculateTo(
+                    mlx90640Frame, self._emissivity, self._reflectedTemperature, framebuf
+                )
+                continue
+            validator.check_words(mlx90640Frame)
+            try:
+                self._CalculateTo(
+                    mlx90640Frame, self._emissivity, self._reflectedTemperature, framebuf
+                )
+            except (ValueError, ZeroDivisionError, OverflowError):
+                validator.restore(mlx90640Frame, framebuf)
+                raise
+            validator.check_temperatures(mlx90640Frame, framebuf)
+        if self.correct_defects:
+            self._CorrectDefects(framebuf)
+
+    def _CorrectDefects(self, framebuf: List[float]) -> None:
+        cal = self.calibration
+        if not cal.defectPixels:
+            return
+        if np is not None and isinstance(framebuf, np.ndarray):
+            neighbours = np.frombuffer(cal.defectNeighbours, dtype=np.uint16).reshape(-1, 4)
+            weights = np.frombuffer(cal.defectWeights).reshape(-1, 4)
+            framebuf[np.frombuffer(cal.defectPixels, dtype=np.uint16)] = (
+                framebuf[neighbours] * weights
+            ).sum(axis=1)
+            return
+        neighbours = cal.defectNeighbours
+        weights = cal.defectWeights
+        for i, pixel in enumerate(cal.defectPixels):
+            j = 4 * i
+            framebuf[pixel] = (
+                framebuf[neighbours[j]] * weights[j]
+                + framebuf[neighbours[j + 1]] * weights[j + 1]
+                + framebuf[neighbours[j + 2]] * weights[j + 2]
+                + framebuf[neighbours[j + 3]] * weights[j + 3]
+            )
+
+    def _GetFrameData(self, frameData: List[int]) -> int:
+        dataReady = 0
+        cnt = 0
+        statusRegister = [0]
+        controlRegister = [0]
+        stepMode = self._controlRegister & 0x0002
+        if stepMode:
+            # Start of measurement (with RAM overwrite enabled), then sleep
+            # through it instead of polling
+            self._I2CWriteWord(0x8000, 0x0030)
+            self.sleep(self.subpage_period)
+        deadline = self.clock() + 2 * self.subpage_period + 0.5
+
+        while dataReady == 0:
+            self._I2CReadWords(0x8000, statusRegister)
+            dataReady = statusRegister[0] & 0x0008
+            if not dataReady and self.clock() > deadline:
+                raise FrameTimeoutError("No new data from sensor")
+            if not dataReady and stepMode:
+                self.sleep(self.subpage_period / 32)
+            # print("ready status: 0x%x" % dataReady)
+
+        while (dataReady != 0) and (cnt < 5):
+            # Clears data ready; in step mode without starting a new measurement
+            self._I2CWriteWord(0x8000, 0x0010 if stepMode else 0x0030)
+            # print("Read frame", cnt)
+            self._I2CReadWords(0x0400, frameData, end=832)
+
+            self._I2CReadWords(0x8000, statusRegister)
+            dataReady = statusRegister[0] & 0x0008
+            # print("frame ready: 0x%x" % dataReady)
+            cnt += 1
+
+        if cnt > 4:
+            raise FrameError("Too many retries")
+
+        self._I2CReadWords(0x800D, controlRegister)
+        frameData[832] = controlRegister[0]
+        frameData[833] = statusRegister[0] & 0x0001
+        return frameData[833]
+
+    def _SetControlBits(self, mask: int, value: int) -> None:
+        controlRegister = [0]
+        self._I2CReadWords(0x800D, controlRegister)
+        value |= controlRegister[0] & ~mask & 0xFFFF
+        self._I2CWriteWord(0x800D, value)
+        self._controlRegister = value
+
+    def _TrackSubPage(self, subPage: int, now: float) -> None:
+        # The sensor alternates subpages, so the number produced since the
+        # previous read is estimated from the elapsed time and then snapped to
+        # the parity the subpage bit tells us.
+        lastTime = self.subpage_times[self._lastSubPage] if self._lastSubPage is not None else None
+        if self._controlRegister & 0x0002:
+            # Step mode: the sensor only measured what was asked for
+            if subPage == self._lastSubPage:
+                self.duplicated_subpages += 1
+        elif lastTime is not None:
+            produced = max(1, int((now - lastTime) / self.subpage_period + 0.5))
+            if subPage == self._lastSubPage:
+                self.duplicated_subpages += 1
+                produced += produced % 2
+            elif produced % 2 == 0:
+                produced -= 1
+            self.dropped_subpages += produced - 1
+
+        self._lastSubPage = subPage
+        self.subpage_times[subPage] = now
+        self.subpages_read += 1
+
+    def _PixelMap(self, value) -> Union[float, Tuple[float, ...]]:  # noqa: PLR6301
+        # One value, or 768 values (flat or 24x32 NumPy array) as a tuple
+        if not hasattr(value, "__len__"):
+            return float(value)
+        if hasattr(value, "ravel"):
+            value = value.ravel()
+        value = tuple(float(v) for v in value)
+        if len(value) != 768:
+            raise ValueError("A pixel map needs 768 values")
+        return value
+
+    def _GetEmissivityTerms(
+        self, emissivity: Union[float, Tuple[float, ...]], tr, ta: float
+    ) -> Tuple[List[float], List[float]]:
+        # 1/emissivity and taTr = tr4 - (tr4 - ta4) / emissivity of each pixel.
+        # The terms of the maps alone are kept until the maps change, taTr
+        # until Ta changes as well.
+        terms = self._mapTerms
+        if terms is None or not (
+            (terms[0] is emissivity or terms[0] == emissivity)
+            and (terms[1] is tr or terms[1] == tr)
+        ):
+            if isinstance(emissivity, tuple):
+                invEmissivity = [1 / e for e in emissivity]
+            else:
+                invEmissivity = [1 / emissivity] * 768
+            if tr is None:
+                trTerm = None
+            else:
+                trs = tr if isinstance(tr, tuple) else [tr] * 768
+                trTerm = [
+                    self._Pow4(t + 273.15) * (1 - inv) for t, inv in zip(trs, invEmissivity)
+                ]
+            terms = self._mapTerms = (emissivity, tr, invEmissivity, trTerm)
+            self._taTr = None
+
+        if self._taTr is None or self._taTr[0] != ta:
+            invEmissivity, trTerm = terms[2], terms[3]
+            ta4 = self._Pow4(ta + 273.15)
+            uniform = not isinstance(emissivity, tuple) and not isinstance(tr, tuple)
+            if trTerm is None:
+                # For a MLX90640 in the open air the shift is -8 degC.
+                tr4 = self._Pow4(ta - OPENAIR_TA_SHIFT + 273.15)
+                if uniform:
+                    taTr = [tr4 + (ta4 - tr4) * invEmissivity[0]] * 768
+                else:
+                    taTr = [tr4 + (ta4 - tr4) * inv for inv in invEmissivity]
+            elif uniform:
+                taTr = [trTerm[0] + ta4 * invEmissivity[0]] * 768
+            else:
+                taTr = [term + ta4 * inv for term, inv in zip(trTerm, invEmissivity)]
+            self._taTr = (ta, taTr)
+        return terms[2], self._taTr[1]
+
+    @staticmethod
+    def _Pow4(t: float) -> float:
+        t = t * t
+        return t * t
+
+    def _GetTa(self, frameData: List[int]) -> float:
+        cal = self.calibration
+        vdd = self._GetVdd(frameData)
+
+        ptat = frameData[800]
+        if ptat > 32767:
+            ptat -= 65536
+
+        ptatArt = frameData[768]
+        if ptatArt > 32767:
+            ptatArt -= 65536
+        ptatArt = (ptat / (ptat * cal.alphaPTAT + ptatArt)) * math.pow(2, 18)
+
+        ta = ptatArt / (1 + cal.KvPTAT * (vdd - 3.3)) - cal.vPTAT25
+        ta = ta / cal.KtPTAT + 25
+        return ta
+
+    def _GetVdd(self, frameData: List[int]) -> int:
+        cal = self.calibration
+        vdd = frameData[810]
+        if vdd > 32767:
+            vdd -= 65536
+
+        resolutionRAM = (frameData[832] & 0x0C00) >> 10
+        resolutionCorrection = math.pow(2, cal.resolutionEE) / math.pow(2, resolutionRAM)
+        vdd = (resolutionCorrection * vdd - cal.vdd25) / cal.kVdd + 3.3
+
+        return vdd
+
+    def _CalculateTo(
+        self,
+        frameData: List[int],
+        emissivity: Union[float, Tuple[float, ...]],
+        tr: Union[None, float, Tuple[float, ...]],
+        result: List[float],
+    ) -> None:  # noqa: PLR0914
+        cal = self.calibration
+        subPage = frameData[833]
+        alphaCorrR = [0] * 4
+        irDataCP = [0, 0]
+
+        vdd = self._GetVdd(frameData)
+        ta = self._GetTa(frameData)
+        invEmissivity, taTrs = self._GetEmissivityTerms(emissivity, tr, ta)
+
+        ktaScale = math.pow(2, cal.ktaScale)
+        kvScale = math.pow(2, cal.kvScale)
+        alphaScale = math.pow(2, cal.alphaScale)
+
+        alphaCorrR[0] = 1 / (1 + cal.ksTo[0] * 40)
+        alphaCorrR[1] = 1
+        alphaCorrR[2] = 1 + cal.ksTo[1] * cal.ct[2]
+        alphaCorrR[3] = alphaCorrR[2] * (1 + cal.ksTo[2] * (cal.ct[3] - cal.ct[2]))
+
+        # --------- Gain calculation -----------------------------------
+        gain = frameData[778]
+        if gain > 32767:
+            gain -= 65536
+        gain = cal.gainEE / gain
+
+        # --------- To calculation -------------------------------------
+        mode = (frameData[832] & 0x1000) >> 5
+
+        irDataCP[0] = frameData[776]
+        irDataCP[1] = frameData[808]
+        for i in range(2):
+            if irDataCP[i] > 32767:
+                irDataCP[i] -= 65536
+            irDataCP[i] *= gain
+
+        irDataCP[0] -= (
+            cal.cpOffset[0] * (1 + cal.cpKta * (ta - 25)) * (1 + cal.cpKv * (vdd - 3.3))
+        )
+        if mode == cal.calibrationModeEE:
+            irDataCP[1] -= (
+                cal.cpOffset[1] * (1 + cal.cpKta * (ta - 25)) * (1 + cal.cpKv * (vdd - 3.3))
+            )
+        else:
+            irDataCP[1] -= (
+                (cal.cpOffset[1] + cal.ilChessC[0])
+                * (1 + cal.cpKta * (ta - 25))
+                * (1 + cal.cpKv * (vdd - 3.3))
+            )
+
+        badPixelMask = cal.badPixelMask
+        for pixelNumber in range(768):
+            if badPixelMask[pixelNumber]:
+                # print("Fixing broken pixel %d" % pixelNumber)
+                result[pixelNumber] = -273.15
+                continue
+
+            ilPattern = pixelNumber // 32 - (pixelNumber // 64) * 2
+            chessPattern = ilPattern ^ (pixelNumber - (pixelNumber // 2) * 2)
+            conversionPattern = (
+                (pixelNumber + 2) // 4
+                - (pixelNumber + 3) // 4
+                + (pixelNumber + 1) // 4
+                - pixelNumber // 4
+            ) * (1 - 2 * ilPattern)
+
+            if mode == 0:
+                pattern = ilPattern
+            else:
+                pattern = chessPattern
+
+            if pattern == frameData[833]:
+                irData = frameData[pixelNumber]
+                if irData > 32767:
+                    irData -= 65536
+                irData *= gain
+
+                kta = cal.kta[pixelNumber] / ktaScale
+                kv = cal.kv[pixelNumber] / kvScale
+                irData -= cal.offset[pixelNumber] * (1 + kta * (ta - 25)) * (1 + kv * (vdd - 3.3))
+
+                if mode != cal.calibrationModeEE:
+                    irData += (
+                        cal.ilChessC[2] * (2 * ilPattern - 1)
+                        - cal.ilChessC[1] * conversionPattern
+                    )
+
+                irData = irData - cal.tgc * irDataCP[subPage]
+                irData *= invEmissivity[pixelNumber]
+                taTr = taTrs[pixelNumber]
+
+                alphaCompensated = SCALEALPHA * alphaScale / cal.alpha[pixelNumber]
+                alphaCompensated *= 1 + cal.KsTa * (ta - 25)
+
+                Sx = (
+                    alphaCompensated
+                    * alphaCompensated
+                    * alphaCompensated
+                    * (irData + alphaCompensated * taTr)
+                )
+                Sx = math.sqrt(math.sqrt(Sx)) * cal.ksTo[1]
+
+                To = (
+                    math.sqrt(
+                        math.sqrt(
+                            irData / (alphaCompensated * (1 - cal.ksTo[1] * 273.15) + Sx) + taTr
+                        )
+                    )
+                    - 273.15
+                )
+
+                if To < cal.ct[1]:
+                    torange = 0
+                elif To < cal.ct[2]:
+                    torange = 1
+                elif To < cal.ct[3]:
+                    torange = 2
+                else:
+                    torange = 3
+
+                To = (
+                    math.sqrt(
+                        math.sqrt(
+                            irData
+                            / (
+                                alphaCompensated
+                                * alphaCorrR[torange]
+                                * (1 + cal.ksTo[torange] * (To - cal.ct[torange]))
+                            )
+                            + taTr
+                        )
+                    )
+                    - 273.15
+                )
+
+                result[pixelNumber] = To
+
+    def _IsPixelBad(self, pixel: int) -> bool:
+        return bool(self.calibration.badPixelMask[pixel])
+
+    def _I2CWriteWord(self, writeAddress: int, data: int) -> None:
+        cmd = bytearray(4)
+        cmd[0] = writeAddress >> 8
+        cmd[1] = writeAddress & 0x00FF
+        cmd[2] = data >> 8
+        cmd[3] = data & 0x00FF
+        dataCheck = [0]
+
+        with self.i2c_device as i2c:
+            i2c.write(cmd)
+        # print("Wrote:", [hex(i) for i in cmd])
+        self.sleep(0.001)
+        self._I2CReadWords(writeAddress, dataCheck)
+        # print("dataCheck: 0x%x" % dataCheck[0])
+        # if (dataCheck != data):
+        #    return -2
+
+    def _I2CReadWords(
+        self, addr: int, buffer: Union[int, List[int]], *, end: Optional[int] = None
+    ) -> None:
+        # stamp = time.monotonic()
+        if end is None:
+            remainingWords = len(buffer)
+        else:
+            remainingWords = end
+        offset = 0
+        addrbuf = bytearray(2)
+        inbuf = bytearray(2 * I2C_READ_LEN)
+
+        with self.i2c_device as i2c:
+            while remainingWords:
+                addrbuf[0] = addr >> 8  # MSB
+                addrbuf[1] = addr & 0xFF  # LSB
+                read_words = min(remainingWords, I2C_READ_LEN)
+                i2c.write_then_readinto(addrbuf, inbuf, in_end=read_words * 2)  # in bytes
+                # print("-> ", [hex(i) for i in addrbuf])
+                outwords = struct.unpack(">" + "H" * read_words, inbuf[0 : read_words * 2])
+                # print("<- (", read_words, ")", [hex(i) for i in outwords])
+                for i, w in enumerate(outwords):
+                    buffer[offset + i] = w
+                offset += read_words
+                remainingWords -= read_words
+                addr += read_words
+        # print("i2c read", read_words, "words in", time.monotonic()-stamp)
+        # print("Read: ", [hex(i) for i in buffer[0:10]])
\ No newline at end of file
@@ -0,0 +1,182 @@
+"""
+Frame analysis shared by the live programs and :mod:`replay`.
+
+* :func:`get_max_temp_filtered` finds the hot spots of a frame;
+* :class:`AlarmTracker` is the alarm state machine of ``monitoring.py``:
+  time above the threshold accumulates, short drops are tolerated for a
+  grace period, and the alarm is confirmed once the accumulated time
+  reaches the required duration;
+* :class:`DisplayFilter` is the smoothing of ``image_VFINAL.py``: temporal
+  blend of the frames, 3x3 Gaussian blur and slowly tracking colour range.
+
+None of them reads a clock: times are passed in, so recorded frames can be
+replayed faster than real time with the same results.
+"""
+
+import numpy as np
+
+try:
+    from typing import Optional, Sequence, Tuple
+except ImportError:
+    pass
+
+# Transitions returned by :meth:`AlarmTracker.update`, also the event kinds
+# logged by monitoring.py
+ALARM = "alarm"  # Accumulated time reached the required duration
+ACCUMULATING = "accumulating"  # Above the threshold, alarm not confirmed yet
+TEMPORARY_DROP = "temporary_drop"  # Below the threshold within the grace period
+RESET = "reset"  # Below the threshold for longer than the grace period
+
+# 3x3 Gaussian kernel, the weight of each pixel can be adjusted
+GAUSSIAN_KERNEL = np.array([
+    [1, 2, 1],
+    [2, 4, 2],
+    [1, 2, 1]
+], dtype=np.float32) / 16.0
+
+
+def get_max_temp_filtered(frame_data, threshold):
+    max_detected = -100.0
+    hot_pixels_list = []  # List of all detected hot spots
+    neighbor_threshold = threshold - 5.0  # A neighbor is considered "warm"
+
+    for y in range(24):
+        for x in range(32):
+            index = y * 32 + x
+            val = frame_data[index]
+
+            # Ignore cold pixels (below threshold)
+            if val > threshold:
+                # Check the 4 direct neighbors
+                hot_neighbors = 0
+                for dx, dy in [(1,0), (-1,0), (0,1), (0,-1)]:
+                    nx, ny = x + dx, y + dy
+                    if 0 <= nx < 32 and 0 <= ny < 24:
+                        n_index = ny * 32 + nx
+                        if frame_data[n_index] > neighbor_threshold:
+                            hot_neighbors += 1
+
+                # Require at least 2 warm neighbors
+                if hot_neighbors >= 2:
+                    if val > max_detected:
+                        max_detected = val
+                    hot_pixels_list.append(val)
+
+    # Return: max_temp, hot spot count, hot spot average
+    avg_hot = sum(hot_pixels_list) / len(hot_pixels_list) if hot_pixels_list else -100.0
+    hot_count = len(hot_pixels_list)
+    return max_detected, hot_count, avg_hot
+
+
+class AlarmTracker:
+    """Overheat alarm confirmed by the time spent above a threshold.
+
+    :param threshold: temperature of a hot pixel, in degrees C.
+    :param required_duration: accumulated seconds above the threshold that
+        confirm the alarm.
+    :param grace_period: seconds below the threshold tolerated before the
+        accumulated time is reset.
+    :param min_hot_pixels: hot pixels needed to count as above the threshold.
+    """
+
+    def __init__(
+        self,
+        threshold: float,
+        required_duration: float,
+        grace_period: float,
+        min_hot_pixels: int = 1,
+    ) -> None:
+        self.threshold = threshold
+        self.required_duration = required_duration
+        self.grace_period = grace_period
+        self.min_hot_pixels = min_hot_pixels
+
+        self.accumulated = 0.0  # Total time spent in overheat status
+        self.last_high_time: Optional[float] = None
+        self.active = False
+        self.below = 0.0  # Seconds since the last high temperature, once below
+
+    def update(self, now: float, dt: float, max_temp: float, hot_pixels: int) -> Optional[str]:
+        """Account for the ``dt`` seconds up to ``now`` (monotonic), spent at
+        ``max_temp`` with ``hot_pixels`` hot pixels. Returns the transition,
+        or None when the state did not move (normal, or alarm held)."""
+        if max_temp >= self.threshold and hot_pixels >= self.min_hot_pixels:
+            self.accumulated += dt
+            self.last_high_time = now
+            if self.accumulated >= self.required_duration and not self.active:
+                self.active = True
+                return ALARM
+            return None if self.active else ACCUMULATING
+
+        if self.last_high_time is None:
+            return None
+        self.below = now - self.last_high_time
+        if self.below > self.grace_period:
+            # Below threshold for too long, reset everything
+            self.accumulated = 0.0
+            self.last_high_time = None
+            self.active = False
+            return RESET
+        # Below threshold, but waiting to see if it goes back up
+        return TEMPORARY_DROP
+
+
+class DisplayFilter:
+    """Smoothed image and colour range of a stream of frames.
+
+    :param alpha: weight of the new frame in the temporal blend.
+    :param range_smoothing: weight of the new minimum / maximum in the
+        colour range.
+    :param initial: starting value of the blended image.
+    :param range_: starting colour range, (min, max).
+    :param shape: rows and columns of the frames.
+    """
+
+    def __init__(
+        self,
+        alpha: float = 0.5,
+        range_smoothing: float = 0.1,
+        initial: float = 25.0,
+        range_: Tuple[float, float] = (20.0, 35.0),
+        shape: Sequence[int] = (24, 32),
+    ) -> None:
+        self.alpha = alpha
+        self.range_smoothing = range_smoothing
+        self.filtered = np.full(shape, initial)
+        self.minimum, self.maximum = range_
+        self._target = range_  # Range of the last smoothed image
+        rows, columns = shape
+        self._padded = np.empty((rows + 2, columns + 2))
+
+    def update(self, frame: Sequence[float]) -> np.ndarray:
+        """Blend in ``frame`` and return the smoothed image; :attr:`minimum`
+        and :attr:`maximum` follow its range."""
+        raw = np.asarray(frame).reshape(self.filtered.shape)
+        self.filtered = self.filtered * (1 - self.alpha) + raw * self.alpha
+        smoothed = self.blur(self.filtered)
+        rmin, rmax = smoothed.min(), smoothed.max()
+        self.minimum = (1 - self.range_smoothing) * self.minimum + self.range_smoothing * rmin
+        self.maximum = (1 - self.range_smoothing) * self.maximum + self.range_smoothing * rmax
+        self._target = (float(rmin), float(rmax))
+        return smoothed
+
+    def converged(self, tolerance: float) -> bool:
+        """True when the colour range is within ``tolerance`` degrees of the
+        range of the last smoothed image. Until then, frames have to keep
+        being blended in even when the scene does not change, or the colour
+        scale stops partway to its target."""
+        rmin, rmax = self._target
+        return abs(self.minimum - rmin) <= tolerance and abs(self.maximum - rmax) <= tolerance
+
+    def blur(self, image: np.ndarray) -> np.ndarray:
+        """3x3 Gaussian blur, edges mirrored (scipy's ``mode='reflect'``)."""
+        padded = self._padded
+        padded[1:-1, 1:-1] = image
+        padded[0, 1:-1], padded[-1, 1:-1] = image[0], image[-1]
+        padded[:, 0], padded[:, -1] = padded[:, 1], padded[:, -2]
+        rows, columns = image.shape
+        result = np.zeros(image.shape)
+        for dy in range(3):
+            for dx in range(3):
+                result += GAUSSIAN_KERNEL[dy, dx] * padded[dy : dy + rows, dx : dx + columns]
+        return result
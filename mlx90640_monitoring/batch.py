@@ -0,0 +1,330 @@
+"""
+Batch temperature conversion of recorded raw subpages.
+
+:func:`convert` turns an (N, 834) array of raw subpage words, as filled by
+``MLX90640._GetFrameData`` (768 pixel words, 64 auxiliary words, then the
+control register and the subpage number), into an (N, 24, 32) temperature
+cube in degrees C. It computes the same temperatures as
+``MLX90640._CalculateTo``, vectorized across frames and pixels:
+
+* everything that only depends on the calibration (per-pixel kta, kv,
+  alpha, interleave/chess patterns, bad pixels) is computed once;
+* frames are processed in chunks of ``chunk_size`` so the float64
+  intermediates stay bounded whatever N is; a read-only ``numpy.memmap``
+  (``np.load(path, mmap_mode="r")``) is only paged in chunk by chunk;
+* with ``workers``, chunks are spread over a process pool.
+
+Each subpage only measures half of the pixels. By default the other half
+is carried over from the previous subpages, as ``getFrame`` does with its
+frame buffer (NaN until a pixel was first measured); with ``merge=False``
+they are NaN. Broken and outlier pixels are interpolated from their
+neighbours like the driver does, unless ``correct_defects=False`` leaves them
+at -273.15; without ``merge``, from the neighbours measured by the same
+subpage only (NaN in chess mode, where there are none).
+
+``emissivity`` and ``tr`` take one value or a map of 768 values, like the
+driver's ``emissivity`` and ``reflected_temperature``.
+
+From the command line, with an EEPROM dump of the sensor (832 words as
+written by ``array("H").tofile``)::
+
+    mlx-batch subpages.npy eeprom.bin temperatures.npy --workers 4
+"""
+
+import argparse
+import collections
+import math
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+
+import numpy as np
+
+from . import adafruitmlx90640_librairie as adafruit_mlx90640
+
+try:
+    from typing import Optional, Tuple
+except ImportError:
+    pass
+
+# Calibration reduced to what the conversion needs, as float64 arrays and
+# plain scalars so it is cheap to send to worker processes
+PixelConstants = collections.namedtuple(
+    "PixelConstants",
+    "kta kv offset alpha ilPattern chessPattern chessCorrection bad "
+    "defectPixels defectNeighbours defectWeights "
+    "kVdd vdd25 resolutionEE KvPTAT KtPTAT vPTAT25 alphaPTAT gainEE tgc KsTa "
+    "calibrationModeEE ksTo ct alphaCorrR cpOffset cpKta cpKv ilChessC0",
+)
+
+
+def pixel_constants(calibration: adafruit_mlx90640.Calibration) -> PixelConstants:
+    """Precompute the per-pixel terms of the conversion for a sensor."""
+    cal = calibration
+    pixel = np.arange(768)
+    ilPattern = pixel // 32 - (pixel // 64) * 2
+    chessPattern = ilPattern ^ (pixel - (pixel // 2) * 2)
+    conversionPattern = (
+        (pixel + 2) // 4 - (pixel + 3) // 4 + (pixel + 1) // 4 - pixel // 4
+    ) * (1 - 2 * ilPattern)
+    bad = np.frombuffer(cal.badPixelMask, dtype=np.uint8).astype(bool)
+
+    alphaCorrR = [0.0] * 4
+    alphaCorrR[0] = 1 / (1 + cal.ksTo[0] * 40)
+    alphaCorrR[1] = 1
+    alphaCorrR[2] = 1 + cal.ksTo[1] * cal.ct[2]
+    alphaCorrR[3] = alphaCorrR[2] * (1 + cal.ksTo[2] * (cal.ct[3] - cal.ct[2]))
+
+    return PixelConstants(
+        kta=np.frombuffer(cal.kta, dtype=np.int16) / math.pow(2, cal.ktaScale),
+        kv=np.frombuffer(cal.kv, dtype=np.int16) / math.pow(2, cal.kvScale),
+        offset=np.frombuffer(cal.offset, dtype=np.int32).astype(np.float64),
+        alpha=adafruit_mlx90640.SCALEALPHA
+        * math.pow(2, cal.alphaScale)
+        / np.frombuffer(cal.alpha, dtype=np.int32),
+        ilPattern=ilPattern,
+        chessPattern=chessPattern,
+        chessCorrection=cal.ilChessC[2] * (2 * ilPattern - 1) - cal.ilChessC[1] * conversionPattern,
+        bad=bad,
+        defectPixels=np.frombuffer(cal.defectPixels, dtype=np.uint16).astype(np.intp),
+        defectNeighbours=np.frombuffer(cal.defectNeighbours, dtype=np.uint16)
+        .astype(np.intp)
+        .reshape(-1, 4),
+        defectWeights=np.frombuffer(cal.defectWeights).reshape(-1, 4),
+        kVdd=cal.kVdd,
+        vdd25=cal.vdd25,
+        resolutionEE=cal.resolutionEE,
+        KvPTAT=cal.KvPTAT,
+        KtPTAT=cal.KtPTAT,
+        vPTAT25=cal.vPTAT25,
+        alphaPTAT=cal.alphaPTAT,
+        gainEE=cal.gainEE,
+        tgc=cal.tgc,
+        KsTa=cal.KsTa,
+        calibrationModeEE=cal.calibrationModeEE,
+        ksTo=np.array(cal.ksTo, dtype=np.float64),
+        ct=np.array(cal.ct, dtype=np.float64),
+        alphaCorrR=np.array(alphaCorrR, dtype=np.float64),
+        cpOffset=tuple(cal.cpOffset),
+        cpKta=cal.cpKta,
+        cpKv=cal.cpKv,
+        ilChessC0=cal.ilChessC[0],
+    )
+
+
+def _signed(words: np.ndarray) -> np.ndarray:
+    return (words ^ 0x8000) - 0x8000
+
+
+def _pixel_map(value):
+    # Scalars stay scalars, maps become 768 float64 values
+    if value is None or np.ndim(value) == 0:
+        return value
+    value = np.asarray(value, dtype=np.float64).reshape(-1)
+    if len(value) != 768:
+        raise ValueError("A pixel map needs 768 values")
+    return value
+
+
+def _fourth_power(t):
+    t = t * t
+    return t * t
+
+
+def convert_chunk(
+    constants: PixelConstants,
+    emissivity,
+    tr,
+    subpages: np.ndarray,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Temperatures of an (n, 834) block of raw subpages, as (n, 768)
+    float64, and the (n, 768) mask of the pixels each subpage measured.
+    Pixels outside the mask are NaN, bad pixels are -273.15 like in the
+    driver. The operations follow ``_GetVdd``, ``_GetTa`` and
+    ``_CalculateTo`` step by step, so the values are the driver's.
+    ``emissivity`` and ``tr`` are scalars or 768-value arrays."""
+    c = constants
+    words = np.asarray(subpages, dtype=np.int64)
+    # Per-frame scalars as (n, 1) columns, broadcast over the pixels
+    control = words[:, 832:833]
+    subPage = words[:, 833:834]
+
+    vdd = _signed(words[:, 810:811])
+    resolutionRAM = (control & 0x0C00) >> 10
+    resolutionCorrection = math.pow(2, c.resolutionEE) / np.power(2.0, resolutionRAM)
+    vdd = (resolutionCorrection * vdd - c.vdd25) / c.kVdd + 3.3
+
+    ptat = _signed(words[:, 800:801])
+    ptatArt = _signed(words[:, 768:769])
+    ptatArt = (ptat / (ptat * c.alphaPTAT + ptatArt)) * math.pow(2, 18)
+    ta = ptatArt / (1 + c.KvPTAT * (vdd - 3.3)) - c.vPTAT25
+    ta = ta / c.KtPTAT + 25
+
+    # As in MLX90640._GetEmissivityTerms
+    invEmissivity = 1 / np.asarray(emissivity, dtype=np.float64)
+    ta4 = _fourth_power(ta + 273.15)
+    if tr is None:
+        # For a MLX90640 in the open air, as in getFrame
+        tr4 = _fourth_power(ta - adafruit_mlx90640.OPENAIR_TA_SHIFT + 273.15)
+        taTr = tr4 + (ta4 - tr4) * invEmissivity
+    else:
+        taTr = _fourth_power(tr + 273.15) * (1 - invEmissivity) + ta4 * invEmissivity
+
+    gain = c.gainEE / _signed(words[:, 778:779])
+    mode = (control & 0x1000) >> 5
+    chessMismatch = mode != c.calibrationModeEE
+
+    offsetCP1 = np.where(chessMismatch, c.cpOffset[1] + c.ilChessC0, c.cpOffset[1])
+    irDataCP0 = _signed(words[:, 776:777]) * gain
+    irDataCP0 = irDataCP0 - c.cpOffset[0] * (1 + c.cpKta * (ta - 25)) * (1 + c.cpKv * (vdd - 3.3))
+    irDataCP1 = _signed(words[:, 808:809]) * gain
+    irDataCP1 = irDataCP1 - offsetCP1 * (1 + c.cpKta * (ta - 25)) * (1 + c.cpKv * (vdd - 3.3))
+    irDataCP = np.where(subPage == 0, irDataCP0, irDataCP1)
+
+    pattern = np.where(mode == 0, c.ilPattern, c.chessPattern)
+    measured = (pattern == subPage) & ~c.bad
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        irData = _signed(words[:, :768]) * gain
+        irData = irData - c.offset * (1 + c.kta * (ta - 25)) * (1 + c.kv * (vdd - 3.3))
+        irData = np.where(chessMismatch, irData + c.chessCorrection, irData)
+        irData = irData - c.tgc * irDataCP
+        irData *= invEmissivity
+
+        alphaCompensated = c.alpha * (1 + c.KsTa * (ta - 25))
+
+        Sx = alphaCompensated * alphaCompensated * alphaCompensated * (irData + alphaCompensated * taTr)
+        Sx = np.sqrt(np.sqrt(Sx)) * c.ksTo[1]
+
+        To = (
+            np.sqrt(np.sqrt(irData / (alphaCompensated * (1 - c.ksTo[1] * 273.15) + Sx) + taTr))
+            - 273.15
+        )
+        torange = (To >= c.ct[1]).astype(np.intp) + (To >= c.ct[2]) + (To >= c.ct[3])
+        To = (
+            np.sqrt(
+                np.sqrt(
+                    irData
+                    / (
+                        alphaCompensated
+                        * c.alphaCorrR[torange]
+                        * (1 + c.ksTo[torange] * (To - c.ct[torange]))
+                    )
+                    + taTr
+                )
+            )
+            - 273.15
+        )
+
+    To[~measured] = np.nan
+    To[:, c.bad] = -273.15
+    return To, measured | c.bad
+
+
+def _fill_forward(values: np.ndarray, measured: np.ndarray, last: np.ndarray) -> np.ndarray:
+    # Latest measured value of each pixel, ``last`` before the first one
+    index = np.where(measured, np.arange(1, len(values) + 1)[:, None], 0)
+    np.maximum.accumulate(index, axis=0, out=index)
+    return np.take_along_axis(np.concatenate([last[None], values]), index, axis=0)
+
+
+def _correct_defects(values: np.ndarray, constants: PixelConstants) -> None:
+    # As MLX90640._CorrectDefects, ignoring neighbours not measured yet
+    c = constants
+    neighbours = values[:, c.defectNeighbours]
+    weights = np.where(np.isnan(neighbours), 0.0, c.defectWeights)
+    with np.errstate(invalid="ignore"):
+        values[:, c.defectPixels] = np.nansum(neighbours * weights, axis=2) / weights.sum(axis=2)
+
+
+def convert(
+    subpages: np.ndarray,
+    calibration: adafruit_mlx90640.Calibration,
+    emissivity=0.95,
+    tr=None,
+    merge: bool = True,
+    correct_defects: bool = True,
+    chunk_size: int = 256,
+    workers: Optional[int] = None,
+    dtype=np.float32,
+) -> np.ndarray:
+    """Convert an (N, 834) array of raw subpages to an (N, 24, 32) cube.
+
+    :param calibration: the sensor's ``Calibration`` (``mlx.calibration``,
+        or built from an EEPROM dump).
+    :param emissivity: object emissivity, one value or a map of 768 values
+        (flat or 24x32), 0.95 by default as in the driver.
+    :param tr: reflected temperature in C, one value or a map, None for
+        the sensor's open-air estimate (ambient minus 8 C) like the driver.
+    :param merge: fill the pixels a subpage did not measure from the
+        previous subpages instead of leaving them NaN.
+    :param correct_defects: interpolate broken and outlier pixels from
+        their neighbours instead of leaving them at -273.15.
+    :param chunk_size: frames converted at once, about 50KB of working
+        memory per frame.
+    :param workers: number of worker processes, None or 1 to convert in
+        this process.
+    :param dtype: dtype of the returned cube.
+    """
+    subpages = np.asarray(subpages)
+    if subpages.ndim != 2 or subpages.shape[1] != 834:
+        raise ValueError(f"expected an (N, 834) array, got {subpages.shape}")
+    constants = pixel_constants(calibration)
+    cube = np.empty((len(subpages), 768), dtype=dtype)
+    last = np.full(768, np.nan)
+    starts = range(0, len(subpages), chunk_size)
+    chunks = (subpages[start : start + chunk_size] for start in starts)
+    convert_one = partial(convert_chunk, constants, _pixel_map(emissivity), _pixel_map(tr))
+
+    if workers is not None and workers > 1:
+        executor = ProcessPoolExecutor(workers)
+        results = executor.map(convert_one, chunks)
+    else:
+        executor = None
+        results = map(convert_one, chunks)
+    try:
+        for start, (values, measured) in zip(starts, results):
+            if merge:
+                values = _fill_forward(values, measured, last)
+                last = values[-1]
+            if correct_defects and len(constants.defectPixels):
+                _correct_defects(values, constants)
+            cube[start : start + len(values)] = values
+    finally:
+        if executor is not None:
+            executor.shutdown()
+    return cube.reshape(-1, 24, 32)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("subpages", help=".npy file of (N, 834) raw subpage words")
+    parser.add_argument("eeprom", help="EEPROM dump of the sensor that recorded them")
+    parser.add_argument("output", help=".npy file for the (N, 24, 32) temperatures")
+    parser.add_argument("--emissivity", type=float, default=0.95)
+    parser.add_argument("--tr", type=float, default=None, help="reflected temperature in C")
+    parser.add_argument("--no-merge", action="store_true", help="leave unmeasured pixels NaN")
+    parser.add_argument("--keep-defects", action="store_true", help="leave bad pixels at -273.15")
+    parser.add_argument("--chunk-size", type=int, default=256)
+    parser.add_argument("--workers", type=int, default=None)
+    args = parser.parse_args()
+
+    eeprom = array("H")
+    with open(args.eeprom, "rb") as dump:
+        eeprom.fromfile(dump, 832)
+    cube = convert(
+        np.load(args.subpages, mmap_mode="r"),
+        adafruit_mlx90640.Calibration(eeprom),
+        emissivity=args.emissivity,
+        tr=args.tr,
+        merge=not args.no_merge,
+        correct_defects=not args.keep_defects,
+        chunk_size=args.chunk_size,
+        workers=args.workers,
+    )
+    np.save(args.output, cube)
+    print(f"{len(cube)} frames converted to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
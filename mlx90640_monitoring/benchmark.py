@@ -0,0 +1,349 @@
+"""
+Benchmark harness for the driver, run on the simulated sensor so results
+are reproducible on any machine (see :mod:`simulator`).
+
+``memory``
+    Bytes held by one sensor's calibration, compared with the former layout
+    of boxed Python ints in lists, and RSS growth for N sensors::
+
+        mlx-benchmark memory --sensors 8
+
+``access``
+    Cost of reading one per-pixel calibration value the way the conversion
+    loop does, for the former class-attribute lists, for the ``__slots__``
+    calibration arrays, and for a NumPy view of the arrays::
+
+        mlx-benchmark access
+
+``extract``
+    Time to extract a calibration from the EEPROM image with the per-pixel
+    loops and with the NumPy bulk decoder, after checking that both give the
+    same parameters on the simulated EEPROMs of ``--sensors`` seeds and on
+    EEPROM dumps given as arguments (832 words as written by
+    ``array("H").tofile``)::
+
+        mlx-benchmark extract --sensors 50 eeprom-*.bin
+
+``duty``
+    Bus traffic, host CPU in the driver and time the sensor spends
+    measuring, for one frame every ``--interval`` seconds, in continuous
+    mode (the host waits on the data-ready bit of a sensor that never
+    stops) and in step mode (the host starts each measurement and sleeps
+    through it), over a minute of simulated time::
+
+        mlx-benchmark duty --interval 5
+
+``integrity``
+    Frames read through ``SensorSupervisor`` on a bus flipping bits at
+    ``--bit-error-rate``, without and with the :mod:`integrity` checks:
+    frames delivered with a pixel more than 5 degrees off the simulated
+    scene, the worst error, the faults retried, and the host CPU of the
+    checks per subpage::
+
+        mlx-benchmark integrity --bit-error-rate 1e-5
+
+Reference results, x86-64 / CPython 3.11::
+
+    memory:  calibration 13.8KB per sensor (former lists: 81.8KB),
+             RSS +0.16MB for 8 sensors
+    access:  class list 80-115ns, slots array 110ns, NumPy view 1-2ns per value
+    extract: loops 5.3ms, bulk 0.12ms per calibration
+    duty:    frame every 5s at 2Hz, per minute: continuous 42897 I2C
+             transactions, 252KB, 331ms host CPU, sensor measuring 100%;
+             step 208 transactions, 43KB, 45ms, sensor measuring 21%
+    integrity: 300 frames at a bit error rate of 1e-5: unchecked 9 frames
+               off by more than 5C (worst 94.4C); checked 3 (worst 7.9C),
+               6 pixels repaired, checks 0.38ms per subpage
+
+Indexing an ``array.array`` from Python boxes the item on every access, so
+the per-pixel loop costs about the same as with lists; the gain is memory,
+and whole-table NumPy access without conversion.
+"""
+
+import argparse
+import gc
+import time
+import timeit
+import tracemalloc
+from array import array
+
+from . import adafruitmlx90640_librairie as adafruit_mlx90640
+from .acquisition import PollSchedule, SensorSupervisor
+from .integrity import FrameValidator
+from .simulator import SimulatedI2C, SimulatedMLX90640
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+try:
+    from typing import Callable, List, Tuple
+except ImportError:
+    pass
+
+
+def rss_kb() -> int:
+    """Current resident set size in KB (Linux), 0 when unavailable."""
+    try:
+        with open("/proc/self/status") as status:
+            for line in status:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    return 0
+
+
+def allocated(build: Callable[[], object]) -> int:
+    """Bytes still allocated after ``build()`` returns, its result kept alive."""
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    kept = build()
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del kept
+    return after - before
+
+
+def legacy_layout(calibration: adafruit_mlx90640.Calibration) -> List[List[int]]:
+    """The per-pixel parameters as the driver used to hold them: lists of
+    freshly boxed ints, as produced by ``int(temp + 0.5)``."""
+    return [
+        [int(v) for v in calibration.alpha],
+        [int(v) for v in calibration.offset],
+        [int(v) for v in calibration.kta],
+        [int(v) for v in calibration.kv],
+        [0] * 832,  # Module-level eeData
+    ]
+
+
+def bench_memory(sensors: int) -> None:
+    eeprom = array("H", SimulatedMLX90640().eeprom)
+    new = allocated(lambda: adafruit_mlx90640.Calibration(eeprom))
+    calibration = adafruit_mlx90640.Calibration(eeprom)
+    old = allocated(lambda: legacy_layout(calibration))
+    print(f"calibration: {new / 1024:.1f}KB per sensor (former lists: {old / 1024:.1f}KB)")
+
+    buses = [SimulatedI2C(SimulatedMLX90640(seed=seed)) for seed in range(sensors)]
+    gc.collect()
+    start = rss_kb()
+    drivers = [adafruit_mlx90640.MLX90640(bus) for bus in buses]
+    gc.collect()
+    print(f"RSS +{(rss_kb() - start) / 1024:.2f}MB for {len(drivers)} sensors")
+
+
+def bench_access(repeat: int) -> None:
+    calibration = adafruit_mlx90640.Calibration(array("H", SimulatedMLX90640().eeprom))
+
+    class Legacy:
+        alpha = list(calibration.alpha)
+        offset = list(calibration.offset)
+
+    legacy = Legacy()
+    pixels = range(768)
+
+    def old() -> None:
+        self = legacy
+        for p in pixels:
+            self.alpha[p] + self.offset[p]
+
+    def new() -> None:
+        cal = calibration
+        for p in pixels:
+            cal.alpha[p] + cal.offset[p]
+
+    benches = [("class list", old), ("slots array", new)]
+    if np is not None:
+
+        def view() -> None:
+            cal = calibration
+            np.frombuffer(cal.alpha, dtype=np.int32) + np.frombuffer(cal.offset, dtype=np.int32)
+
+        benches.append(("NumPy view", view))
+
+    for name, func in benches:
+        best = min(timeit.repeat(func, number=repeat, repeat=5))
+        print(f"{name}: {best / repeat / 768 / 2 * 1e9:.1f}ns per value")
+
+
+def same_parameters(a: adafruit_mlx90640.Calibration, b: adafruit_mlx90640.Calibration) -> bool:
+    return all(
+        list(getattr(a, name)) == list(getattr(b, name))
+        if isinstance(getattr(a, name), (list, array))
+        else getattr(a, name) == getattr(b, name)
+        for name in adafruit_mlx90640.Calibration.__slots__
+    )
+
+
+def bench_extract(sensors: int, dumps: List[str], repeat: int) -> None:
+    if np is None:
+        raise SystemExit("extract needs NumPy")
+    eeproms = [array("H", SimulatedMLX90640(seed=seed).eeprom) for seed in range(sensors)]
+    for path in dumps:
+        eeprom = array("H")
+        with open(path, "rb") as dump:
+            eeprom.fromfile(dump, 832)
+        eeproms.append(eeprom)
+
+    for eeprom in eeproms:
+        if not same_parameters(
+            adafruit_mlx90640.Calibration(eeprom, bulk=False),
+            adafruit_mlx90640.Calibration(eeprom, bulk=True),
+        ):
+            raise SystemExit("bulk decoder differs from the per-pixel loops")
+    print(f"identical parameters on {len(eeproms)} EEPROM images")
+
+    eeprom = eeproms[0]
+    for name, bulk in (("loops", False), ("bulk", True)):
+        best = min(
+            timeit.repeat(lambda: adafruit_mlx90640.Calibration(eeprom, bulk), number=repeat, repeat=5)
+        )
+        print(f"{name}: {best / repeat * 1000:.2f}ms per calibration")
+
+
+def run_duty(step: bool, interval: float, seconds: float, rate: int) -> Tuple[float, ...]:
+    """Take a frame every ``interval`` s for ``seconds`` of simulated time.
+    Returns frames, I2C transactions, bytes, host CPU seconds spent in the
+    driver and the sensor's measuring duty cycle."""
+    device = SimulatedMLX90640(seed=0)
+    bus = SimulatedI2C(device, frequency=1000000)
+    mlx = adafruit_mlx90640.MLX90640(bus)
+    mlx.clock = bus.now
+    mlx.sleep = bus.sleep
+    mlx.refresh_rate = rate
+    mlx.step_mode = step
+    schedule = PollSchedule(interval, clock=bus.now, sleep=bus.sleep)
+
+    # CPU of the simulated sensor producing subpages is not the host's
+    model_cpu = [0.0]
+    measure = device._measure
+
+    def timed_measure(t: float) -> None:
+        start = time.process_time()
+        measure(t)
+        model_cpu[0] += time.process_time() - start
+
+    device._measure = timed_measure
+    frame = [0.0] * 768
+    start, transactions, nbytes, subpages = bus.now(), bus.transactions, bus.bytes, device.subpages
+    cpu = time.process_time()
+    frames = 0
+    while bus.now() - start < seconds:
+        schedule.wait()
+        mlx.getFrame(frame)
+        frames += 1
+    cpu = time.process_time() - cpu - model_cpu[0]
+    elapsed = bus.now() - start
+    duty = (device.subpages - subpages) / device.refresh_hz / elapsed
+    return frames, bus.transactions - transactions, bus.bytes - nbytes, cpu, duty
+
+
+def bench_duty(interval: float, seconds: float, rate: int) -> None:
+    minutes = seconds / 60
+    print(f"one frame every {interval:g}s, per simulated minute:")
+    for name, step in (("continuous", False), ("step", True)):
+        frames, transactions, nbytes, cpu, duty = run_duty(step, interval, seconds, rate)
+        print(
+            f"{name:>10}: {frames / minutes:.1f} frames, {transactions / minutes:.0f} transactions, "
+            f"{nbytes / minutes / 1024:.0f}KB, host CPU {cpu / minutes * 1000:.0f}ms, "
+            f"sensor measuring {duty * 100:.0f}% of the time"
+        )
+
+
+def run_integrity(validate: bool, bit_error_rate: float, frames: int) -> Tuple[object, ...]:
+    """Read ``frames`` frames at 2Hz with bit errors on the bus. Returns
+    the frames more than 5 degrees off the scene, the worst error, the bits
+    flipped, the supervisor's faults, the validator (None when off) and the
+    host CPU seconds spent in its checks."""
+    device = SimulatedMLX90640(seed=0)
+    bus = SimulatedI2C(device, frequency=800000, seed=1)
+    mlx = adafruit_mlx90640.MLX90640(bus)
+    mlx.clock = bus.now
+    mlx.sleep = bus.sleep
+    mlx.refresh_rate = adafruit_mlx90640.RefreshRate.REFRESH_2_HZ
+    validator = FrameValidator(mlx) if validate else None
+    cpu = [0.0]
+    if validator is not None:
+        for name in ("check_words", "check_temperatures"):
+            check = getattr(validator, name)
+
+            def timed(*args, check=check) -> None:
+                start = time.process_time()
+                try:
+                    check(*args)
+                finally:
+                    cpu[0] += time.process_time() - start
+
+            setattr(validator, name, timed)
+    mlx.validator = validator
+    bus.bit_error_rate = bit_error_rate  # The calibration is read without errors
+    supervisor = SensorSupervisor(mlx, bus, lambda: bus, base_backoff=0.0, clock=bus.now, sleep=bus.sleep)
+
+    scene = np.array(device.scene)
+    frame = [0.0] * 768
+    corrupted = 0
+    worst = 0.0
+    supervisor.read(frame)  # Both subpages of the first frame
+    for _ in range(frames):
+        supervisor.read(frame)
+        error = float(np.abs(np.array(frame) - scene).max())
+        worst = max(worst, error)
+        corrupted += error > 5
+    return corrupted, worst, bus.bit_errors, supervisor.faults, validator, cpu[0]
+
+
+def bench_integrity(bit_error_rate: float, frames: int) -> None:
+    print(f"{frames} frames, bit error rate {bit_error_rate:g}:")
+    for name, validate in (("unchecked", False), ("checked", True)):
+        corrupted, worst, flipped, faults, validator, cpu = run_integrity(validate, bit_error_rate, frames)
+        retried = ", ".join(f"{kind} {count}" for kind, count in faults.items() if count)
+        print(
+            f"{name:>10}: {corrupted} frames off by more than 5C (worst {worst:.1f}C), "
+            f"{flipped} bits flipped, retried: {retried or 'none'}"
+        )
+        if validator is not None:
+            rejected = ", ".join(f"{reason} {count}" for reason, count in validator.rejected.items() if count)
+            print(
+                f"{'':>10}  {validator.repaired} pixels repaired, rejected: {rejected or 'none'}, "
+                f"checks {cpu / validator.checked * 1e6:.0f}us per subpage"
+            )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    commands = parser.add_subparsers(dest="command")
+    memory = commands.add_parser("memory", help="calibration memory footprint")
+    memory.add_argument("--sensors", type=int, default=8)
+    access = commands.add_parser("access", help="per-pixel calibration access time")
+    access.add_argument("--repeat", type=int, default=200)
+    extract = commands.add_parser("extract", help="calibration extraction time")
+    extract.add_argument("--sensors", type=int, default=20)
+    extract.add_argument("--repeat", type=int, default=20)
+    extract.add_argument("dumps", nargs="*", help="EEPROM dump files")
+    duty = commands.add_parser("duty", help="continuous vs step mode at a slow cadence")
+    duty.add_argument("--interval", type=float, default=5.0, help="seconds between frames")
+    duty.add_argument("--seconds", type=float, default=60.0, help="simulated duration")
+    duty.add_argument("--rate", type=int, default=adafruit_mlx90640.RefreshRate.REFRESH_2_HZ)
+    integrity = commands.add_parser("integrity", help="frames corrupted by bit errors, with and without checks")
+    integrity.add_argument("--bit-error-rate", type=float, default=1e-5)
+    integrity.add_argument("--frames", type=int, default=300)
+    args = parser.parse_args()
+
+    if args.command == "memory":
+        bench_memory(args.sensors)
+    elif args.command == "access":
+        bench_access(args.repeat)
+    elif args.command == "extract":
+        bench_extract(args.sensors, args.dumps, args.repeat)
+    elif args.command == "duty":
+        bench_duty(args.interval, args.seconds, args.rate)
+    elif args.command == "integrity":
+        bench_integrity(args.bit_error_rate, args.frames)
+    else:
+        parser.print_help()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,158 @@
+"""
+Change detection, to skip the analysis and display of unchanged frames.
+
+In a stable scene, consecutive frames only differ by sensor noise.
+:class:`ChangeDetector` compares each frame with the last *processed* one
+(not the previous one, so slow drifts add up until they count), and
+reports a change when:
+
+* a pixel moved by more than ``pixel_threshold``;
+* the mean of a ``block`` x ``block`` area moved by more than
+  ``block_threshold``, which catches changes spread over an area while
+  averaging the noise out;
+* a pixel crossed one of ``levels``, e.g. the alarm threshold, however small
+  the move.
+
+Both thresholds are raised to ``noise_factor`` times the noise of the
+difference, estimated from consecutive frames (robust median of the
+per-pixel deltas), so a noisier configuration (higher refresh rate, lower
+ADC resolution) does not make every frame a change.
+
+Frames are also processed every ``heartbeat`` seconds whatever happens, and
+for ``settle`` seconds after a change, for consumers with temporal filters
+that need a few frames to converge.
+"""
+
+import math
+
+import numpy as np
+
+try:
+    from typing import Optional, Sequence
+except ImportError:
+    pass
+
+# Reasons for processing a frame, in :attr:`ChangeDetector.last_reason`
+FIRST = "first"
+CHANGE = "change"
+SETTLE = "settle"
+HEARTBEAT = "heartbeat"
+FORCED = "forced"
+
+
+class ChangeDetector:
+    """Tells which frames differ meaningfully from the last processed one.
+
+    :param pixel_threshold: minimum change of a single pixel, in degrees.
+    :param block_threshold: minimum change of the mean of a block.
+    :param block: block side in pixels, dividing the frame shape.
+    :param levels: temperatures whose crossing by any pixel is a change.
+    :param noise_factor: thresholds are at least this many standard
+        deviations of the frame-to-frame noise.
+    :param heartbeat: seconds after which a frame is processed anyway.
+    :param settle: seconds during which frames keep being processed after a
+        change.
+    :param shape: rows and columns of the frames.
+    """
+
+    def __init__(
+        self,
+        pixel_threshold: float = 1.0,
+        block_threshold: float = 0.25,
+        block: int = 4,
+        levels: Sequence[float] = (),
+        noise_factor: float = 5.0,
+        heartbeat: float = 60.0,
+        settle: float = 0.0,
+        shape: Sequence[int] = (24, 32),
+    ) -> None:
+        rows, columns = shape
+        if rows % block or columns % block:
+            raise ValueError(f"Block size {block} does not divide the frame shape {shape}")
+        self.pixel_threshold = pixel_threshold
+        self.block_threshold = block_threshold
+        self.block = block
+        self.levels = np.array(levels, dtype=np.float32).reshape(-1, 1)
+        self.noise_factor = noise_factor
+        self.heartbeat = heartbeat
+        self.settle = settle
+        self._blocks = (rows // block, block, columns // block, block)
+
+        size = rows * columns
+        self._reference = np.zeros(size, dtype=np.float32)  # Last processed frame
+        self._previous = np.zeros(size, dtype=np.float32)
+        self._frame = np.zeros(size, dtype=np.float32)
+        self._delta = np.zeros(size, dtype=np.float32)
+        self._started = False
+        self._forced = False
+        self._last_processed = -math.inf
+        self._settle_until = -math.inf
+
+        self.noise: Optional[float] = None  # Estimated standard deviation of a pixel, in degrees
+        self.processed = 0
+        self.skipped = 0
+        self.changes = 0
+        self.heartbeats = 0
+        self.last_reason: Optional[str] = None
+
+    def force(self) -> None:
+        """Process the next frame, e.g. after a display setting changed."""
+        self._forced = True
+
+    def update(self, frame: Sequence[float], now: float) -> bool:
+        """Take the next frame, captured at ``now`` (seconds, monotonic).
+        Returns True when it should be processed, and then makes it the
+        reference for the next frames."""
+        np.copyto(self._frame, np.asarray(frame, dtype=np.float32).reshape(-1))
+        frame = self._frame
+        delta = self._delta
+
+        if self._started:
+            # Deltas between consecutive frames are mostly noise, with a
+            # standard deviation of sqrt(2) times the pixel noise
+            np.subtract(frame, self._previous, out=delta)
+            np.abs(delta, out=delta)
+            noise = float(np.median(delta)) * 1.4826 / math.sqrt(2)
+            self.noise = noise if self.noise is None else 0.9 * self.noise + 0.1 * noise
+        np.copyto(self._previous, frame)
+
+        if not self._started:
+            reason = FIRST
+        elif self._changed():
+            reason = CHANGE
+        elif self._forced:
+            reason = FORCED
+        elif now < self._settle_until:
+            reason = SETTLE
+        elif now - self._last_processed >= self.heartbeat:
+            reason = HEARTBEAT
+        else:
+            self.skipped += 1
+            self.last_reason = None
+            return False
+
+        if reason in (FIRST, CHANGE):
+            self._settle_until = now + self.settle
+            self.changes += reason == CHANGE
+        self.heartbeats += reason == HEARTBEAT
+        self.processed += 1
+        self.last_reason = reason
+        self._started = True
+        self._forced = False
+        self._last_processed = now
+        np.copyto(self._reference, frame)
+        return True
+
+    def _changed(self) -> bool:
+        delta = self._delta
+        np.subtract(self._frame, self._reference, out=delta)
+        noise = self.noise_factor * math.sqrt(2) * (self.noise or 0.0)
+
+        if np.abs(delta).max() > max(self.pixel_threshold, noise):
+            return True
+        blocks = delta.reshape(self._blocks).mean(axis=(1, 3))
+        if np.abs(blocks).max() > max(self.block_threshold, noise / self.block):
+            return True
+        if len(self.levels):
+            return bool(((self._frame > self.levels) != (self._reference > self.levels)).any())
+        return False
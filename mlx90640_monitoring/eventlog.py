@@ -0,0 +1,205 @@
+"""
+Asynchronous structured event log (JSON lines).
+
+:meth:`EventLog.log` never blocks the caller on I/O: it applies the
+per-kind rate limit, then hands the event to a background thread through a
+bounded queue. When the queue is full, the event is dropped and counted,
+and the count is written with the next event that gets through
+(``"dropped"``).
+
+Each kind of event can be rate-limited with a minimum interval. For these
+kinds, events inside the interval, and events repeating the previous one of
+their kind within ``dedup_seconds``, are suppressed; the number suppressed is
+written with the next event of that kind (``"suppressed"``). Kinds without
+an interval (alarms, resets...) are never suppressed, even when repeated.
+
+The writer thread serialises the events, appends them to the file in
+batches, flushes every ``flush_interval`` seconds rather than every line
+(fewer writes to the SD card), and rotates the file when it exceeds
+``max_bytes``, keeping ``backups`` old files (``events.jsonl.1``...). With
+``echo``, the messages are printed on stdout by that thread as well.
+
+Each line holds ``ts`` (seconds since the epoch), ``kind``, ``msg`` and the
+event's fields::
+
+    {"ts": 1718000000.25, "kind": "alarm", "msg": "!!! ALARM CONFIRMED ...", "max_temp": 41.2}
+"""
+
+import json
+import os
+import queue
+import sys
+import threading
+import time
+
+try:
+    from typing import Any, Dict, Optional
+except ImportError:
+    pass
+
+_CLOSE = object()
+
+
+class EventLog:
+    """JSON lines event log written by a background thread.
+
+    :param path: log file, None to only echo.
+    :param intervals: minimum seconds between two events of a kind, by kind.
+        Only these kinds are rate-limited and deduplicated.
+    :param dedup_seconds: identical consecutive events of a rate-limited kind
+        are written once per this many seconds.
+    :param max_bytes: size above which the file is rotated.
+    :param backups: number of rotated files kept.
+    :param queue_size: events waiting for the writer before dropping.
+    :param flush_interval: seconds between two flushes of the file.
+    :param echo: also print the messages on stdout.
+    """
+
+    def __init__(
+        self,
+        path: Optional[str],
+        intervals: Optional[Dict[str, float]] = None,
+        dedup_seconds: float = 60.0,
+        max_bytes: int = 1 << 20,
+        backups: int = 3,
+        queue_size: int = 1024,
+        flush_interval: float = 5.0,
+        echo: bool = True,
+    ) -> None:
+        self.path = path
+        self.intervals = dict(intervals or {})
+        self.dedup_seconds = dedup_seconds
+        self.max_bytes = max_bytes
+        self.backups = backups
+        self.flush_interval = flush_interval
+        self.echo = echo
+
+        # Per kind: (monotonic time, fields) of the last event let through,
+        # and the number of events suppressed since
+        self._last: Dict[str, Any] = {}
+        self._suppressed: Dict[str, int] = {}
+        self._pending_drops = 0
+
+        self.written = 0
+        self.suppressed = 0
+        self.dropped = 0
+        self.rotations = 0
+        self.errors = 0
+
+        self._queue = queue.Queue(maxsize=queue_size)
+        self._writer = threading.Thread(target=self._write_loop, name="event-log")
+        self._writer.daemon = True
+        self._writer.start()
+
+    def log(self, kind: str, msg: str = "", **fields: Any) -> bool:
+        """Record an event of ``kind``. Returns whether it was queued, False
+        when it was rate-limited, deduplicated or dropped."""
+        now = time.monotonic()
+        last = self._last.get(kind)
+        interval = self.intervals.get(kind)
+        if last is not None and interval is not None:
+            elapsed = now - last[0]
+            if elapsed < interval or (elapsed < self.dedup_seconds and last[1] == (msg, fields)):
+                self._suppressed[kind] = self._suppressed.get(kind, 0) + 1
+                self.suppressed += 1
+                return False
+
+        event = {"ts": round(time.time(), 3), "kind": kind, "msg": msg}
+        event.update(fields)
+        suppressed = self._suppressed.pop(kind, 0)
+        if suppressed:
+            event["suppressed"] = suppressed
+        if self._pending_drops:
+            event["dropped"] = self._pending_drops
+        try:
+            self._queue.put_nowait(event)
+        except queue.Full:
+            self.dropped += 1
+            self._pending_drops += 1
+            self._suppressed[kind] = suppressed  # Reported with the next one
+            return False
+        self._pending_drops = 0
+        self._last[kind] = (now, (msg, fields))
+        return True
+
+    def close(self, timeout: float = 5.0) -> None:
+        """Write the queued events and stop the writer thread."""
+        try:
+            if self._pending_drops:
+                self._queue.put(
+                    {"ts": round(time.time(), 3), "kind": "eventlog", "msg": "", "dropped": self._pending_drops},
+                    timeout=timeout,
+                )
+                self._pending_drops = 0
+            self._queue.put(_CLOSE, timeout=timeout)
+        except queue.Full:
+            return
+        self._writer.join(timeout)
+
+    def _write_loop(self) -> None:
+        stream = None
+        size = 0
+        next_flush = time.monotonic() + self.flush_interval
+        closing = False
+        while not closing:
+            try:
+                events = [self._queue.get(timeout=max(0.0, next_flush - time.monotonic()))]
+            except queue.Empty:
+                events = []
+            # Everything already waiting goes out in the same write
+            while len(events) < 256:
+                try:
+                    events.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            if events and events[-1] is _CLOSE:
+                events.pop()
+                closing = True
+
+            try:
+                if events and self.echo:
+                    sys.stdout.write("".join(event["msg"] + "\n" for event in events if event["msg"]))
+                    sys.stdout.flush()
+                if events and self.path is not None:
+                    lines = "".join(json.dumps(event, default=str) + "\n" for event in events)
+                    if stream is None or size + len(lines) > self.max_bytes:
+                        stream, size = self._open(stream, size)
+                    stream.write(lines)
+                    size += len(lines)
+                    self.written += len(events)
+                if stream is not None and (closing or time.monotonic() >= next_flush):
+                    stream.flush()
+            except (OSError, ValueError):  # Full card, closed stdout...
+                self.errors += 1
+                if stream is not None:
+                    try:
+                        stream.close()
+                    except OSError:
+                        pass  # Buffered lines that cannot be written either
+                    stream = None
+            if time.monotonic() >= next_flush:
+                next_flush = time.monotonic() + self.flush_interval
+        if stream is not None:
+            stream.close()
+
+    def _open(self, stream, size: int):
+        if stream is None:
+            # (Re)opening, e.g. at start: append to the current file
+            try:
+                size = os.path.getsize(self.path)
+            except OSError:
+                size = 0
+            if size < self.max_bytes:
+                return open(self.path, "a", encoding="utf-8"), size
+        else:
+            stream.close()
+        for index in range(self.backups - 1, 0, -1):
+            older = f"{self.path}.{index}"
+            if os.path.exists(older):
+                os.replace(older, f"{self.path}.{index + 1}")
+        if self.backups > 0 and os.path.exists(self.path):
+            os.replace(self.path, f"{self.path}.1")
+        elif os.path.exists(self.path):
+            os.remove(self.path)
+        self.rotations += 1
+        return open(self.path, "w", encoding="utf-8"), 0
@@ -0,0 +1,167 @@
+from .startup import StartupProfile
+profile = StartupProfile()  # En premier, pour mesurer la durée des autres imports
+
+import argparse
+import time
+import board
+import busio
+import pygame
+import numpy as np
+from . import adafruitmlx90640_librairie as adafruit_mlx90640
+from .acquisition import SensorSupervisor
+from .changes import ChangeDetector
+from .analysis import DisplayFilter
+# Palettes précalculées : matplotlib n'est importé que pour une palette absente de palettes.py
+from .palettes import get_palette
+profile.mark("imports")
+
+# =========================================================
+# CONFIGURATION
+# =========================================================
+WIDTH, HEIGHT = 32, 24
+SCALE = 20
+WIN_W, WIN_H = WIDTH * SCALE, HEIGHT * SCALE
+
+ALPHA = 0.5  # Part de la nouvelle image dans l'image affichée
+RANGE_SMOOTHING = 0.1  # Part du min / max de la nouvelle image dans l'échelle de couleurs
+
+EMISSIVITY = 0.95  # Émissivité des surfaces observées (aluminium : 0.2 à 0.7)
+REFLECTED_TEMPERATURE = None  # Température moyenne de la zone (°C), None : estimée par le capteur
+
+# L'image n'est recalculée que si la scène change (variation d'un pixel ou d'un bloc 4x4)
+CHANGE_PIXEL_THRESHOLD = 1.0  # Variation d'un pixel (°C)
+CHANGE_BLOCK_THRESHOLD = 0.25  # Variation moyenne d'un bloc de 4x4 pixels (°C)
+HEARTBEAT_INTERVAL = 10.0  # Rendu au moins toutes les 10 s
+SETTLE_TIME = 4.0  # Rendu pendant 4 s après un changement, le temps que les lissages convergent
+RANGE_TOLERANCE = 0.5  # Rendu tant que l'échelle de couleurs est à plus de 0.5 °C de sa cible (°C)
+
+# =========================================================
+# CREATION PALETTE DE COULEURS
+# =========================================================
+# Liste des palettes : celles de palettes.NAMES sont précalculées, les autres
+# (noms de colormaps matplotlib) sont calculées au démarrage
+PALETTE_NAMES = ['jet','bwr','seismic','coolwarm','PiYG_r','tab10','tab20','gnuplot2','brg']
+
+def main():
+    parser = argparse.ArgumentParser(description="Image thermique du MLX90640 en temps réel.")
+    parser.add_argument("--profile-startup", action="store_true",
+                        help="affiche le temps jusqu'à la première image et quitte")
+    args = parser.parse_args()
+
+    current_palette_idx = 0
+    PALETTE = get_palette(PALETTE_NAMES[current_palette_idx])
+
+    # =========================================================
+    # INITIALISATION PYGAME & MATÉRIEL
+    # =========================================================
+    pygame.init()
+    screen = pygame.display.set_mode((WIN_W + 120, WIN_H))
+    pygame.display.set_caption("Appuyez sur C pour changer de palette - ESC pour stopper")
+    font = pygame.font.SysFont(None, 24)
+    surface = pygame.Surface((WIDTH, HEIGHT))
+    # Initialisation de la caméra
+    # Fréquence I2C gérée par /boot/firmware/config.txt (recommandé: 400000)
+    i2c = busio.I2C(board.SCL, board.SDA)
+    mlx = adafruit_mlx90640.MLX90640(i2c)
+    #Refresh Rate à fixer
+    mlx.refresh_rate = adafruit_mlx90640.RefreshRate.REFRESH_8_HZ
+    mlx.emissivity = EMISSIVITY
+    mlx.reflected_temperature = REFLECTED_TEMPERATURE
+    # Relance le bus I2C en cas d'erreur, sans relire l'EEPROM du capteur
+    supervisor = SensorSupervisor(mlx, i2c, lambda: busio.I2C(board.SCL, board.SDA))
+    profile.mark("sensor")
+
+    # Crétation de la frame vide pour recevoir les données de get_frame
+    frame = np.zeros(WIDTH * HEIGHT)
+    detector = ChangeDetector(CHANGE_PIXEL_THRESHOLD, CHANGE_BLOCK_THRESHOLD,
+                              heartbeat=HEARTBEAT_INTERVAL, settle=SETTLE_TIME)
+    # Lissages de l'image et de l'échelle (analysis.py), rejouables avec replay.py
+    display = DisplayFilter(ALPHA, RANGE_SMOOTHING)
+
+    # =========================================================
+    # BOUCLE PRINCIPALE
+    # =========================================================
+    running = True
+    while running:
+        for event in pygame.event.get():
+
+            # on tape 'c' pour changer de palette
+            # on tape 'ESC' pour arrêter le programme
+            if event.type == pygame.KEYDOWN:
+                if event.key == pygame.K_ESCAPE:
+                    pygame.display.quit()
+                    pygame.quit()
+                    running = False
+
+                if event.key == pygame.K_c:
+                    current_palette_idx = (current_palette_idx + 1) % len(PALETTE_NAMES)
+                    new_name = PALETTE_NAMES[current_palette_idx]
+                    PALETTE = get_palette(new_name)
+                    print(f"Palette changée pour : {new_name}")
+                    detector.force()
+
+        try:
+            # Prend la frame de température déjà calculé par la libraire adafruit
+            recovery_time = supervisor.read(frame)
+            if recovery_time is not None:
+                print(f"Capteur rétabli en {recovery_time * 1000:.0f} ms")
+            if args.profile_startup:
+                profile.mark("first frame")
+            # Scène inchangée et échelle de couleurs arrivée à sa cible : on garde l'image affichée
+            changed = detector.update(frame, time.monotonic())
+            if not changed and display.converged(RANGE_TOLERANCE):
+                continue
+
+            # Filtre 1 : Prend une partie de l'ancienne image pour faire la nouvelle
+            # Filtre 2 : on fait le produit de convolution de l'image par la matrice gaussienne (GAUSSIAN_KERNEL de analysis.py)
+            # On prend l'ancienne température maximale et minimale pour lisser sur le temps
+            # On peut avoir moins de lissage en augmentant RANGE_SMOOTHING.
+            smoothed = display.update(frame)
+            dynamic_min, dynamic_max = display.minimum, display.maximum
+
+            # Produit en croix pour faire devenir les pixels de la température la plus basse '0' et les pixels les plus chauds '1'
+            # Puis on multiplie par 255 pour créer un index
+            # le 0.000001 est là pour éviter une division par 0 car lorsque le capteur et couvert le mix et le max devienne égaux
+            idx = ((smoothed - dynamic_min) * 255.0 / (dynamic_max - dynamic_min + 1e-6))
+            idx = np.clip(idx, 0, 255).astype(np.uint8)
+
+            # Colorisation du frame
+            # On inverse l'image
+            rgb_array = PALETTE[idx]
+            rgb_array = np.flip(rgb_array, axis=1)
+            pygame_format = np.transpose(rgb_array, (1, 0, 2))
+
+            # Affichage de l'image
+            pygame.surfarray.blit_array(surface, pygame_format)
+            scaled = pygame.transform.smoothscale(surface, (WIN_W, WIN_H))
+            screen.blit(scaled, (0, 0))
+
+            # --- Barre latérale et texte ---
+            pygame.draw.rect(screen, (30, 30, 30), (WIN_W, 0, 120, WIN_H))
+
+            # Dessiner la petite barre de l'échelle actuelle
+            for i in range(256):
+                y_p = WIN_H - 50 - (i * (WIN_H-100) / 255)
+                pygame.draw.line(screen, PALETTE[i], (WIN_W + 20, y_p), (WIN_W + 40, y_p))
+
+            # affichage de la temp_max, min et du nom de la palette utilisée
+            screen.blit(font.render(PALETTE_NAMES[current_palette_idx].upper(), True, (255, 255, 255)), (WIN_W + 15, WIN_H-15))
+            screen.blit(font.render(f"{dynamic_max:.1f}", True, (255,255,255)), (WIN_W + 15, 20))
+            screen.blit(font.render(f"{dynamic_min:.1f}", True, (255,255,255)), (WIN_W + 15, WIN_H - 40))
+
+
+        except Exception as e:
+            print(f"Erreur : {e}")
+            continue
+
+        pygame.display.flip()
+        if args.profile_startup:
+            profile.mark("first display")
+            profile.report()
+            running = False
+
+    pygame.quit()
+
+
+if __name__ == "__main__":
+    main()
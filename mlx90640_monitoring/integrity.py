@@ -0,0 +1,233 @@
+"""
+Integrity checks of the subpages read from the sensor.
+
+At 800 kHz a bit error on the I2C bus corrupts single words of a subpage. A
+flipped high bit in a pixel word becomes an absurd temperature. In an
+auxiliary word (supply voltage, PTAT, gain) or in the control register read
+with the subpage, it skews the whole subpage. Fed to the alarm, either one
+accumulates overheat time that was never there.
+
+A :class:`FrameValidator` installed on the driver (``mlx.validator``)
+checks each subpage in two steps, each one NumPy pass over the subpage:
+
+* before the conversion, the raw words: the control register must read
+  back as written, Vdd and Ta (``_GetVdd``, ``_GetTa``) must be within the
+  sensor's operating range and must not jump from the previous subpage
+  unless the next one confirms it, and the gain word must stay close to its
+  EEPROM value;
+* after the conversion, the temperatures of the pixels of the subpage,
+  clipped to the measurement range: a pixel more than ``spike`` degrees
+  above or below all of its 8 neighbours and away from its previous reading
+  is a corrupted word, and is replaced by the median of its neighbours. A
+  real peak that appears is repaired once, then confirmed by the next
+  reading, which is compared with the unrepaired one. A subpage with more
+  than ``max_repairs`` corrupted pixels is rejected.
+
+A rejected subpage raises :class:`IntegrityError`, a ``FrameError``, so
+``SensorSupervisor`` reads the frame again. Counters of the checks are kept
+on the validator.
+"""
+
+import numpy as np
+
+from .adafruitmlx90640_librairie import FrameError
+
+try:
+    from typing import Dict, List, Optional, Tuple
+except ImportError:
+    pass
+
+# Configuration bits of the control register: subpage mode, step mode,
+# refresh rate, resolution and reading pattern
+CONTROL_MASK = 0x1F83
+
+# Reasons of a rejection, the keys of FrameValidator.rejected
+CONTROL = "control"  # Control register did not read back as written
+VDD = "vdd"  # Supply voltage out of range or jumped
+TA = "ta"  # Ambient temperature out of range or jumped
+GAIN = "gain"  # Gain word far from its EEPROM value
+PIXELS = "pixels"  # More corrupted pixels than can be repaired
+
+
+class IntegrityError(FrameError):
+    """Raised when a subpage fails the integrity checks."""
+
+    def __init__(self, reason: str, message: str) -> None:
+        super().__init__(message)
+        self.reason = reason
+
+
+def _neighbour_table(rows: int = 24, columns: int = 32) -> np.ndarray:
+    # (8, pixels) indices of the 8 neighbours of each pixel, rows * columns
+    # (a NaN slot of the image) outside the frame
+    row, column = np.divmod(np.arange(rows * columns), columns)
+    table = []
+    for dy in (-1, 0, 1):
+        for dx in (-1, 0, 1):
+            if dy or dx:
+                r, c = row + dy, column + dx
+                inside = (r >= 0) & (r < rows) & (c >= 0) & (c < columns)
+                table.append(np.where(inside, r * columns + c, rows * columns))
+    return np.array(table)
+
+
+class FrameValidator:
+    """Checks and repairs the subpages read by an ``MLX90640``.
+
+    :param mlx: the sensor driver; set ``mlx.validator`` to this object.
+    :param temperature_range: measurement range of the sensor, degrees C;
+        temperatures are clipped to it.
+    :param spike: degrees above or below all of its neighbours, and away from
+        its previous reading, that make a pixel corrupted.
+    :param max_repairs: corrupted pixels repaired in a subpage, more reject it.
+    :param vdd_range: plausible supply voltage, V.
+    :param ta_range: plausible ambient (die) temperature, degrees C.
+    :param max_vdd_step: change of Vdd from the previous subpage, V, that
+        has to be confirmed by the next one.
+    :param max_ta_step: same for Ta, degrees C.
+    :param max_gain_drift: relative distance of the gain word from the
+        EEPROM gain.
+    """
+
+    def __init__(
+        self,
+        mlx,
+        temperature_range: Tuple[float, float] = (-40.0, 300.0),
+        spike: float = 10.0,
+        max_repairs: int = 8,
+        vdd_range: Tuple[float, float] = (3.0, 3.6),
+        ta_range: Tuple[float, float] = (-40.0, 85.0),
+        max_vdd_step: float = 0.1,
+        max_ta_step: float = 2.0,
+        max_gain_drift: float = 0.2,
+    ) -> None:
+        self.mlx = mlx
+        self.temperature_range = temperature_range
+        self.spike = spike
+        self.max_repairs = max_repairs
+        self.vdd_range = vdd_range
+        self.ta_range = ta_range
+        self.max_vdd_step = max_vdd_step
+        self.max_ta_step = max_ta_step
+        self.max_gain_drift = max_gain_drift
+
+        self.checked = 0  # Subpages checked
+        self.rejected: Dict[str, int] = {CONTROL: 0, VDD: 0, TA: 0, GAIN: 0, PIXELS: 0}
+        self.repaired = 0  # Corrupted pixels replaced by their neighbours
+        self.clipped = 0  # Pixels brought back into the temperature range
+
+        cal = mlx.calibration
+        bad = np.frombuffer(bytes(cal.badPixelMask), dtype=np.uint8).astype(bool)
+        pixel = np.arange(768)
+        interleaved = (pixel // 32) % 2
+        chess = interleaved ^ (pixel % 2)
+        # Measured pixels of each subpage, per reading pattern, without the
+        # bad pixels (-273.15, interpolated after the frame)
+        self._pixels = [
+            [np.nonzero((pattern == subPage) & ~bad)[0] for subPage in (0, 1)]
+            for pattern in (interleaved, chess)
+        ]
+        self._neighbours = _neighbour_table()
+        # Last accepted temperatures, as converted (before any repair), and a
+        # trailing NaN for the neighbours outside the frame
+        self._image = np.full(769, np.nan)
+        self._frame = np.full(768, np.nan)  # Last accepted temperatures, as repaired
+        self._last: Dict[str, Optional[float]] = {VDD: None, TA: None}
+        self._candidate: Dict[str, Optional[float]] = {VDD: None, TA: None}
+        self._vdd = self._ta = 0.0
+
+    @property
+    def rejected_subpages(self) -> int:
+        return sum(self.rejected.values())
+
+    def counters(self) -> Dict[str, int]:
+        """Counters of the checks, e.g. for a status message."""
+        counters = {"checked": self.checked, "repaired": self.repaired, "clipped": self.clipped}
+        counters.update(("rejected_" + reason, count) for reason, count in self.rejected.items())
+        return counters
+
+    def check_words(self, frameData: List[int]) -> None:
+        """Check the raw words of a subpage (834 words as filled by
+        ``_GetFrameData``) before the conversion."""
+        mlx = self.mlx
+        self.checked += 1
+        control = frameData[832]
+        if (control ^ mlx._controlRegister) & CONTROL_MASK:
+            self._reject(CONTROL, f"Control register read 0x{control:04x}, "
+                                  f"expected 0x{mlx._controlRegister:04x}")
+
+        gain = frameData[778] - 65536 if frameData[778] > 32767 else frameData[778]
+        gainEE = mlx.calibration.gainEE
+        if not gain or abs(gainEE / gain - 1) > self.max_gain_drift:
+            self._reject(GAIN, f"Gain word {gain} for an EEPROM gain of {gainEE}")
+
+        self._vdd = mlx._GetVdd(frameData)
+        self._check_aux(VDD, self._vdd, self.vdd_range, self.max_vdd_step)
+        self._ta = mlx._GetTa(frameData)
+        self._check_aux(TA, self._ta, self.ta_range, self.max_ta_step)
+
+    def check_temperatures(self, frameData: List[int], framebuf: List[float]) -> None:
+        """Check the temperatures converted from ``frameData`` into
+        ``framebuf``, repairing isolated corrupted pixels in place."""
+        low, high = self.temperature_range
+        chess = 1 if frameData[832] & 0x1000 else 0
+        pixels = self._pixels[chess][frameData[833]]
+        values = np.asarray(framebuf, dtype=np.float64)[pixels]
+        image = self._image.copy()
+        image[pixels] = values
+
+        spike = self.spike
+        clipped = np.clip(values, low, high)
+        out = clipped != values  # NaN included
+        neighbours = np.clip(image, low, high)[self._neighbours[:, pixels]]
+        valid = ~np.isnan(neighbours)
+        above = ((neighbours < clipped - spike) | ~valid).all(axis=0)
+        below = ((neighbours > clipped + spike) | ~valid).all(axis=0)
+        # A real peak is read again in the next subpage, a bit error is not
+        steady = np.abs(clipped - np.clip(self._image[pixels], low, high)) <= spike
+        corrupted = ((above | below) & valid.any(axis=0) & ~steady) | np.isnan(values)
+        count = int(np.count_nonzero(corrupted))
+        if count > self.max_repairs or not valid[:, corrupted].any(axis=0).all():
+            self.restore(frameData, framebuf)
+            self._reject(PIXELS, f"{count} corrupted pixels in subpage {frameData[833]}")
+
+        if count:
+            clipped[corrupted] = np.nanmedian(neighbours[:, corrupted], axis=0)
+        changed = out | corrupted
+        if changed.any():
+            for pixel, value in zip(pixels[changed].tolist(), clipped[changed].tolist()):
+                framebuf[pixel] = value
+            self.clipped += int(np.count_nonzero(out & ~corrupted))
+            self.repaired += count
+
+        # Accepted: the neighbours of the next subpage
+        self._image = image
+        self._frame[pixels] = clipped
+        self._last[VDD], self._last[TA] = self._vdd, self._ta
+        self._candidate[VDD] = self._candidate[TA] = None
+
+    def restore(self, frameData: List[int], framebuf: List[float]) -> None:
+        """Put back the last accepted temperatures of the subpage of
+        ``frameData`` after its conversion failed: the next subpage read may
+        be the other one again, and the frame would keep the failed one."""
+        chess = 1 if frameData[832] & 0x1000 else 0
+        pixels = self._pixels[chess][frameData[833]]
+        for pixel, value in zip(pixels.tolist(), self._frame[pixels].tolist()):
+            framebuf[pixel] = value
+
+    def _check_aux(self, name: str, value: float, bounds: Tuple[float, float], max_step: float) -> None:
+        if not bounds[0] <= value <= bounds[1]:
+            self._reject(name, f"{name} {value:.2f} out of range")
+        last = self._last[name]
+        if last is None or abs(value - last) <= max_step:
+            return
+        # A real change is read again in the next subpage, a bit error is not
+        candidate = self._candidate[name]
+        if candidate is not None and abs(value - candidate) <= max_step:
+            return
+        self._candidate[name] = value
+        self._reject(name, f"{name} jumped from {last:.2f} to {value:.2f}")
+
+    def _reject(self, reason: str, message: str) -> None:
+        self.rejected[reason] += 1
+        raise IntegrityError(reason, message)
@@ -0,0 +1,229 @@
+from .startup import StartupProfile
+profile = StartupProfile()  # First, to time the other imports
+
+import argparse
+import atexit
+import time
+import board
+import busio
+from . import adafruitmlx90640_librairie as adafruit_mlx90640
+from .acquisition import PollSchedule, SensorSupervisor
+from .snapshot import SnapshotRecorder
+from .rollups import RollupEngine
+from .changes import ChangeDetector
+from .eventlog import EventLog
+from .integrity import FrameValidator
+from .analysis import ACCUMULATING, ALARM, RESET, TEMPORARY_DROP, AlarmTracker, get_max_temp_filtered
+profile.mark("imports")
+
+
+# --- CONFIGURATION ---
+I2C_FREQUENCY = 800000  # I2C bus clock (Hz)
+ALARM_THRESHOLD = 20.0  # Temperature to trigger alarm (°C)
+NEIGHBOR_THRESHOLD = ALARM_THRESHOLD - 5 # Tolerated temperature of hot spot neighbors
+REQUIRED_DURATION = 30.0    # Cumulative duration above threshold (seconds)
+GRACE_PERIOD = 5.0          # Tolerance delay before resetting timer
+MIN_HOT_PIXELS = 1  # Minimum number of hot pixels to trigger alarm
+EMISSIVITY = 0.95  # Emissivity of the observed surfaces (aluminium: 0.2 to 0.7)
+MATERIALS_MASK = None  # 24x32 mask of materials (image, .txt or .npy), None: EMISSIVITY everywhere
+MATERIALS = {255: 0.3}  # Mask label -> emissivity, other labels use EMISSIVITY
+REFLECTED_TEMPERATURE = None  # Mean temperature of the storage area (°C), None: estimated by the sensor
+CHANGE_PIXEL_THRESHOLD = 1.0  # Pixel change (°C) that triggers analysis and display
+CHANGE_BLOCK_THRESHOLD = 0.25  # Mean change of a 4x4 pixel block (°C) that triggers them
+HEARTBEAT_INTERVAL = 60.0  # Unchanged frames are still analysed and displayed this often (seconds)
+INTEGRITY_CHECKS = True  # Reject or repair subpages corrupted by I2C bit errors (see integrity.py)
+SPIKE_THRESHOLD = 10.0  # Isolated pixel this far (°C) from all its neighbours and its last reading: corrupted
+POLL_INTERVAL = 0.0  # Seconds between two frames, > 0 makes the sensor measure only on request (step mode)
+ALERT_POLL_INTERVAL = 1.0  # Seconds between two frames while a hot spot is accumulating, with POLL_INTERVAL
+FAULT_REPORT_INTERVAL = 60.0  # Seconds between two "sensor_fault" messages while the sensor does not answer
+PRINT_TEMPERATURES = False # Enable temperature display
+PRINT_ASCIIART = False # Enable ASCII art display (with PRINT_TEMPERATURES: each value followed by its character)
+TERMINAL_COLOURS = True  # Colour the temperature / ASCII art grid by temperature
+TERMINAL_MAX_FPS = 2.0  # Grid redraws per second at most
+SNAPSHOT_DIR = "snapshots"  # Where alarm snapshots are written
+SNAPSHOT_PRE_SECONDS = 60.0  # Frames kept before the alarm
+SNAPSHOT_POST_SECONDS = 20.0  # Frames recorded after the alarm
+SNAPSHOT_MAX_FPS = 2.0  # Upper bound of the loop rate, sizes the ring buffer
+ROLLUP_DB = "rollups.sqlite"  # SQLite file for 1 min / 1 h statistics (None: memory only)
+REGIONS = {  # Region name -> (row start, row end, column start, column end)
+    "full": (0, 24, 0, 32),
+}
+EVENT_LOG = "events.jsonl"  # JSON lines log of the messages (None: console only)
+EVENT_LOG_MAX_BYTES = 1000000  # Log size before rotation, 3 old files are kept
+LOG_ECHO = True  # Also print the messages on the console
+LOG_INTERVALS = {  # Message kind -> minimum seconds between two messages (kinds not listed: all)
+    "status": 10.0,
+    "accumulating": 5.0,
+    "temporary_drop": 5.0,
+    "falling_behind": 30.0,
+    "integrity": 30.0,
+}
+TELEMETRY_HOST = None  # MQTT broker host name or address (None: no telemetry, needs paho-mqtt)
+TELEMETRY_PORT = 1883
+TELEMETRY_SITE = "site-1"  # Name of this installation in the messages
+TELEMETRY_TOPIC = "mlx90640/site-1"  # Topic prefix of the message batches
+TELEMETRY_QUEUE_DIR = "telemetry-queue"  # Batches waiting for the broker during outages
+TELEMETRY_EVENTS = ("startup", "sensor_fault", "recovery", ALARM, RESET)  # Event kinds sent to the broker
+TELEMETRY_ROLLUP = 60  # Region statistics sent every minute (rollup resolution in seconds)
+TELEMETRY_FRAME_INTERVAL = 60.0  # Seconds between two downsampled frames (None: no frames)
+TELEMETRY_FRAME_FACTOR = 4  # Frames are sent as means of 4x4 pixel blocks (6x8 values)
+
+def open_bus():
+    return busio.I2C(board.SCL, board.SDA, frequency=I2C_FREQUENCY)
+
+def main():
+    parser = argparse.ArgumentParser(description="Overheat monitoring with the MLX90640 thermal camera.")
+    parser.add_argument("--profile-startup", action="store_true",
+                        help="print the time to the first frame and exit")
+    args = parser.parse_args()
+
+    # Messages are written by a background thread, the loop never waits for the console or the card
+    events = EventLog(EVENT_LOG, LOG_INTERVALS, max_bytes=EVENT_LOG_MAX_BYTES, echo=LOG_ECHO)
+    atexit.register(events.close)
+    # Events, statistics and frames for central monitoring, sent by a background thread
+    telemetry = None
+    if TELEMETRY_HOST is not None:
+        from .telemetry import TelemetryPublisher, downsample
+        telemetry = TelemetryPublisher(TELEMETRY_HOST, TELEMETRY_PORT, TELEMETRY_TOPIC, TELEMETRY_SITE,
+                                       TELEMETRY_QUEUE_DIR)
+        atexit.register(telemetry.close)
+
+    def notify(kind, msg, **fields):
+        events.log(kind, msg, **fields)
+        if telemetry is not None and kind in TELEMETRY_EVENTS:
+            telemetry.publish(kind, **fields)
+
+
+    i2c = open_bus()
+    mlx = adafruit_mlx90640.MLX90640(i2c)
+    notify("startup", "MLX addr detected on I2C")
+
+    # Camera refresh rate. (above 4Hz requires increasing i2c baudrate)
+    mlx.refresh_rate = adafruit_mlx90640.RefreshRate.REFRESH_1_HZ
+    if MATERIALS_MASK is None:
+        mlx.emissivity = EMISSIVITY
+    else:
+        from .pixelmaps import load_mask, pixel_map
+        mlx.emissivity = pixel_map(load_mask(MATERIALS_MASK), MATERIALS, default=EMISSIVITY)
+    mlx.reflected_temperature = REFLECTED_TEMPERATURE
+    # Slow cadence: the sensor idles between frames instead of measuring continuously
+    mlx.step_mode = POLL_INTERVAL > 0
+    # Bit errors at 800 kHz: implausible subpages are read again, isolated corrupted pixels repaired
+    if INTEGRITY_CHECKS:
+        mlx.validator = FrameValidator(mlx, spike=SPIKE_THRESHOLD)
+    schedule = PollSchedule(POLL_INTERVAL, ALERT_POLL_INTERVAL if POLL_INTERVAL > 0 else None)
+    profile.mark("sensor")
+    # Retries and re-opens the bus on I2C glitches, keeping the calibration
+    supervisor = SensorSupervisor(mlx, i2c, open_bus, fault_interval=FAULT_REPORT_INTERVAL)
+    # An outage is reported when it starts and while it lasts, not only once the sensor is back
+    supervisor.on_fault = lambda kind, failures, elapsed, error: notify(
+        "sensor_fault", f"Sensor fault ({kind}): {error!r}, {failures} failures in {elapsed:.0f}s",
+        fault=kind, failures=failures, elapsed_s=round(elapsed, 1), error=repr(error))
+
+    frame = [0] * 768
+    recorder = SnapshotRecorder(SNAPSHOT_DIR, SNAPSHOT_PRE_SECONDS, SNAPSHOT_POST_SECONDS, SNAPSHOT_MAX_FPS)
+    rollups = RollupEngine(ROLLUP_DB, REGIONS, threshold=ALARM_THRESHOLD)
+    atexit.register(recorder.close)
+    atexit.register(rollups.close)
+    if telemetry is not None:
+        def publish_rollup(seconds, rows):
+            if seconds == TELEMETRY_ROLLUP:
+                telemetry.publish("regions", start=rows[0][2], regions=[
+                    {"region": r[0], "max": round(r[3], 1), "mean": round(r[4], 1), "hot_mean": round(r[5], 1),
+                     "hot_max": r[6], "samples": r[7]} for r in rows])
+        rollups.on_close = publish_rollup
+    # Frames equal to the last analysed one (up to the sensor noise) reuse its analysis.
+    # Crossing the alarm or neighbor threshold always counts as a change.
+    detector = ChangeDetector(CHANGE_PIXEL_THRESHOLD, CHANGE_BLOCK_THRESHOLD,
+                              levels=(ALARM_THRESHOLD, NEIGHBOR_THRESHOLD), heartbeat=HEARTBEAT_INTERVAL)
+    # Grid kept at the top of the terminal, redrawn in place, messages scroll below it
+    view = None
+    if PRINT_TEMPERATURES or PRINT_ASCIIART:
+        from .terminal import ASCII, BOTH, TEMPERATURES, TerminalView
+        if PRINT_TEMPERATURES and PRINT_ASCIIART:
+            mode = BOTH  # Each temperature followed by its character
+        else:
+            mode = TEMPERATURES if PRINT_TEMPERATURES else ASCII
+        view = TerminalView(mode, colour=TERMINAL_COLOURS, max_fps=TERMINAL_MAX_FPS)
+        atexit.register(view.close)
+    # Time above the threshold confirms the alarm, short drops are tolerated (see analysis.py)
+    tracker = AlarmTracker(ALARM_THRESHOLD, REQUIRED_DURATION, GRACE_PERIOD, MIN_HOT_PIXELS)
+
+    last_check_time = time.monotonic()
+    next_frame_publish = last_check_time
+    dropped_subpages = 0  # Subpages the loop was too slow to read
+    corrupted = 0  # Subpages rejected and pixels repaired by the integrity checks
+
+    # --- MAIN LOOP ---
+    while True:
+        schedule.wait(alert=tracker.last_high_time is not None)
+        now = time.monotonic()
+        dt = now - last_check_time  # Elapsed time since last loop
+        last_check_time = now
+        recovery_time = supervisor.read(frame)
+        if args.profile_startup:
+            profile.mark("first frame")
+        if recovery_time is not None:
+            notify("recovery", f"Sensor recovered in {recovery_time * 1000:.0f} ms (faults: {supervisor.faults})",
+                       recovery_ms=round(recovery_time * 1000), faults=supervisor.faults)
+        if mlx.dropped_subpages > dropped_subpages:
+            # The loop is slower than the sensor refresh rate, part of the frame is stale
+            oldest = max(mlx.pixel_age())
+            notify("falling_behind", f"Falling behind: {mlx.dropped_subpages - dropped_subpages} subpages dropped, "
+                       f"oldest pixel {oldest:.2f}s old", dropped=mlx.dropped_subpages - dropped_subpages,
+                       oldest_pixel_s=round(oldest, 2))
+            dropped_subpages = mlx.dropped_subpages
+        if mlx.validator is not None and mlx.validator.rejected_subpages + mlx.validator.repaired > corrupted:
+            counters = mlx.validator.counters()
+            notify("integrity", f"Corrupted sensor data: {mlx.validator.rejected_subpages} subpages rejected, "
+                       f"{mlx.validator.repaired} pixels repaired", **counters)
+            corrupted = mlx.validator.rejected_subpages + mlx.validator.repaired
+        recorder.push(frame, now)
+        if telemetry is not None and TELEMETRY_FRAME_INTERVAL and now >= next_frame_publish:
+            telemetry.publish("frame", factor=TELEMETRY_FRAME_FACTOR, values=downsample(frame, TELEMETRY_FRAME_FACTOR))
+            next_frame_publish = now + TELEMETRY_FRAME_INTERVAL
+        rollups.update(frame, time.time())
+
+        report = detector.update(frame, now)
+        if report:
+            max_temp, hot_pixels_count, avg_hot_temp = get_max_temp_filtered(frame, threshold=ALARM_THRESHOLD)
+            avg_temp = sum(frame) / len(frame)
+        status = "NORMAL"
+
+        transition = tracker.update(now, dt, max_temp, hot_pixels_count)
+        if transition == ALARM:
+            recorder.trigger(now)
+            notify(ALARM, f"!!! ALARM CONFIRMED : {max_temp:.1f}°C ({hot_pixels_count} hot pixels) !!!",
+                       max_temp=round(max_temp, 1), hot_pixels=hot_pixels_count)
+        elif transition == ACCUMULATING and report:
+            notify(ACCUMULATING, f"Accumulating : {tracker.accumulated:.1f}s / {REQUIRED_DURATION}s | {hot_pixels_count} pixels @ {max_temp:.1f}°C (avg: {avg_hot_temp:.1f}°C)",
+                       accumulated_s=round(tracker.accumulated, 1), hot_pixels=hot_pixels_count,
+                       max_temp=round(max_temp, 1), avg_hot_temp=round(avg_hot_temp, 1))
+        elif transition == RESET:
+            # Below threshold for too long, everything was reset
+            notify(RESET, f"Prolonged low temperature ({tracker.below:.1f}s). Resetting timer.",
+                       below_s=round(tracker.below, 1))
+        elif transition == TEMPORARY_DROP and report:
+            # Below threshold, but waiting to see if it goes back up (GRACE_PERIOD)
+            notify(TEMPORARY_DROP, f"Temporary drop... maintaining timer ({tracker.accumulated:.1f}s / {REQUIRED_DURATION}s - grace: {tracker.below:.1f}s)",
+                       accumulated_s=round(tracker.accumulated, 1), below_s=round(tracker.below, 1))
+
+        time.sleep(0.1)
+        if not report:
+            continue
+
+        # Print grid output
+        status_line = f"Status: {status: <25} | Max Temp: {max_temp:.1f}C | Avg Temp: {avg_temp:.1f}C"
+        # The grid shows the status line itself, it is then only written to the log
+        notify("status", status_line if view is None else "", status=status,
+                   max_temp=round(max_temp, 1), avg_temp=round(avg_temp, 1))
+        if view is not None:
+            view.draw(frame, status_line, now)
+        if args.profile_startup:
+            profile.mark("first display")
+            profile.report()
+            return
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,222 @@
+"""
+Colour palettes of the thermal image, precomputed.
+
+Building a palette from a matplotlib colormap means importing matplotlib,
+seconds at start-up on a Raspberry Pi 3 for 256 colours. The palettes of
+``image_VFINAL.py`` are stored here as 256 x RGB tables instead; other
+colormap names still work, through matplotlib, imported on first use.
+
+The tables are regenerated, e.g. after adding a name to :data:`NAMES`, with
+``python3 -m mlx90640_monitoring.palettes`` (needs matplotlib).
+"""
+
+import os
+import re
+
+import numpy as np
+
+NAMES = ('jet', 'bwr', 'seismic', 'coolwarm', 'PiYG_r', 'tab10', 'tab20', 'gnuplot2', 'brg')
+
+
+def get_palette(name: str) -> np.ndarray:
+    """256 x 3 uint8 RGB table of the colormap ``name``."""
+    table = _TABLES.get(name)
+    if table is None:
+        return _from_matplotlib(name)
+    return np.frombuffer(bytes.fromhex(table), dtype=np.uint8).reshape(256, 3)
+
+
+def _from_matplotlib(name: str) -> np.ndarray:
+    # Only the RGB of the RGBA colours is kept
+    import matplotlib
+
+    cmap = matplotlib.colormaps[name]
+    indices = np.linspace(0, 1, 256)
+    return (cmap(indices)[:, :3] * 255).astype(np.uint8)
+
+
+def main() -> None:
+    lines = ["_TABLES = {"]
+    for name in NAMES:
+        text = _from_matplotlib(name).tobytes().hex()
+        lines.append(f"    {name!r}: (")
+        lines.extend(f'        "{text[i : i + 96]}"' for i in range(0, len(text), 96))
+        lines.append("    ),")
+    lines.append("}")
+    path = os.path.abspath(__file__)
+    with open(path, encoding="utf-8") as stream:
+        source = stream.read()
+    source = re.sub(r"(?ms)^_TABLES = \{.*?^\}$", lambda _: "\n".join(lines), source)
+    with open(path, "w", encoding="utf-8") as stream:
+        stream.write(source)
+
+
+# Generated by main(), RGB bytes in hexadecimal
+_TABLES = {
+    'jet': (
+        "00007f00008400008800008d00009100009600009a00009f0000a30000a80000ac0000b10000b60000ba0000bf0000c3"
+        "0000c80000cc0000d10000d50000da0000de0000e30000e80000ec0000f10000f50000fa0000fe0000ff0000ff0000ff"
+        "0000ff0004ff0008ff000cff0010ff0014ff0018ff001cff0020ff0024ff0028ff002cff0030ff0034ff0038ff003cff"
+        "0040ff0044ff0048ff004cff0050ff0054ff0058ff005cff0060ff0064ff0068ff006cff0070ff0074ff0078ff007cff"
+        "0080ff0084ff0088ff008cff0090ff0094ff0098ff009cff00a0ff00a4ff00a8ff00acff00b0ff00b4ff00b8ff00bcff"
+        "00c0ff00c4ff00c8ff00ccff00d0ff00d4ff00d8ff00dcfe00e0fa00e4f702e8f405ecf108f0ed0cf4ea0ff8e712fce4"
+        "15ffe118ffdd1cffda1fffd722ffd425ffd029ffcd2cffca2fffc732ffc336ffc039ffbd3cffba3fffb742ffb346ffb0"
+        "49ffad4cffaa4fffa653ffa356ffa059ff9d5cff9a5fff9663ff9366ff9069ff8d6cff8970ff8673ff8376ff8079ff7d"
+        "7cff7980ff7683ff7386ff7089ff6c8dff6990ff6693ff6396ff5f9aff5c9dff59a0ff56a3ff53a6ff4faaff4cadff49"
+        "b0ff46b3ff42b7ff3fbaff3cbdff39c0ff36c3ff32c7ff2fcaff2ccdff29d0ff25d4ff22d7ff1fdaff1cddff18e0ff15"
+        "e4ff12e7ff0feaff0cedff08f1fc05f4f802f7f400faf000feed00ffe900ffe500ffe200ffde00ffda00ffd700ffd300"
+        "ffcf00ffcb00ffc800ffc400ffc000ffbd00ffb900ffb500ffb100ffae00ffaa00ffa600ffa300ff9f00ff9b00ff9800"
+        "ff9400ff9000ff8c00ff8900ff8500ff8100ff7e00ff7a00ff7600ff7300ff6f00ff6b00ff6700ff6400ff6000ff5c00"
+        "ff5900ff5500ff5100ff4d00ff4a00ff4600ff4200ff3f00ff3b00ff3700ff3400ff3000ff2c00ff2800ff2500ff2100"
+        "ff1d00ff1a00ff1600fe1200fa0f00f50b00f10700ec0300e80000e30000de0000da0000d50000d10000cc0000c80000"
+        "c30000bf0000ba0000b60000b10000ac0000a80000a300009f00009a00009600009100008d00008800008400007f0000"
+    ),
+    'bwr': (
+        "0000ff0202ff0404ff0606ff0808ff0a0aff0c0cff0e0eff1010ff1212ff1414ff1616ff1818ff1a1aff1c1cff1e1eff"
+        "2020ff2222ff2424ff2626ff2828ff2a2aff2c2cff2e2eff3030ff3232ff3434ff3636ff3838ff3a3aff3c3cff3e3eff"
+        "4040ff4141ff4444ff4646ff4848ff4949ff4c4cff4e4eff5050ff5151ff5454ff5656ff5858ff5959ff5c5cff5e5eff"
+        "6060ff6161ff6464ff6666ff6868ff6969ff6c6cff6e6eff7070ff7171ff7474ff7676ff7878ff7979ff7c7cff7e7eff"
+        "8080ff8282ff8383ff8686ff8888ff8a8aff8c8cff8e8eff9090ff9292ff9393ff9696ff9898ff9a9aff9c9cff9e9eff"
+        "a0a0ffa2a2ffa3a3ffa6a6ffa8a8ffaaaaffacacffaeaeffb0b0ffb2b2ffb3b3ffb6b6ffb8b8ffbabaffbcbcffbebeff"
+        "c0c0ffc2c2ffc3c3ffc6c6ffc8c8ffcacaffccccffceceffd0d0ffd2d2ffd3d3ffd6d6ffd8d8ffdadaffdcdcffdedeff"
+        "e0e0ffe2e2ffe3e3ffe6e6ffe8e8ffeaeaffececffeeeefff0f0fff2f2fff3f3fff6f6fff8f8fffafafffcfcfffefeff"
+        "fffefefffcfcfffafafff8f8fff6f6fff4f4fff2f2fff0f0ffeeeeffececffeaeaffe8e8ffe6e6ffe4e4ffe2e2ffe0e0"
+        "ffdedeffdcdcffdadaffd8d8ffd6d6ffd3d3ffd2d2ffd0d0ffceceffccccffcacaffc8c8ffc6c6ffc3c3ffc2c2ffc0c0"
+        "ffbebeffbcbcffbabaffb8b8ffb6b6ffb3b3ffb2b2ffb0b0ffaeaeffacacffaaaaffa8a8ffa6a6ffa3a3ffa2a2ffa0a0"
+        "ff9e9eff9c9cff9a9aff9898ff9696ff9393ff9292ff9090ff8e8eff8c8cff8a8aff8888ff8686ff8383ff8282ff8080"
+        "ff7e7eff7c7cff7979ff7878ff7676ff7474ff7171ff7070ff6e6eff6c6cff6969ff6868ff6666ff6464ff6161ff6060"
+        "ff5e5eff5c5cff5959ff5858ff5656ff5454ff5151ff5050ff4e4eff4c4cff4949ff4848ff4646ff4444ff4141ff4040"
+        "ff3e3eff3c3cff3939ff3838ff3636ff3434ff3131ff3030ff2e2eff2c2cff2929ff2828ff2626ff2424ff2121ff2020"
+        "ff1e1eff1c1cff1919ff1818ff1616ff1414ff1111ff1010ff0e0eff0c0cff0909ff0808ff0606ff0404ff0101ff0000"
+    ),
+    'seismic': (
+        "00004c00004f00005200005400005700005a00005d00006000006200006500006800006b00006e000070000073000076"
+        "00007900007c00007e00008100008400008700008a00008c00008f00009200009500009800009a00009d0000a00000a3"
+        "0000a60000a80000ab0000ae0000b10000b40000b60000b90000bc0000bf0000c20000c40000c70000ca0000cd0000d0"
+        "0000d20000d50000d80000db0000de0000e00000e30000e60000e90000ec0000ee0000f10000f40000f70000fa0000fc"
+        "0101ff0505ff0808ff0d0dff1111ff1515ff1919ff1d1dff2121ff2525ff2828ff2d2dff3131ff3535ff3939ff3d3dff"
+        "4141ff4545ff4848ff4d4dff5151ff5555ff5959ff5d5dff6161ff6565ff6868ff6d6dff7171ff7575ff7979ff7d7dff"
+        "8181ff8585ff8888ff8d8dff9191ff9595ff9999ff9d9dffa1a1ffa5a5ffa8a8ffadadffb1b1ffb5b5ffb9b9ffbdbdff"
+        "c1c1ffc5c5ffc8c8ffcdcdffd1d1ffd5d5ffd9d9ffddddffe1e1ffe5e5ffe8e8ffededfff1f1fff5f5fff9f9fffdfdff"
+        "fffdfdfff9f9fff5f5fff1f1ffededffe9e9ffe5e5ffe1e1ffddddffd9d9ffd5d5ffd1d1ffcdcdffc9c9ffc5c5ffc1c1"
+        "ffbdbdffb9b9ffb4b4ffb1b1ffadadffa9a9ffa4a4ffa1a1ff9d9dff9999ff9494ff9191ff8d8dff8989ff8484ff8181"
+        "ff7d7dff7979ff7575ff7171ff6d6dff6969ff6565ff6161ff5d5dff5959ff5555ff5151ff4d4dff4949ff4545ff4141"
+        "ff3d3dff3838ff3535ff3030ff2d2dff2828ff2525ff2020ff1d1dff1818ff1515ff1010ff0d0dff0808ff0505ff0000"
+        "fd0000fb0000f90000f70000f50000f30000f10000ef0000ed0000eb0000e90000e70000e50000e30000e10000df0000"
+        "dd0000db0000d90000d70000d50000d30000d10000cf0000cd0000cb0000c90000c70000c50000c30000c10000bf0000"
+        "bd0000bb0000b90000b70000b50000b30000b10000af0000ad0000ab0000a90000a70000a50000a30000a100009f0000"
+        "9d00009b00009900009700009500009300009100008f00008d00008b00008900008700008500008300008100007f0000"
+    ),
+    'coolwarm': (
+        "3a4cc03b4dc13c4fc33e51c43f53c64054c74156c94258ca435acc455bcd465dcf475fd04860d14962d34b64d44c66d6"
+        "4d67d74e69d8506bda516cdb526edc5370dd5571de5673e05775e15876e25a78e35b79e45c7be55d7de65f7ee76080e8"
+        "6182ea6383ea6485eb6586ec6788ed6889ee698bef6b8df06c8ef16d90f16f91f27093f37194f47395f47497f57598f6"
+        "779af6789bf77a9df87b9ef87ca0f97ea1f97fa2fa80a4fa82a5fb83a6fb85a8fb86a9fc87aafc89acfc8aadfd8baefd"
+        "8daffd8eb1fd90b2fe91b3fe92b4fe94b5fe95b7fe97b8fe98b9fe99bafe9bbbfe9cbcfe9dbdfe9fbefea0bffea2c0fe"
+        "a3c1fea4c2fea6c3fda7c4fda8c5fdaac6fdabc7fcacc8fcaec9fcafcafbb0cbfbb2cbfbb3ccfab4cdfab6cef9b7cff9"
+        "b8cff8b9d0f8bbd1f7bcd1f6bdd2f6bed3f5c0d3f5c1d4f4c2d4f3c3d5f2c5d5f2c6d6f1c7d6f0c8d7efc9d7eecad8ee"
+        "ccd8edcdd9ecced9ebcfd9ead0dae9d1dae8d2dae7d3dbe6d5dbe5d6dbe4d7dbe2d8dbe1d9dce0dadcdfdbdcdedcdcdd"
+        "dddcdbdedbdadfdbd9e0dad7e1dad6e2d9d4e3d9d3e4d8d1e5d8d0e6d7cfe7d6cde7d6cce8d5cae9d4c9ead3c7ebd3c6"
+        "ecd2c4ecd1c3edd0c1edcfc0eecfbeefcebcefcdbbf0ccb9f1cbb8f1cab6f2c9b5f2c8b3f2c7b2f3c6b0f3c5aff4c4ad"
+        "f4c3abf4c2aaf5c1a8f5c0a7f5bfa5f6bda4f6bca2f6bba0f6ba9ff6b99df6b79cf6b69af7b598f7b397f7b295f7b194"
+        "f7b092f7ae91f7ad8ff6ab8df6aa8cf6a98af6a789f6a687f6a486f6a384f5a182f5a081f59e7ff49d7ef49b7cf49a7b"
+        "f39879f39678f39576f29375f29173f19072f18e70f08d6ff08b6def896cee876aee8669ed8467ec8266ec8064eb7f63"
+        "ea7d61ea7b60e9795ee8775de7755ce6745ae67259e57057e46e56e36c54e26a53e16852e06650df644fde624edd604c"
+        "dc5e4bdb5c4ada5a48d95847d85646d75444d65243d44f42d34d40d24b3fd1493ecf463dce443ccd423acc3f39ca3d38"
+        "c93b37c83835c63534c53233c43032c22d31c12a30bf282ebe232dbc1f2cbb1a2bb9162ab81129b60d28b50827b30326"
+    ),
+    'PiYG_r': (
+        "2764192865192967192b69192c6b1a2e6d1a2f6e1a31701b32721b34741b35761c37771c38791c3a7b1d3b7d1d3d7f1d"
+        "3e801e40821e41841e43861e44881f46891f478b1f498d204a8f204c91204d92214f9422519624539725559926579b27"
+        "599c295b9e2a5da02b5fa12c61a32e63a42f65a63067a83169a9336bab346dad356fae3671b03873b23975b33a77b53b"
+        "79b73d7bb83e7dba3f7fbc4181bd4383be4685c04987c14b8ac34e8cc4518ec65390c75693c95995ca5c97cb5e99cd61"
+        "9cce649ed066a0d169a2d36ca5d46fa7d671a9d774abd977adda79b0db7cb2dd7fb4de81b6e084b8e187bae28abce28d"
+        "bee390c0e493c1e595c3e698c5e69bc7e79ec9e8a1cae9a4cceaa7ceeaaad0ebadd2ecb0d3edb2d5edb5d7eeb8d9efbb"
+        "dbf0bedcf1c1def1c4e0f2c7e2f3cae4f4cde6f5d0e6f5d1e7f5d3e8f5d4e8f5d6e9f5d7eaf5d9eaf5daebf5dcecf5dd"
+        "ecf5dfedf5e0eef5e2eef6e3eff6e5f0f6e6f0f6e8f1f6eaf2f6ebf2f6edf3f6eef4f6f0f4f6f1f5f6f3f6f6f4f6f6f6"
+        "f7f6f6f7f5f6f7f4f6f7f3f5f8f2f5f8f2f5f8f1f4f8f0f4f9eff4f9eef4f9edf3f9ecf3f9ebf3faeaf2fae9f2fae9f2"
+        "fae8f1fbe7f1fbe6f1fbe5f0fbe4f0fce3f0fce2effce1effce0effde0effcdeeefcdcedfbdbecfbd9ebfad7eafad6ea"
+        "f9d4e9f9d2e8f8d1e7f8cfe6f7cde5f7cce5f6cae4f6c8e3f5c7e2f5c5e1f5c4e1f4c2e0f4c0dff3bfdef3bdddf2bbdc"
+        "f2badcf1b8dbf1b6daf0b4d9efb2d7efafd5eeadd3edaad2eca8d0eca5ceeba3cdeaa1cbe99ec9e99cc7e899c6e797c4"
+        "e694c2e692c0e58fbfe48dbde38abbe388bae285b8e183b6e080b4e07eb3df7bb1de79afde77aedd73acdc6faadb6ca8"
+        "da68a6d964a4d861a2d75da0d65a9ed5569cd4529ad34f98d24b96d14895d04493cf4091ce3d8fcd398dcc368bcb3289"
+        "ca2e87c92b85c82783c72481c6207fc51c7dc31a7cc1197abf1878bd1777bb1675b91573b61472b41370b2126eb0116c"
+        "ae106bac0f69aa0e67a70d66a50c64a30b62a10a619f095f9d085d9a075c98065a9605589404579203559002538e0152"
+    ),
+    'tab10': (
+        "1f77b41f77b41f77b41f77b41f77b41f77b41f77b41f77b41f77b41f77b41f77b41f77b41f77b41f77b41f77b41f77b4"
+        "1f77b41f77b41f77b41f77b41f77b41f77b41f77b41f77b41f77b41f77b4ff7f0eff7f0eff7f0eff7f0eff7f0eff7f0e"
+        "ff7f0eff7f0eff7f0eff7f0eff7f0eff7f0eff7f0eff7f0eff7f0eff7f0eff7f0eff7f0eff7f0eff7f0eff7f0eff7f0e"
+        "ff7f0eff7f0eff7f0e2ca02c2ca02c2ca02c2ca02c2ca02c2ca02c2ca02c2ca02c2ca02c2ca02c2ca02c2ca02c2ca02c"
+        "2ca02c2ca02c2ca02c2ca02c2ca02c2ca02c2ca02c2ca02c2ca02c2ca02c2ca02c2ca02c2ca02cd62728d62728d62728"
+        "d62728d62728d62728d62728d62728d62728d62728d62728d62728d62728d62728d62728d62728d62728d62728d62728"
+        "d62728d62728d62728d62728d62728d627289467bd9467bd9467bd9467bd9467bd9467bd9467bd9467bd9467bd9467bd"
+        "9467bd9467bd9467bd9467bd9467bd9467bd9467bd9467bd9467bd9467bd9467bd9467bd9467bd9467bd9467bd9467bd"
+        "8c564b8c564b8c564b8c564b8c564b8c564b8c564b8c564b8c564b8c564b8c564b8c564b8c564b8c564b8c564b8c564b"
+        "8c564b8c564b8c564b8c564b8c564b8c564b8c564b8c564b8c564be377c2e377c2e377c2e377c2e377c2e377c2e377c2"
+        "e377c2e377c2e377c2e377c2e377c2e377c2e377c2e377c2e377c2e377c2e377c2e377c2e377c2e377c2e377c2e377c2"
+        "e377c2e377c2e377c27f7f7f7f7f7f7f7f7f7f7f7f7f7f7f7f7f7f7f7f7f7f7f7f7f7f7f7f7f7f7f7f7f7f7f7f7f7f7f"
+        "7f7f7f7f7f7f7f7f7f7f7f7f7f7f7f7f7f7f7f7f7f7f7f7f7f7f7f7f7f7f7f7f7f7f7f7fbcbd22bcbd22bcbd22bcbd22"
+        "bcbd22bcbd22bcbd22bcbd22bcbd22bcbd22bcbd22bcbd22bcbd22bcbd22bcbd22bcbd22bcbd22bcbd22bcbd22bcbd22"
+        "bcbd22bcbd22bcbd22bcbd22bcbd22bcbd2217becf17becf17becf17becf17becf17becf17becf17becf17becf17becf"
+        "17becf17becf17becf17becf17becf17becf17becf17becf17becf17becf17becf17becf17becf17becf17becf17becf"
+    ),
+    'tab20': (
+        "1f77b41f77b41f77b41f77b41f77b41f77b41f77b41f77b41f77b41f77b41f77b41f77b41f77b4aec7e8aec7e8aec7e8"
+        "aec7e8aec7e8aec7e8aec7e8aec7e8aec7e8aec7e8aec7e8aec7e8aec7e8ff7f0eff7f0eff7f0eff7f0eff7f0eff7f0e"
+        "ff7f0eff7f0eff7f0eff7f0eff7f0eff7f0eff7f0effbb78ffbb78ffbb78ffbb78ffbb78ffbb78ffbb78ffbb78ffbb78"
+        "ffbb78ffbb78ffbb782ca02c2ca02c2ca02c2ca02c2ca02c2ca02c2ca02c2ca02c2ca02c2ca02c2ca02c2ca02c2ca02c"
+        "98df8a98df8a98df8a98df8a98df8a98df8a98df8a98df8a98df8a98df8a98df8a98df8a98df8ad62728d62728d62728"
+        "d62728d62728d62728d62728d62728d62728d62728d62728d62728d62728ff9896ff9896ff9896ff9896ff9896ff9896"
+        "ff9896ff9896ff9896ff9896ff9896ff98969467bd9467bd9467bd9467bd9467bd9467bd9467bd9467bd9467bd9467bd"
+        "9467bd9467bd9467bdc5b0d5c5b0d5c5b0d5c5b0d5c5b0d5c5b0d5c5b0d5c5b0d5c5b0d5c5b0d5c5b0d5c5b0d5c5b0d5"
+        "8c564b8c564b8c564b8c564b8c564b8c564b8c564b8c564b8c564b8c564b8c564b8c564b8c564bc49c94c49c94c49c94"
+        "c49c94c49c94c49c94c49c94c49c94c49c94c49c94c49c94c49c94e377c2e377c2e377c2e377c2e377c2e377c2e377c2"
+        "e377c2e377c2e377c2e377c2e377c2e377c2f7b6d2f7b6d2f7b6d2f7b6d2f7b6d2f7b6d2f7b6d2f7b6d2f7b6d2f7b6d2"
+        "f7b6d2f7b6d2f7b6d27f7f7f7f7f7f7f7f7f7f7f7f7f7f7f7f7f7f7f7f7f7f7f7f7f7f7f7f7f7f7f7f7f7f7f7f7f7f7f"
+        "c7c7c7c7c7c7c7c7c7c7c7c7c7c7c7c7c7c7c7c7c7c7c7c7c7c7c7c7c7c7c7c7c7c7c7c7bcbd22bcbd22bcbd22bcbd22"
+        "bcbd22bcbd22bcbd22bcbd22bcbd22bcbd22bcbd22bcbd22bcbd22dbdb8ddbdb8ddbdb8ddbdb8ddbdb8ddbdb8ddbdb8d"
+        "dbdb8ddbdb8ddbdb8ddbdb8ddbdb8ddbdb8d17becf17becf17becf17becf17becf17becf17becf17becf17becf17becf"
+        "17becf17becf17becf9edae59edae59edae59edae59edae59edae59edae59edae59edae59edae59edae59edae59edae5"
+    ),
+    'gnuplot2': (
+        "00000000000400000800000c00001000001400001800001c00002000002400002800002c00003000003400003800003c"
+        "00004000004400004800004c00005000005400005800005c00006000006400006800006c00007000007400007800007c"
+        "00008000008300008800008c00009000009300009800009c0000a00000a30000a80000ac0000b00000b30000b80000bc"
+        "0000c00000c30000c80000cc0000d00000d30000d80000dc0000e00000e30000e80000ec0000f00000f30000f80000fc"
+        "0000ff0300ff0700ff0a00ff0d00ff1000ff1300ff1600ff1900ff1c00ff2000ff2300ff2600ff2900ff2c00ff2f00ff"
+        "3200ff3500ff3900ff3c00ff3f00ff4200ff4500ff4800ff4b00ff4e00ff5200ff5500ff5800ff5b00ff5e00ff6100ff"
+        "6400ff6700ff6b00ff6e00ff7100ff7400ff7700ff7a00ff7d00ff8000ff8400ff8700ff8a01fd8d03fb9005f99307f7"
+        "9609f5990bf39d0df1a00fefa311eda613eba915e9ac17e7af19e5b21be3b61de1b91fdfbc21ddbf23dbc225d9c527d7"
+        "c829d5cb2bd3cf2dd1d22fcfd531cdd833cbdb35c9de37c7e139c5e43bc3e83dc1eb3fbfee41bdf143bbf445b9f747b7"
+        "fa49b5fd4bb3ff4db1ff4fafff51adff53abff55a9ff57a7ff59a5ff5ba3ff5da1ff5f9fff619dff639bff6599ff6797"
+        "ff6995ff6b93ff6d91ff6f8fff718dff738bff7589ff7787ff7985ff7b83ff7d81ff7f7fff817dff837bff8579ff8777"
+        "ff8975ff8b73ff8d71ff8f6fff916dff936bff9569ff9767ff9965ff9b63ff9d61ff9f5fffa15dffa35bffa559ffa757"
+        "ffa955ffab53ffad51ffaf4fffb14dffb34bffb549ffb747ffb945ffbb43ffbd41ffbf3fffc13dffc33bffc539ffc737"
+        "ffc935ffcb33ffcd31ffcf2fffd12dffd32bffd529ffd727ffd925ffdb23ffdd21ffdf1fffe11dffe31bffe519ffe717"
+        "ffe915ffeb13ffed11ffef0ffff10dfff30bfff509fff707fff905fffb03fffd01ffff04ffff11ffff1dffff2affff36"
+        "ffff43ffff4fffff5cffff68ffff75ffff82ffff8effff9affffa7ffffb3ffffc0ffffccffffd9ffffe6fffff2ffffff"
+    ),
+    'brg': (
+        "0000ff0200fd0400fb0600f90800f70a00f50c00f30e00f11000ef1200ed1400eb1600e91800e71a00e51c00e31e00e1"
+        "2000df2200dd2400db2600d92800d72a00d52c00d32e00d13000cf3200cd3400cb3600c93800c73a00c53c00c33e00c1"
+        "4000bf4100bd4400bb4600b94800b74900b54c00b34e00b15000af5100ad5400ab5600a95800a75900a55c00a35e00a1"
+        "60009f61009d64009b6600996800976900956c00936e009170008f71008d74008b7600897800877900857c00837e0081"
+        "80007f82007d83007b8600798800778a00758c00728e007190006f92006d93006b9600699800679a00659c00629e0061"
+        "a0005fa2005da3005ba60059a80057aa0055ac0052ae0051b0004fb2004db3004bb60049b80047ba0045bc0042be0041"
+        "c0003fc2003dc3003bc60038c80037ca0035cc0032ce0030d0002fd2002dd3002bd60028d80027da0025dc0022de0020"
+        "e0001fe2001de3001be60018e80017ea0015ec0012ee0010f0000ff2000df3000bf60008f80007fa0005fc0002fe0000"
+        "fe0100fc0300fa0500f80700f60800f40b00f20d00f00f00ee1100ec1300ea1500e81700e61900e41b00e21d00e01f00"
+        "de2100dc2300da2500d82700d62800d32b00d22d00d02f00ce3100cc3300ca3500c83700c63900c33b00c23d00c03f00"
+        "be4100bc4300ba4500b84700b64800b34b00b24d00b04f00ae5100ac5300aa5500a85700a65900a35b00a25d00a05f00"
+        "9e61009c63009a6500986700966800936b00926d00906f008e71008c73008a7500887700867900837b00827d00807f00"
+        "7e81007c8300798500788700768800748b00718d00708f006e91006c9300699500689700669900649b00619d00609f00"
+        "5ea1005ca30059a50058a70056a80054ab0051ad0050af004eb1004cb30049b50048b70046b90044bb0041bd0040bf00"
+        "3ec1003cc30039c50038c70036c80034cb0031cd0030cf002ed1002cd30029d50028d70026d90024db0021dd0020df00"
+        "1ee1001ce30019e50018e70016e80014eb0011ed0010ef000ef1000cf30009f50008f70006f90004fb0001fd0000ff00"
+    ),
+}
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+"""
+Per-pixel maps (emissivity, reflected temperature) built from mask files.
+
+A mask holds one label per pixel in frame order: 24 rows of 32 values, row
+``h`` column ``w`` being ``frame[h * 32 + w]``. It can be:
+
+* a text file (``.txt``, or ``.csv`` with commas), 24 lines of 32 numbers,
+  easy to edit by hand;
+* a ``.npy`` file;
+* a 32x24 image (PNG...), labels being the gray levels 0 to 255, e.g.
+  painted over a saved thermal image of the scene.
+
+:func:`pixel_map` turns the labels into values, e.g. emissivities by
+material, to assign to ``MLX90640.emissivity``::
+
+    mask = load_mask("materials.png")
+    mlx.emissivity = pixel_map(mask, {255: 0.3}, default=0.95)
+"""
+
+import os
+
+import numpy as np
+
+try:
+    from typing import Dict, List, Optional
+except ImportError:
+    pass
+
+
+def load_mask(path: str) -> np.ndarray:
+    """Read a 24x32 mask of labels from a text, ``.npy`` or image file."""
+    extension = os.path.splitext(path)[1].lower()
+    if extension == ".npy":
+        mask = np.load(path)
+    elif extension in (".txt", ".csv"):
+        mask = np.loadtxt(path, delimiter="," if extension == ".csv" else None)
+    else:
+        from matplotlib import image
+
+        mask = image.imread(path)
+        if mask.ndim == 3:
+            mask = mask[..., :3].mean(axis=2)
+        if mask.dtype.kind == "f":  # PNG are read as floats in [0, 1]
+            mask = mask * 255
+        mask = np.rint(mask).astype(int)
+    if mask.shape != (24, 32):
+        raise ValueError(f"{path}: expected 24 rows of 32 values, got {mask.shape}")
+    return mask
+
+
+def pixel_map(
+    mask: np.ndarray, values: Optional[Dict[float, float]] = None, default: Optional[float] = None
+) -> List[float]:
+    """The 768 values of a mask, in frame order. With ``values``, labels are
+    looked up in it, falling back to ``default``; without, the mask holds the
+    values themselves."""
+    labels = np.asarray(mask).ravel().tolist()
+    if values is None:
+        return [float(label) for label in labels]
+    result = []
+    for label in labels:
+        value = values.get(label, default)
+        if value is None:
+            raise ValueError(f"No value for mask label {label}")
+        result.append(float(value))
+    return result
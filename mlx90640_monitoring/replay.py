@@ -0,0 +1,267 @@
+"""
+Deterministic replay of recorded frames through the analysis and alarm code.
+
+Recorded frames are fed to the code of the live programs (see
+:mod:`analysis`) with a simulated monotonic clock taken from the
+recording, as fast as the CPU allows:
+
+* the change detection, hot spot analysis and :class:`AlarmTracker` of
+  ``monitoring.py``, including the reuse of the last analysis for frames
+  that did not change;
+* the change detection and :class:`DisplayFilter` of ``image_VFINAL.py``,
+  which only updates the image of frames that changed, with its own
+  detector settings, or while its colour scale is converging.
+
+Recordings are alarm snapshots (``.npz`` files of :mod:`snapshot`, timed by
+their offsets) or frame cubes (``.npy`` files of N x 768 or N x 24 x 32
+temperatures, e.g. from :mod:`batch`, timed by ``--fps``).
+
+Parameters are swept with ``--set name=value,value...``: every combination
+is replayed, spread over ``--workers`` processes. For each one the runner
+reports the alarm timeline and the detection latency: an incident starts
+with the first frame whose hottest pixel reaches ``--onset`` degrees (the
+alarm threshold by default, required when the threshold is swept), and
+its latency is the time until the alarm is confirmed. Alarms in recordings
+without an incident are false alarms, incidents without an alarm are
+missed. The display latency is the time from the onset until the colour
+scale maximum comes within ``--display-tolerance`` degrees of the hottest
+blurred pixel. The results do not depend on the machine or the number of
+workers::
+
+    mlx-replay snapshots/*.npz --onset 20 --set threshold=18,20,22 --set required_duration=10,30 --workers 4 --output sweep.jsonl
+"""
+
+import argparse
+import collections
+import itertools
+import json
+import os
+import statistics
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from .analysis import ALARM, AlarmTracker, DisplayFilter, get_max_temp_filtered
+from .changes import ChangeDetector
+
+try:
+    from typing import Dict, List, Optional, Sequence
+except ImportError:
+    pass
+
+# Parameters of a replay and their defaults, the CONFIGURATION values of
+# monitoring.py and image_VFINAL.py
+PARAMETERS = collections.OrderedDict([
+    ("threshold", 20.0),  # ALARM_THRESHOLD
+    ("required_duration", 30.0),  # REQUIRED_DURATION
+    ("grace_period", 5.0),  # GRACE_PERIOD
+    ("min_hot_pixels", 1),  # MIN_HOT_PIXELS
+    ("change_pixel_threshold", 1.0),  # CHANGE_PIXEL_THRESHOLD
+    ("change_block_threshold", 0.25),  # CHANGE_BLOCK_THRESHOLD
+    ("heartbeat", 60.0),  # HEARTBEAT_INTERVAL
+    ("alpha", 0.5),  # ALPHA
+    ("range_smoothing", 0.1),  # RANGE_SMOOTHING
+    ("display_pixel_threshold", 1.0),  # CHANGE_PIXEL_THRESHOLD of image_VFINAL.py
+    ("display_block_threshold", 0.25),  # CHANGE_BLOCK_THRESHOLD of image_VFINAL.py
+    ("display_heartbeat", 10.0),  # HEARTBEAT_INTERVAL of image_VFINAL.py
+    ("display_settle", 4.0),  # SETTLE_TIME of image_VFINAL.py
+    ("display_range_tolerance", 0.5),  # RANGE_TOLERANCE of image_VFINAL.py
+])
+
+Recording = collections.namedtuple("Recording", "name times frames")
+Alarm = collections.namedtuple("Alarm", "recording time max_temp hot_pixels")
+Result = collections.namedtuple(
+    "Result",
+    "parameters alarms latencies missed false_alarms display_latencies frames analysed",
+)
+
+_recordings: List[Recording] = []
+
+
+def load_recording(path: str, fps: float = 2.0) -> Recording:
+    """Frames (N x 768, float32) and their times (seconds from the first
+    frame) of a snapshot ``.npz`` or a ``.npy`` cube recorded at ``fps``."""
+    if path.endswith(".npz"):
+        with np.load(path) as snapshot:
+            frames = snapshot["frames"]
+            times = snapshot["offsets"].astype(np.float64)
+    else:
+        frames = np.load(path)
+        times = np.arange(len(frames)) / fps
+    frames = np.asarray(frames, dtype=np.float32).reshape(len(frames), -1)
+    if frames.shape[1] != 768:
+        raise ValueError(f"{path}: expected frames of 768 pixels, got {frames.shape[1]}")
+    return Recording(os.path.basename(path), times - times[0] if len(times) else times, frames)
+
+
+def onset(recording: Recording, temperature: float) -> Optional[float]:
+    """Time of the first frame whose hottest pixel reaches ``temperature``."""
+    hot = np.nonzero(recording.frames.max(axis=1) >= temperature)[0]
+    return float(recording.times[hot[0]]) if len(hot) else None
+
+
+def replay(
+    recording: Recording,
+    parameters: Dict[str, float],
+    onset_temperature: float,
+    display_tolerance: float = 1.0,
+):
+    """Run one recording through the pipelines. Returns the alarms, the
+    detection and display latencies (None when not reached), and the
+    number of frames analysed."""
+    p = parameters
+    detector = ChangeDetector(p["change_pixel_threshold"], p["change_block_threshold"],
+                              levels=(p["threshold"], p["threshold"] - 5), heartbeat=p["heartbeat"])
+    tracker = AlarmTracker(p["threshold"], p["required_duration"], p["grace_period"], int(p["min_hot_pixels"]))
+    display_detector = ChangeDetector(p["display_pixel_threshold"], p["display_block_threshold"],
+                                      heartbeat=p["display_heartbeat"], settle=p["display_settle"])
+    display = DisplayFilter(p["alpha"], p["range_smoothing"])
+    start = onset(recording, onset_temperature)
+
+    alarms = []
+    latency = display_latency = None
+    analysed = 0
+    last = None
+    for now, frame in zip(recording.times.tolist(), recording.frames):
+        dt = 0.0 if last is None else now - last
+        last = now
+        # monitoring.py: frames equal to the last analysed one reuse its analysis
+        if detector.update(frame, now):
+            max_temp, hot_pixels, _ = get_max_temp_filtered(frame.tolist(), threshold=p["threshold"])
+            analysed += 1
+        if tracker.update(now, dt, max_temp, hot_pixels) == ALARM:
+            alarms.append(Alarm(recording.name, now, round(float(max_temp), 2), hot_pixels))
+            if start is not None and latency is None and now >= start:
+                latency = now - start
+
+        # image_VFINAL.py: the image is only updated when the scene changed or
+        # its colour scale has not reached its target yet; the scale is
+        # compared with the hottest blurred pixel
+        changed = display_detector.update(frame, now)
+        if changed or not display.converged(p["display_range_tolerance"]):
+            display.update(frame)
+        if start is not None and display_latency is None and now >= start:
+            target = display.blur(frame.reshape(display.filtered.shape)).max()
+            if display.maximum >= target - display_tolerance:
+                display_latency = now - start
+    return alarms, latency, display_latency, analysed
+
+
+def _load(paths: Sequence[str], fps: float) -> None:
+    # Each worker reads the recordings once, instead of receiving them with
+    # every parameter set
+    _recordings[:] = [load_recording(path, fps) for path in paths]
+
+
+def run(parameters: Dict[str, float], onset_temperature: float, display_tolerance: float) -> Result:
+    """Replay every loaded recording with one parameter set."""
+    alarms, latencies, display_latencies = [], [], []
+    missed = false_alarms = frames = analysed = 0
+    for recording in _recordings:
+        found, latency, display_latency, count = replay(
+            recording, parameters, onset_temperature, display_tolerance
+        )
+        alarms.extend(found)
+        frames += len(recording.frames)
+        analysed += count
+        if onset(recording, onset_temperature) is None:
+            false_alarms += len(found)
+            continue
+        if latency is None:
+            missed += 1
+        else:
+            latencies.append(latency)
+        if display_latency is not None:
+            display_latencies.append(display_latency)
+    return Result(parameters, alarms, latencies, missed, false_alarms, display_latencies, frames, analysed)
+
+
+def sweep(settings: Sequence[str]) -> List[Dict[str, float]]:
+    """Parameter sets of every combination of ``name=value,value...``."""
+    values = collections.OrderedDict((name, [default]) for name, default in PARAMETERS.items())
+    for setting in settings:
+        name, _, text = setting.partition("=")
+        if name not in PARAMETERS:
+            raise ValueError(f"Unknown parameter {name!r}, expected one of {', '.join(PARAMETERS)}")
+        kind = type(PARAMETERS[name])
+        values[name] = [kind(value) for value in text.split(",")]
+    return [dict(zip(values, combination)) for combination in itertools.product(*values.values())]
+
+
+def summary(latencies: List[float]) -> Dict[str, Optional[float]]:
+    if not latencies:
+        return {"median": None, "mean": None, "max": None}
+    return {
+        "median": round(statistics.median(latencies), 3),
+        "mean": round(statistics.mean(latencies), 3),
+        "max": round(max(latencies), 3),
+    }
+
+
+def _format(value: Optional[float]) -> str:
+    return "-" if value is None else f"{value:.1f}"
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("recordings", nargs="+", help="snapshot .npz or frame .npy files")
+    parser.add_argument("--set", action="append", default=[], metavar="NAME=V1,V2",
+                        help=f"values of a parameter, among {', '.join(PARAMETERS)}")
+    parser.add_argument("--fps", type=float, default=2.0, help="frame rate of the .npy recordings")
+    parser.add_argument("--onset", type=float, default=None,
+                        help="hottest pixel temperature that starts an incident (default: the threshold)")
+    parser.add_argument("--display-tolerance", type=float, default=1.0, help="in degrees")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--output", help="JSON lines file of the results and alarm timelines")
+    args = parser.parse_args()
+
+    sets = sweep(args.set)
+    swept = [name for name in PARAMETERS if len({s[name] for s in sets}) > 1]
+    if args.onset is None:
+        # Incidents must be the same for every parameter set to compare them
+        if "threshold" in swept:
+            parser.error("--onset is required when the threshold is swept")
+        args.onset = sets[0]["threshold"]
+    started = time.perf_counter()
+    executor = ProcessPoolExecutor(args.workers, initializer=_load, initargs=(args.recordings, args.fps))
+    try:
+        futures = [executor.submit(run, s, args.onset, args.display_tolerance) for s in sets]
+        results = [future.result() for future in futures]
+    finally:
+        executor.shutdown()
+    elapsed = time.perf_counter() - started
+
+    incidents = results[0].missed + len(results[0].latencies)
+    print(f"{incidents} incidents (hottest pixel reaching {args.onset} C) in {len(args.recordings)} recordings")
+    header = "".join(f"{name:>24}" for name in swept)
+    print(f"{header} alarms detected   false  latency median/max  display median")
+    for r in results:
+        latency = summary(r.latencies)
+        display = summary(r.display_latencies)
+        print("".join(f"{r.parameters[name]:>24}" for name in swept)
+              + f" {len(r.alarms):>6} {len(r.latencies):>4}/{incidents:<4} {r.false_alarms:>5}"
+              + f"  {_format(latency['median']):>9}/{_format(latency['max']):<8}"
+              + f"  {_format(display['median']):>14}")
+    frames = sum(r.frames for r in results)
+    print(f"{len(sets)} parameter sets, {frames} frames in {elapsed:.1f}s ({frames / elapsed:.0f} frames/s)")
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as stream:
+            for r in results:
+                stream.write(json.dumps({
+                    "parameters": r.parameters,
+                    "onset": args.onset,
+                    "frames": r.frames,
+                    "analysed": r.analysed,
+                    "alarms": [a._asdict() for a in r.alarms],
+                    "detected": len(r.latencies),
+                    "missed": r.missed,
+                    "false_alarms": r.false_alarms,
+                    "latency": summary(r.latencies),
+                    "display_latency": summary(r.display_latencies),
+                }) + "\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,274 @@
+"""
+Time-series rollups of per-region frame statistics.
+
+Each frame is reduced to max / mean / hot-pixel count per region and
+folded into open buckets at several resolutions (1 s, 1 min, 1 h by
+default). Closed buckets go to a fixed-size in-memory ring per resolution
+and, for the persisted resolutions, to a background thread that writes
+them to SQLite in batched transactions. Only closed buckets are written,
+so the SD card sees one small transaction per ``batch_size`` rows instead
+of one write per frame.
+
+:meth:`RollupEngine.query` answers "last 24 h of region X" from the ring
+and the ``(region, resolution, start)`` primary key index.
+"""
+
+import math
+import queue
+import sqlite3
+import threading
+import time
+from contextlib import closing
+
+import numpy as np
+
+try:
+    from typing import Callable, Dict, List, Optional, Sequence, Tuple
+except ImportError:
+    pass
+
+RESOLUTIONS = (1, 60, 3600)  # Bucket widths in seconds
+HISTORY = (3600, 1440, 168)  # In-memory buckets per resolution: 1 h, 1 day, 1 week
+PERSISTED = (60, 3600)  # 1 s buckets stay in memory to spare the SD card
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS rollup (
+    region TEXT NOT NULL,
+    resolution INTEGER NOT NULL,
+    start REAL NOT NULL,
+    max REAL NOT NULL,
+    mean REAL NOT NULL,
+    hot_mean REAL NOT NULL,
+    hot_max INTEGER NOT NULL,
+    samples INTEGER NOT NULL,
+    PRIMARY KEY (region, resolution, start)
+) WITHOUT ROWID
+"""
+
+
+class _Resolution:
+    """Open bucket and ring of closed buckets for one resolution."""
+
+    def __init__(self, seconds: int, slots: int, regions: int) -> None:
+        self.seconds = seconds
+        self.slots = slots
+        # Open bucket
+        self.start = None
+        self.samples = 0
+        self.max = np.full(regions, -np.inf)
+        self.sum = np.zeros(regions)
+        self.hot_sum = np.zeros(regions)
+        self.hot_max = np.zeros(regions, dtype=np.int32)
+        # Ring of closed buckets
+        self.count = 0
+        self.ring_start = np.zeros(slots)
+        self.ring_samples = np.zeros(slots, dtype=np.int32)
+        self.ring_max = np.zeros((slots, regions))
+        self.ring_mean = np.zeros((slots, regions))
+        self.ring_hot_mean = np.zeros((slots, regions))
+        self.ring_hot_max = np.zeros((slots, regions), dtype=np.int32)
+
+    def reset(self, start: float) -> None:
+        self.start = start
+        self.samples = 0
+        self.max.fill(-np.inf)
+        self.sum.fill(0.0)
+        self.hot_sum.fill(0.0)
+        self.hot_max.fill(0)
+
+
+class RollupEngine:
+    """Per-region max / mean / hot-pixel rollups with SQLite persistence.
+
+    :param database: SQLite file path, or None to keep everything in memory.
+    :param regions: region name -> ``(y0, y1, x0, x1)`` slice of the 24x32 frame.
+    :param threshold: temperature above which a pixel counts as hot.
+    """
+
+    def __init__(
+        self,
+        database: Optional[str],
+        regions: Dict[str, Tuple[int, int, int, int]],
+        threshold: float,
+        resolutions: Sequence[int] = RESOLUTIONS,
+        history: Sequence[int] = HISTORY,
+        persisted: Sequence[int] = PERSISTED,
+        batch_size: int = 64,
+        flush_interval: float = 300.0,
+    ) -> None:
+        self.database = database
+        self.region_names = list(regions)
+        self._slices = [(slice(y0, y1), slice(x0, x1)) for y0, y1, x0, x1 in regions.values()]
+        self.threshold = threshold
+        self.persisted = tuple(persisted) if database else ()
+        self._levels = [
+            _Resolution(seconds, slots, len(self.region_names))
+            for seconds, slots in zip(resolutions, history)
+        ]
+        self._lock = threading.Lock()
+        self._max = np.zeros(len(self.region_names))
+        self._mean = np.zeros(len(self.region_names))
+        self._hot = np.zeros(len(self.region_names), dtype=np.int32)
+
+        # Called with the resolution and the rows of each closed bucket, one
+        # row per region as written to SQLite, e.g. to publish them
+        self.on_close: Optional[Callable[[int, List[tuple]], None]] = None
+
+        self.rows_written = 0
+        self.rows_dropped = 0
+        self._queue = queue.Queue(maxsize=10000)
+        self._writer = None
+        if database:
+            with closing(sqlite3.connect(database)) as db:
+                db.execute("PRAGMA journal_mode=WAL")
+                db.execute(SCHEMA)
+                db.commit()
+            self._writer = threading.Thread(
+                target=self._write_loop, args=(batch_size, flush_interval), name="rollup-writer"
+            )
+            self._writer.daemon = True
+            self._writer.start()
+
+    def update(self, frame: Sequence[float], stamp: float) -> None:
+        """Fold one frame taken at wall-clock time ``stamp`` into the rollups."""
+        image = np.asarray(frame, dtype=np.float64).reshape(24, 32)
+        for i, (rows, cols) in enumerate(self._slices):
+            region = image[rows, cols]
+            self._max[i] = region.max()
+            self._mean[i] = region.mean()
+            self._hot[i] = np.count_nonzero(region > self.threshold)
+
+        for level in self._levels:
+            start = math.floor(stamp / level.seconds) * level.seconds
+            if level.start != start:
+                if level.samples:
+                    self._close(level)
+                level.reset(start)
+            level.samples += 1
+            np.maximum(level.max, self._max, out=level.max)
+            level.sum += self._mean
+            level.hot_sum += self._hot
+            np.maximum(level.hot_max, self._hot, out=level.hot_max)
+
+    def query(
+        self, region: str, resolution: int, since: float, until: Optional[float] = None
+    ) -> List[Tuple[float, float, float, float, int, int]]:
+        """Closed buckets of ``region`` at ``resolution`` seconds with
+        ``since <= start < until``, oldest first, as
+        ``(start, max, mean, hot_mean, hot_max, samples)`` tuples.
+
+        Recent buckets come from memory; older ones from SQLite when the
+        resolution is persisted."""
+        if until is None:
+            until = math.inf
+        r = self.region_names.index(region)
+        level = next(level for level in self._levels if level.seconds == resolution)
+        rows = {}
+
+        if resolution in self.persisted:
+            with closing(sqlite3.connect(self.database)) as db:
+                cursor = db.execute(
+                    "SELECT start, max, mean, hot_mean, hot_max, samples FROM rollup"
+                    " WHERE region = ? AND resolution = ? AND start >= ? AND start < ?"
+                    " ORDER BY start",
+                    (region, resolution, since, until),
+                )
+                for row in cursor:
+                    rows[row[0]] = row
+
+        with self._lock:
+            n = min(level.count, level.slots)
+            order = np.arange(level.count - n, level.count) % level.slots
+            starts = level.ring_start[order]
+            for slot in order[(starts >= since) & (starts < until)]:
+                start = float(level.ring_start[slot])
+                rows[start] = (
+                    start,
+                    float(level.ring_max[slot, r]),
+                    float(level.ring_mean[slot, r]),
+                    float(level.ring_hot_mean[slot, r]),
+                    int(level.ring_hot_max[slot, r]),
+                    int(level.ring_samples[slot]),
+                )
+
+        return [rows[start] for start in sorted(rows)]
+
+    def close(self, timeout: Optional[float] = 10.0) -> None:
+        """Close the open buckets, write everything pending and stop the writer."""
+        for level in self._levels:
+            if level.samples:
+                self._close(level)
+                level.start = None
+                level.samples = 0
+        if self._writer is not None:
+            self._queue.put(None)
+            self._writer.join(timeout)
+
+    def _close(self, level: _Resolution) -> None:
+        slot = level.count % level.slots
+        mean = level.sum / level.samples
+        hot_mean = level.hot_sum / level.samples
+        with self._lock:
+            level.ring_start[slot] = level.start
+            level.ring_samples[slot] = level.samples
+            level.ring_max[slot] = level.max
+            level.ring_mean[slot] = mean
+            level.ring_hot_mean[slot] = hot_mean
+            level.ring_hot_max[slot] = level.hot_max
+            level.count += 1
+
+        if level.seconds not in self.persisted and self.on_close is None:
+            return
+        rows = [
+            (
+                name,
+                level.seconds,
+                level.start,
+                float(level.max[r]),
+                float(mean[r]),
+                float(hot_mean[r]),
+                int(level.hot_max[r]),
+                level.samples,
+            )
+            for r, name in enumerate(self.region_names)
+        ]
+        if self.on_close is not None:
+            self.on_close(level.seconds, rows)
+        if level.seconds in self.persisted:
+            for row in rows:
+                try:
+                    self._queue.put_nowait(row)
+                except queue.Full:
+                    self.rows_dropped += 1
+
+    def _write_loop(self, batch_size: int, flush_interval: float) -> None:
+        db = sqlite3.connect(self.database)
+        db.execute("PRAGMA synchronous=NORMAL")
+
+        batch = []
+        deadline = time.monotonic() + flush_interval
+        running = True
+        while running:
+            try:
+                row = self._queue.get(timeout=max(0.0, deadline - time.monotonic()))
+            except queue.Empty:
+                row = False
+            if row is None:
+                running = False
+            elif row:
+                batch.append(row)
+
+            if batch and (not running or len(batch) >= batch_size or row is False):
+                try:
+                    with db:
+                        db.executemany(
+                            "INSERT OR REPLACE INTO rollup VALUES (?, ?, ?, ?, ?, ?, ?, ?)", batch
+                        )
+                    self.rows_written += len(batch)
+                except sqlite3.Error as e:
+                    print(f"Rollup write failed: {e}")
+                    self.rows_dropped += len(batch)
+                batch = []
+            if row is False or not batch:
+                deadline = time.monotonic() + flush_interval
+        db.close()
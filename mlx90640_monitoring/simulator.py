@@ -0,0 +1,361 @@
+"""
+Simulated MLX90640 on a simulated I2C bus.
+
+:class:`SimulatedI2C` stands in for ``busio.I2C`` and answers the register
+reads and writes the driver issues, so the real driver code (data-ready
+polling, subpage reads, control register, conversion) runs unchanged on a
+workstation, e.g. for :mod:`tune` and :mod:`benchmark`.
+
+The device is modelled, not emulated bit for bit:
+
+* the EEPROM is synthesised from a seed, with per-pixel offset, alpha and
+  Kta codes and no deviating pixels;
+* a new subpage is produced every refresh period, alternating 0 / 1, and
+  flags the data-ready bit of the status register; in step mode (bit 1 of
+  the control register) one subpage is produced a refresh period after
+  each start of measurement (bit 5 of the status register);
+* raw pixel words are computed by inverting the datasheet conversion for a
+  scene (24x32 temperatures in degC), with the driver's default emissivity
+  of 0.95 and reflected temperature of Ta - 8;
+* temporal noise is ``NETD_1HZ`` K rms at 1Hz, growing with the square root
+  of the refresh rate, plus quantisation of the raw data at
+  ``2 ** (18 - bits)`` counts below the calibrated 18 bits;
+* time is virtual: every transaction advances :attr:`SimulatedMLX90640.clock` by
+  its wire time at the bus frequency plus a fixed host overhead, so
+  benchmarks run faster than real time and are reproducible;
+* bit errors on the wire, as seen on long cables at 800 kHz, flip bits of
+  the words read at :attr:`SimulatedI2C.bit_error_rate`.
+"""
+
+import math
+import random
+
+try:
+    from typing import Callable, List, Optional, Sequence, Union
+except ImportError:
+    pass
+
+ADDRESS = 0x33
+NETD_1HZ = 0.1  # K rms at 1Hz refresh rate, 18-bit resolution
+EMISSIVITY = 0.95  # Driver default, used to invert the conversion
+DEFAULT_CONTROL = 0x1901  # Chess pattern, 18-bit, 2Hz, subpage mode on
+
+_EE_BASE = 0x2400
+_RAM_BASE = 0x0400
+_STATUS = 0x8000
+_CONTROL = 0x800D
+
+
+def _signed(value: int, bits: int) -> int:
+    return value & ((1 << bits) - 1)
+
+
+class SimulatedMLX90640:
+    """Register model of one MLX90640.
+
+    :param scene: 768 temperatures in degC, or a callable ``f(t)`` returning
+        them for virtual time ``t``.
+    :param ambient: sensor die temperature Ta in degC.
+    :param seed: seeds both the synthetic EEPROM and the noise.
+    """
+
+    # Calibration constants encoded into the synthetic EEPROM
+    KVDD = -3200
+    VDD25 = -12544
+    KV_PTAT = 9 / 4096
+    KT_PTAT = 42.25
+    VPTAT25 = 12273
+    ALPHA_PTAT = 9
+    GAIN = 6000
+    ALPHA_REF = 12000
+    ALPHA_SCALE = 36  # 2 ** 36, i.e. alpha around 1.7e-7
+    OFFSET_REF = -70
+
+    def __init__(
+        self,
+        scene: Union[Sequence[float], Callable[[float], Sequence[float]], None] = None,
+        ambient: float = 25.0,
+        seed: int = 0,
+    ) -> None:
+        self.scene = scene if scene is not None else self.default_scene()
+        self.ambient = ambient
+        self.vdd = 3.3
+        self.control = DEFAULT_CONTROL
+        self.status = 0
+        self.eeprom = [0] * 832
+        self.ram = [0] * 832
+        self._rng = random.Random(seed)
+        self.clock = 0.0  # Virtual time, shared by every bus opened on the device
+        self._subpage = 1
+        self._next_ready = None  # Virtual time of the next subpage
+        self.subpages = 0  # Measurements made, each one refresh period long
+        self.overwritten = 0  # Subpages produced before the previous one was read
+        self._synthesise_eeprom()
+
+    @staticmethod
+    def default_scene() -> List[float]:
+        """25 degC background with a 45 degC hot spot of 4x4 pixels."""
+        scene = [25.0] * 768
+        for y in range(10, 14):
+            for x in range(14, 18):
+                scene[y * 32 + x] = 45.0
+        return scene
+
+    @property
+    def refresh_hz(self) -> float:
+        return 2.0 ** (((self.control >> 7) & 0x07) - 1)
+
+    @property
+    def resolution_bits(self) -> int:
+        return 16 + ((self.control & 0x0C00) >> 10)
+
+    # --- EEPROM -----------------------------------------------------------------
+
+    def _synthesise_eeprom(self) -> None:
+        ee = self.eeprom
+        rng = self._rng
+        ee[10] = 0x0000  # Chess pattern calibration
+        ee[16] = (4 << 12)  # alphaPTAT = 9, offset row/column/remnant scales 0
+        ee[17] = _signed(self.OFFSET_REF, 16)
+        ee[32] = ((self.ALPHA_SCALE - 30) << 12) | 0x0004  # alpha remnant scale 4
+        ee[33] = self.ALPHA_REF
+        ee[48] = self.GAIN
+        ee[49] = self.VPTAT25
+        ee[50] = (9 << 10) | int(self.KT_PTAT * 8)
+        ee[51] = (_signed(self.KVDD // 32, 8) << 8) | ((self.VDD25 + 8192) // 32 + 256)
+        ee[52] = 0x2222  # Kv 2 / 2**kvScale for every pixel group
+        ee[53] = 0x0000  # No interleaved/chess correction
+        ee[54] = (_signed(40, 8) << 8) | _signed(38, 8)
+        ee[55] = (_signed(42, 8) << 8) | _signed(36, 8)
+        ee[56] = (2 << 12) | (4 << 8) | (6 << 4) | 1  # 18-bit, kvScale 4, ktaScale 14 / 1
+        ee[57] = 0x0000
+        ee[58] = 0x0000
+        ee[59] = 0x0000
+        ee[60] = 0x0000  # KsTa 0, Tgc 0
+        ee[61] = 0x0000  # KsTo 0: no range correction
+        ee[62] = 0x0000
+        ee[63] = (1 << 12) | (4 << 8) | (3 << 4) | 0x0005
+
+        self._offset = [0.0] * 768
+        self._alpha = [0.0] * 768
+        self._kta = [0.0] * 768
+        kta_rc = [40, 42, 38, 36]
+        for p in range(768):
+            offset_code = rng.randint(-20, 20)
+            alpha_code = rng.randint(-25, 25)
+            kta_code = rng.randint(-3, 3)
+            ee[64 + p] = (
+                (_signed(offset_code, 6) << 10)
+                | (_signed(alpha_code, 6) << 4)
+                | (_signed(kta_code, 3) << 1)
+            )
+            split = 2 * (p // 32 - (p // 64) * 2) + p % 2
+            self._offset[p] = self.OFFSET_REF + offset_code
+            self._alpha[p] = (self.ALPHA_REF + alpha_code * 16) / 2.0**self.ALPHA_SCALE
+            self._kta[p] = (kta_code * 2 + kta_rc[split]) / 2.0**14
+        self._kv = 2 / 16.0
+
+    # --- Measurement ------------------------------------------------------------
+
+    def advance(self, now: float) -> None:
+        """Produce every subpage due at virtual time ``now``."""
+        if self.control & 0x0002:
+            # Step mode: only the measurement that was started, if any
+            if self._next_ready is not None and now >= self._next_ready:
+                self._measure(self._next_ready)
+                self._next_ready = None
+            return
+        if self._next_ready is None:
+            self._next_ready = now + 1.0 / self.refresh_hz
+        while now >= self._next_ready:
+            self._measure(self._next_ready)
+            self._next_ready += 1.0 / self.refresh_hz
+
+    def _measure(self, t: float) -> None:
+        if self.status & 0x0008:
+            self.overwritten += 1
+        self._subpage ^= 1
+        self.subpages += 1
+        scene = self.scene(t) if callable(self.scene) else self.scene
+        ta = self.ambient
+        vdd = self.vdd
+        ram = self.ram
+
+        chess = self.control & 0x1000
+        sigma = NETD_1HZ * math.sqrt(self.refresh_hz)
+        lsb = 1 << max(0, 18 - self.resolution_bits)
+        ta4 = (ta + 273.15) ** 4
+        tr4 = (ta - 8 + 273.15) ** 4
+        ta_tr = tr4 - (tr4 - ta4) / EMISSIVITY
+        gauss = self._rng.gauss
+        for p in range(768):
+            row = p // 32
+            pattern = (row % 2) ^ (p % 2) if chess else row % 2
+            if pattern != self._subpage:
+                continue
+            to = scene[p] + gauss(0.0, sigma) + 273.15
+            ir = (to**4 - ta_tr) * self._alpha[p] * EMISSIVITY
+            ir += self._offset[p] * (1 + self._kta[p] * (ta - 25)) * (1 + self._kv * (vdd - 3.3))
+            raw = int(round(ir / lsb)) * lsb
+            ram[p] = raw & 0xFFFF
+
+        # Auxiliary words: Ta through PTAT, Vdd, gain, compensation pixels
+        scale = 2 ** (self.resolution_bits - 16 - ((self.eeprom[56] & 0x3000) >> 12))
+        vdd_raw = int(round(((vdd - 3.3) * self.KVDD + self.VDD25) * scale))
+        ptat = 1700
+        ptat_art = ((ta - 25) * self.KT_PTAT + self.VPTAT25) * (1 + self.KV_PTAT * (vdd - 3.3))
+        art_raw = int(round(ptat * 2**18 / ptat_art - ptat * self.ALPHA_PTAT))
+        ram[768] = art_raw & 0xFFFF
+        ram[776] = 0
+        ram[778] = self.GAIN
+        ram[800] = ptat
+        ram[808] = 0
+        ram[810] = vdd_raw & 0xFFFF
+
+        self.status = (self.status & ~0x0001) | 0x0008 | self._subpage
+
+    # --- Registers --------------------------------------------------------------
+
+    def read_word(self, addr: int) -> int:
+        if _EE_BASE <= addr < _EE_BASE + 832:
+            return self.eeprom[addr - _EE_BASE]
+        if _RAM_BASE <= addr < _RAM_BASE + 832:
+            return self.ram[addr - _RAM_BASE]
+        if addr == _STATUS:
+            return self.status
+        if addr == _CONTROL:
+            return self.control
+        if 0x2407 <= addr < 0x240A:
+            return 0x1234 + addr
+        return 0
+
+    def write_word(self, addr: int, value: int) -> None:
+        if addr == _STATUS:
+            # Writing 0 to the data-ready bit clears it; the other bits are
+            # the overwrite enable and start-of-measurement flags.
+            self.status = (self.status & ~0x0038 & 0xFFFF) | (value & 0x0030)
+            if value & 0x0008:
+                self.status |= 0x0008
+            if value & 0x0020 and self.control & 0x0002 and self._next_ready is None:
+                self._next_ready = self.clock + 1.0 / self.refresh_hz
+        elif addr == _CONTROL:
+            if (value ^ self.control) & 0x0382:
+                self._next_ready = None  # New refresh rate or mode restarts the measurement
+            self.control = value & 0xFFFF
+
+
+class SimulatedI2C:
+    """Minimal ``busio.I2C`` stand-in with a virtual clock.
+
+    :param device: the simulated sensor, a new :class:`SimulatedMLX90640` if None.
+    :param frequency: bus clock in Hz, sets the wire time of each transaction.
+    :param overhead: host-side cost of one transaction in seconds.
+    :param bit_error_rate: probability that a bit read from the device is
+        flipped, e.g. set after the EEPROM was read.
+    :param seed: seed of the bit errors.
+    """
+
+    def __init__(
+        self,
+        device: Optional[SimulatedMLX90640] = None,
+        frequency: int = 400000,
+        overhead: float = 100e-6,
+        bit_error_rate: float = 0.0,
+        seed: int = 0,
+    ) -> None:
+        self.device = device if device is not None else SimulatedMLX90640()
+        self.frequency = frequency
+        self.overhead = overhead
+        self.bit_error_rate = bit_error_rate
+        self.transactions = 0
+        self.bytes = 0
+        self.bit_errors = 0  # Bits flipped on reads
+        self._rng = random.Random(seed)
+        self._locked = False
+
+    @property
+    def clock(self) -> float:
+        """Virtual time of the device in seconds."""
+        return self.device.clock
+
+    def now(self) -> float:
+        """Virtual time in seconds, usable as a drop-in for ``time.monotonic``."""
+        return self.device.clock
+
+    def sleep(self, seconds: float) -> None:
+        """Advance virtual time, usable as a drop-in for ``time.sleep``."""
+        self.device.clock += max(0.0, seconds)
+        self.device.advance(self.device.clock)
+
+    def _transfer(self, nbytes: int) -> None:
+        # Address byte, payload and one ACK bit per byte, plus start/stop
+        self.transactions += 1
+        self.bytes += nbytes
+        self.device.clock += (nbytes + 1) * 9 / self.frequency + self.overhead
+        self.device.advance(self.device.clock)
+
+    def try_lock(self) -> bool:
+        if self._locked:
+            return False
+        self._locked = True
+        return True
+
+    def unlock(self) -> None:
+        self._locked = False
+
+    def deinit(self) -> None:
+        pass
+
+    def scan(self) -> List[int]:
+        return [ADDRESS]
+
+    def writeto(self, address: int, buffer, *, start: int = 0, end: Optional[int] = None) -> None:
+        self._check(address)
+        data = bytes(buffer[start:end])
+        self._transfer(len(data))
+        if len(data) >= 4:
+            self.device.write_word((data[0] << 8) | data[1], (data[2] << 8) | data[3])
+
+    def readfrom_into(self, address: int, buffer, *, start: int = 0, end: Optional[int] = None) -> None:
+        self._check(address)
+        end = len(buffer) if end is None else end
+        self._transfer(end - start)
+
+    def writeto_then_readfrom(
+        self,
+        address: int,
+        out_buffer,
+        in_buffer,
+        *,
+        out_start: int = 0,
+        out_end: Optional[int] = None,
+        in_start: int = 0,
+        in_end: Optional[int] = None,
+    ) -> None:
+        self._check(address)
+        out = bytes(out_buffer[out_start:out_end])
+        in_end = len(in_buffer) if in_end is None else in_end
+        self._transfer(len(out) + 1 + in_end - in_start)
+        addr = (out[0] << 8) | out[1]
+        read_word = self.device.read_word
+        for i in range(in_start, in_end - 1, 2):
+            word = read_word(addr + (i - in_start) // 2)
+            in_buffer[i] = word >> 8
+            in_buffer[i + 1] = word & 0xFF
+        if self.bit_error_rate > 0:
+            self._corrupt(in_buffer, in_start, in_end)
+
+    def _corrupt(self, buffer, start: int, end: int) -> None:
+        # Independent bit errors: the gaps between flipped bits are geometric
+        scale = 1 / math.log1p(-self.bit_error_rate)
+        bit = 8 * start - 1
+        while True:
+            bit += 1 + int(math.log(1.0 - self._rng.random()) * scale)
+            if bit >= 8 * end:
+                return
+            buffer[bit >> 3] ^= 0x80 >> (bit & 7)
+            self.bit_errors += 1
+
+    def _check(self, address: int) -> None:
+        if address != ADDRESS:
+            raise OSError(121, "Remote I/O error")
@@ -0,0 +1,138 @@
+"""
+Pre/post-trigger snapshot recorder for alarm evidence.
+
+Every frame is copied into a fixed-size ring held in preallocated NumPy
+arrays, so steady-state recording costs one 768-value copy per frame and
+no allocation. When :meth:`SnapshotRecorder.trigger` is called, recording
+continues for ``post_seconds``; the window ``[trigger - pre_seconds,
+trigger + post_seconds]`` is then handed to a background thread that
+writes it as a compressed ``.npz`` file, so the acquisition loop never
+waits on the SD card.
+
+Each file holds ``frames`` (N x 768, float32), ``offsets`` (seconds
+relative to the trigger), ``trigger_time`` (wall clock, seconds since the
+epoch) and ``label``.
+"""
+
+import math
+import os
+import queue
+import threading
+import time
+
+import numpy as np
+
+try:
+    from typing import Optional, Sequence
+except ImportError:
+    pass
+
+
+class SnapshotRecorder:
+    """Always-on ring of the last frames, dumped to disk around a trigger."""
+
+    def __init__(
+        self,
+        directory: str,
+        pre_seconds: float = 30.0,
+        post_seconds: float = 10.0,
+        max_fps: float = 2.0,
+        pixels: int = 768,
+    ) -> None:
+        self.directory = directory
+        self.pre_seconds = pre_seconds
+        self.post_seconds = post_seconds
+        # Two spare slots so the oldest pre-trigger frame is never overwritten
+        # by the frame that closes the post-trigger window.
+        self.capacity = int(math.ceil((pre_seconds + post_seconds) * max_fps)) + 2
+        self._frames = np.zeros((self.capacity, pixels), dtype=np.float32)
+        self._stamps = np.zeros(self.capacity, dtype=np.float64)
+        self._count = 0
+        self._pending = None  # (monotonic trigger time, wall time, label)
+
+        self.saved = 0
+        self.dropped = 0
+        self.last_path = None
+
+        self._queue = queue.Queue(maxsize=4)
+        self._writer = threading.Thread(target=self._write_loop, name="snapshot-writer")
+        self._writer.daemon = True
+        self._writer.start()
+
+    @property
+    def triggered(self) -> bool:
+        """True while a post-trigger window is being recorded."""
+        return self._pending is not None
+
+    def push(self, frame: Sequence[float], stamp: float) -> None:
+        """Record one frame taken at monotonic time ``stamp``."""
+        slot = self._count % self.capacity
+        self._frames[slot] = frame
+        self._stamps[slot] = stamp
+        self._count += 1
+
+        if self._pending is not None and stamp >= self._pending[0] + self.post_seconds:
+            self._flush()
+
+    def trigger(self, stamp: float, label: str = "alarm") -> None:
+        """Start the post-trigger window at monotonic time ``stamp``. A trigger
+        arriving while a window is already open is folded into that window."""
+        if self._pending is None:
+            self._pending = (stamp, time.time(), label)
+
+    def close(self, timeout: Optional[float] = 5.0) -> None:
+        """Write any open window with the frames recorded so far and stop the
+        writer thread."""
+        if self._pending is not None:
+            self._flush()
+        self._queue.put(None)
+        self._writer.join(timeout)
+
+    def _flush(self) -> None:
+        trigger_stamp, trigger_wall, label = self._pending
+        self._pending = None
+
+        n = min(self._count, self.capacity)
+        start = self._count - n
+        order = (np.arange(start, start + n)) % self.capacity
+        stamps = self._stamps[order]
+        keep = order[stamps >= trigger_stamp - self.pre_seconds]
+
+        # Fancy indexing copies, so the ring can keep being overwritten
+        # while the writer thread compresses this window.
+        item = (trigger_wall, label, self._frames[keep], self._stamps[keep] - trigger_stamp)
+        try:
+            self._queue.put_nowait(item)
+        except queue.Full:
+            self.dropped += 1
+
+    def _write_loop(self) -> None:
+        while True:
+            item = self._queue.get()
+            if item is None:
+                return
+            trigger_wall, label, frames, offsets = item
+            # Milliseconds in the name: two triggers in the same second do not
+            # overwrite each other
+            second = time.strftime("%Y%m%d_%H%M%S", time.localtime(trigger_wall))
+            name = f"{label}_{second}_{int(trigger_wall * 1000) % 1000:03d}"
+            path = os.path.join(self.directory, f"{name}.npz")
+            sequence = 1
+            while os.path.exists(path):
+                path = os.path.join(self.directory, f"{name}_{sequence}.npz")
+                sequence += 1
+            try:
+                os.makedirs(self.directory, exist_ok=True)
+                np.savez_compressed(
+                    path,
+                    frames=frames,
+                    offsets=offsets,
+                    trigger_time=trigger_wall,
+                    label=label,
+                )
+            except OSError as e:
+                print(f"Snapshot write failed ({path}): {e}")
+                self.dropped += 1
+                continue
+            self.saved += 1
+            self.last_path = path
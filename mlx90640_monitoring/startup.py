@@ -0,0 +1,77 @@
+"""
+Start-up time profile of the entry points.
+
+:class:`StartupProfile` timestamps the steps of a program's start (imports,
+sensor initialisation, first frame, first display) from the start of the
+process, as the operating system recorded it, so interpreter start-up is
+included. With ``--profile-startup``, ``monitoring.py`` and
+``image_VFINAL.py`` print the profile once the first frame is shown, and
+exit::
+
+    $ mlx-image --profile-startup
+    interpreter       0.21s
+    imports           1.35s  +1.14s
+    sensor            2.02s  +0.67s
+    first frame       2.61s  +0.59s
+    first display     2.70s  +0.09s
+"""
+
+import os
+import sys
+import time
+
+try:
+    from typing import List, Optional, TextIO, Tuple
+except ImportError:
+    pass
+
+
+def process_age() -> Optional[float]:
+    """Seconds since the start of this process, None when the system does
+    not tell (not Linux)."""
+    try:
+        with open("/proc/self/stat") as stream:
+            # The command name may hold spaces, fields are counted after it
+            started = int(stream.read().rsplit(")", 1)[1].split()[19])
+        with open("/proc/uptime") as stream:
+            uptime = float(stream.read().split()[0])
+    except (OSError, ValueError, IndexError):
+        return None
+    return max(0.0, uptime - started / os.sysconf("SC_CLK_TCK"))
+
+
+class StartupProfile:
+    """Named timestamps of a program's start.
+
+    :param enabled: when False, :meth:`mark` and :meth:`report` do nothing.
+    """
+
+    def __init__(self, enabled: bool = True) -> None:
+        self.enabled = enabled
+        now = time.perf_counter()
+        age = process_age() if enabled else None
+        # Without the process start time, times count from this object
+        self.origin = now - (age or 0.0)
+        self.marks: List[Tuple[str, float]] = []
+        if age is not None:
+            # Up to the first statement of the program: interpreter and the
+            # imports before this one
+            self.marks.append(("interpreter", age))
+
+    def mark(self, name: str) -> None:
+        """Record that the step ``name`` just finished."""
+        if self.enabled:
+            self.marks.append((name, time.perf_counter() - self.origin))
+
+    def report(self, stream: Optional[TextIO] = None) -> None:
+        """Print each step with its time from the process start and its
+        duration."""
+        if not self.enabled:
+            return
+        stream = stream if stream is not None else sys.stderr
+        previous = None
+        for name, at in self.marks:
+            step = "" if previous is None else f"  +{at - previous:.2f}s"
+            stream.write(f"{name:<16} {at:5.2f}s{step}\n")
+            previous = at
+        stream.flush()
@@ -0,0 +1,216 @@
+"""
+Terminal view of the frames, cheap enough for a serial console over SSH.
+
+:class:`TerminalView` keeps a status line and the 24x32 grid at the top of
+the terminal, and lets the other messages scroll underneath (VT100
+scrolling region). Each frame:
+
+* temperatures are mapped to cells with a vectorized lookup table: one
+  ASCII art character per level (`` .-*+x%#X&``, from below 20C to 37C
+  and above), the temperatures to 0.1 degree, or both, optionally
+  coloured by level with ANSI 256 colours;
+* only cells whose content changed since the last drawing are rewritten,
+  each run of changed cells with one cursor addressing sequence, and the
+  whole update goes out in a single write. A cell changes when its value
+  moved by ``deadband`` degrees or more from the one on screen, so sensor
+  noise alone does not redraw the whole grid;
+* drawing is rate-limited to ``max_fps``, whatever the acquisition rate.
+
+When the output is not a terminal (redirected to a file or a journal),
+whole frames are written as plain text, one buffer per frame, at the same
+limited rate.
+"""
+
+import math
+import shutil
+import sys
+
+import numpy as np
+
+try:
+    from typing import Optional, Sequence, TextIO
+except ImportError:
+    pass
+
+ASCII = "ascii"
+TEMPERATURES = "temperatures"
+BOTH = "both"  # Each temperature followed by its ASCII art character
+
+# Upper bounds (excluded) of the temperature levels, in degrees C, and the
+# ASCII art character of each level
+LEVELS = np.array([20, 23, 25, 27, 29, 31, 33, 35, 37], dtype=np.float32)
+CHARACTERS = " .-*+x%#X&"
+# ANSI 256 colour of each level, from cold blue to hot red
+COLOURS = (17, 19, 27, 37, 71, 142, 178, 172, 166, 160)
+
+ESC = "\x1b["
+
+
+class TerminalView:
+    """Status line and frame grid redrawn in place at the top of a terminal.
+
+    :param mode: ``ASCII`` for one character per pixel, ``TEMPERATURES``
+        for the values, ``BOTH`` for the values and the characters.
+    :param colour: colour the cells by temperature level.
+    :param max_fps: maximum number of drawings per second.
+    :param deadband: smallest change of a value, in degrees, that redraws
+        its cell.
+    :param shape: rows and columns of the frames.
+    :param stream: output, ``sys.stdout`` by default.
+    """
+
+    def __init__(
+        self,
+        mode: str = ASCII,
+        colour: bool = True,
+        max_fps: float = 2.0,
+        deadband: float = 0.2,
+        shape: Sequence[int] = (24, 32),
+        stream: Optional[TextIO] = None,
+    ) -> None:
+        if mode not in (ASCII, TEMPERATURES, BOTH):
+            raise ValueError(f"Unknown terminal view mode {mode!r}")
+        self.mode = mode
+        self.colour = colour
+        self.interval = 1.0 / max_fps
+        self.deadband = deadband
+        self.rows, self.columns = shape
+        self.stream = stream if stream is not None else sys.stdout
+        self.interactive = self.stream.isatty()
+        self.width = {ASCII: 1, TEMPERATURES: 6, BOTH: 7}[mode]  # Characters per cell
+
+        # Character and colour sequence of each level, built once: cells are
+        # then lookups in these tables
+        self._characters = np.array(list(CHARACTERS), dtype=object)
+        if not colour:
+            prefixes = [""] * len(COLOURS)
+        elif mode == ASCII:
+            prefixes = [f"{ESC}48;5;{c}m" for c in COLOURS]  # Background
+        else:
+            prefixes = [f"{ESC}38;5;{c}m" for c in COLOURS]  # Foreground
+        self._prefixes = np.array(prefixes, dtype=object)
+        self._reset = f"{ESC}0m" if colour else ""
+
+        self._shown = np.zeros(shape, dtype=np.float32)  # Values on screen
+        self._full = True  # Next drawing rewrites every cell
+        self._status = None
+        self._last_draw = -math.inf
+        self._started = False
+        self.drawn = 0
+        self.skipped = 0
+        self.bytes_written = 0
+
+    def draw(self, frame: Sequence[float], status: str, now: float) -> bool:
+        """Show ``frame`` and ``status`` unless the last drawing is more recent
+        than ``1 / max_fps`` at ``now`` (seconds, monotonic). Returns whether
+        it was drawn."""
+        if now - self._last_draw < self.interval:
+            self.skipped += 1
+            return False
+        self._last_draw = now
+
+        values = np.asarray(frame, dtype=np.float32).reshape(self.rows, self.columns)
+        levels = np.searchsorted(LEVELS, values, side="right")
+        if not self.interactive:
+            self._write(status + "\n" + self._plain(values, levels) + "\n")
+        else:
+            self._write(self._update(values, levels, status))
+        self._status = status
+        self.drawn += 1
+        return True
+
+    def close(self) -> None:
+        """Give the whole terminal back to scrolling output."""
+        if self.interactive and self._started:
+            self._write(f"{self._reset}{ESC}r{ESC}{shutil.get_terminal_size().lines};1H\n")
+            self._started = False
+
+    def _cells(self, values: np.ndarray, levels: np.ndarray) -> np.ndarray:
+        if self.mode == ASCII:
+            return self._characters[levels]
+        cells = np.char.mod("%6.1f", values).astype(object)
+        if self.mode == BOTH:
+            cells = cells + self._characters[levels]
+        return cells
+
+    @staticmethod
+    def _colour_changes(levels: np.ndarray) -> np.ndarray:
+        changes = np.ones(levels.shape, dtype=bool)
+        changes[:, 1:] = levels[:, 1:] != levels[:, :-1]
+        return changes
+
+    def _changed(self, values: np.ndarray, levels: np.ndarray) -> np.ndarray:
+        if self._full:
+            return np.ones(values.shape, dtype=bool)
+        moved = np.abs(values - self._shown) >= self.deadband
+        if self.mode == TEMPERATURES:
+            return moved
+        # The character changes when the value left the level shown on
+        # screen by more than the deadband
+        shown = np.searchsorted(LEVELS, self._shown, side="right")
+        low = np.searchsorted(LEVELS, values - self.deadband, side="right")
+        high = np.searchsorted(LEVELS, values + self.deadband, side="right")
+        changed = (levels != shown) & ((shown < low) | (shown > high))
+        if self.mode == BOTH:
+            # The character is redrawn with the value, from its own level
+            return changed | moved
+        return changed
+
+    def _plain(self, values: np.ndarray, levels: np.ndarray) -> str:
+        cells = self._cells(values, levels)
+        return "\n".join("".join(row) for row in cells)
+
+    def _update(self, values: np.ndarray, levels: np.ndarray, status: str) -> str:
+        out = []
+        if not self._started:
+            # Status line and grid at the top, messages scroll below them
+            top = self.rows + 3
+            out.append(f"{ESC}2J{ESC}{top};{shutil.get_terminal_size().lines}r{ESC}{top};1H")
+            self._started = True
+            self._full = True
+        out.append("\x1b7")  # Save the cursor, in the scrolling region
+        if status != self._status:
+            out.append(f"{ESC}1;1H{ESC}2K{status}")
+
+        changed = self._changed(values, levels)
+        if changed.any():
+            # Runs of changed cells of the whole grid at once: +1 where a run
+            # starts, -1 after it ends, in row-major order
+            padded = np.zeros((self.rows, self.columns + 2), dtype=np.int8)
+            padded[:, 1:-1] = changed
+            edges = np.diff(padded, axis=1)
+            rows, starts = np.nonzero(edges == 1)
+            stops = np.nonzero(edges == -1)[1]
+            # Runs separated by fewer unchanged characters than a cursor move
+            # are merged
+            merge = (rows[1:] == rows[:-1]) & ((starts[1:] - stops[:-1]) * self.width <= 8)
+            rows = rows[np.r_[True, ~merge]]
+            starts = starts[np.r_[True, ~merge]]
+            stops = stops[np.r_[~merge, True]]
+
+            # Colour sequences only at the start of a run and where the level
+            # differs from the cell on the left
+            prefixes = np.where(self._colour_changes(levels), self._prefixes[levels], "")
+            characters = self._characters[levels]
+            for row, start, stop in zip(rows.tolist(), starts.tolist(), stops.tolist()):
+                if self.mode == ASCII:
+                    texts = characters[row, start:stop]
+                else:
+                    # Only the redrawn values are formatted
+                    texts = np.array([f"{v:6.1f}" for v in values[row, start:stop].tolist()], dtype=object)
+                    if self.mode == BOTH:
+                        texts = texts + characters[row, start:stop]
+                run_prefixes = prefixes[row, start:stop].copy()
+                run_prefixes[0] = self._prefixes[levels[row, start]]
+                out.append(f"{ESC}{row + 3};{start * self.width + 1}H")
+                out.append("".join(run_prefixes + texts))
+                self._shown[row, start:stop] = values[row, start:stop]
+            out.append(self._reset)
+            self._full = False
+        out.append("\x1b8")  # Back to where the messages are printed
+        return "".join(out)
+
+    def _write(self, text: str) -> None:
+        self.stream.write(text)
+        self.stream.flush()
+        self.bytes_written += len(text)
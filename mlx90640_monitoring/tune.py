@@ -0,0 +1,205 @@
+"""
+Sensor configuration tuner.
+
+Measures every combination of refresh rate x ADC resolution x I2C bus
+frequency and recommends the fastest one whose noise stays under a target.
+For each combination it reports:
+
+* NETD: median over the pixels of the temporal standard deviation, in K.
+  Point the sensor at a uniform, static target while it runs;
+* I2C time: time to transfer one subpage of RAM from the sensor;
+* conversion time: CPU time of one subpage temperature calculation;
+* dropped subpages, from the driver's sequence tracking.
+
+A combination is sustainable when one subpage can be transferred and
+converted within a refresh period and no subpage was dropped.
+
+On the sensor::
+
+    mlx-tune --target-netd 0.2 --rates 1,2,4,8
+
+On the simulated sensor (see :mod:`simulator`), in virtual time::
+
+    mlx-tune --simulate --target-netd 0.2
+
+On a Raspberry Pi the I2C clock is fixed by ``dtparam=i2c_arm_baudrate`` in
+/boot/firmware/config.txt and the frequency requested by busio is ignored:
+run the tool once per configured baudrate, passing it with --frequencies.
+"""
+
+import argparse
+import collections
+import statistics
+import time
+
+from . import adafruitmlx90640_librairie as adafruit_mlx90640
+
+try:
+    from typing import Callable, List, Optional
+except ImportError:
+    pass
+
+Measurement = collections.namedtuple(
+    "Measurement", "rate_hz bits frequency netd i2c_time conversion_time dropped"
+)
+
+
+def measure(
+    mlx: adafruit_mlx90640.MLX90640,
+    frames: int,
+    settle: int,
+    clock: Callable[[], float],
+    charge_cpu: Optional[Callable[[float], None]] = None,
+) -> Measurement:
+    """Capture ``frames`` frames with the sensor's current configuration,
+    after ``settle`` frames to let it stabilise. ``clock`` times the I2C
+    transfers; ``charge_cpu``, when given, is called with the conversion time
+    so a simulated clock advances by it too."""
+    i2c_times = []
+    conversion_times = []
+    read_words = mlx._I2CReadWords
+    calculate = mlx._CalculateTo
+
+    def timed_read(addr, buffer, *, end=None):
+        if addr != 0x0400:
+            read_words(addr, buffer, end=end)
+            return
+        start = clock()
+        read_words(addr, buffer, end=end)
+        i2c_times.append(clock() - start)
+
+    def timed_calculate(*args):
+        start = time.perf_counter()
+        calculate(*args)
+        elapsed = time.perf_counter() - start
+        conversion_times.append(elapsed)
+        if charge_cpu is not None:
+            charge_cpu(elapsed)
+
+    mlx._I2CReadWords = timed_read
+    mlx._CalculateTo = timed_calculate
+    try:
+        frame = [0.0] * 768
+        for _ in range(settle):
+            mlx.getFrame(frame)
+        del i2c_times[:]
+        del conversion_times[:]
+        dropped = mlx.dropped_subpages
+        stack = []
+        for _ in range(frames):
+            mlx.getFrame(frame)
+            stack.append(list(frame))
+        dropped = mlx.dropped_subpages - dropped
+    finally:
+        del mlx._I2CReadWords
+        del mlx._CalculateTo
+
+    netd = statistics.median(statistics.pstdev(pixel) for pixel in zip(*stack))
+    return Measurement(
+        rate_hz=1.0 / mlx.subpage_period,
+        bits=16 + ((mlx._controlRegister >> 10) & 0x03),
+        frequency=None,
+        netd=netd,
+        i2c_time=statistics.median(i2c_times),
+        conversion_time=statistics.median(conversion_times),
+        dropped=dropped,
+    )
+
+
+def sustainable(m: Measurement) -> bool:
+    """True when a subpage is transferred and converted within one period."""
+    return m.dropped == 0 and m.i2c_time + m.conversion_time < 1.0 / m.rate_hz
+
+
+def recommend(results: List[Measurement], target_netd: float) -> Optional[Measurement]:
+    """Fastest sustainable setting with NETD under ``target_netd``; among
+    equally fast ones, the one with the least time per subpage, then the
+    least noise."""
+    candidates = [m for m in results if sustainable(m) and m.netd <= target_netd]
+    if not candidates:
+        return None
+    return min(candidates, key=lambda m: (-m.rate_hz, m.i2c_time + m.conversion_time, m.netd))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--target-netd", type=float, default=0.2, help="noise target in K")
+    parser.add_argument("--rates", default="0.5,1,2,4,8,16", help="refresh rates in Hz")
+    parser.add_argument("--resolutions", default="16,17,18,19", help="ADC resolutions in bits")
+    parser.add_argument("--frequencies", default="400000,800000,1000000", help="I2C clocks in Hz")
+    parser.add_argument("--frames", type=int, default=10, help="frames measured per combination")
+    parser.add_argument("--settle", type=int, default=2, help="frames discarded after a change")
+    parser.add_argument("--simulate", action="store_true", help="use the simulated sensor")
+    parser.add_argument("--seed", type=int, default=0, help="simulated sensor seed")
+    args = parser.parse_args()
+
+    rates = [float(r) for r in args.rates.split(",")]
+    resolutions = [int(b) for b in args.resolutions.split(",")]
+    frequencies = [int(f) for f in args.frequencies.split(",")]
+
+    if args.simulate:
+        from .simulator import SimulatedI2C, SimulatedMLX90640
+
+        device = SimulatedMLX90640(seed=args.seed)
+
+        def open_bus(frequency):
+            return SimulatedI2C(device, frequency=frequency)
+
+    else:
+        import board
+        import busio
+
+        def open_bus(frequency):
+            return busio.I2C(board.SCL, board.SDA, frequency=frequency)
+
+    bus = open_bus(frequencies[0])
+    mlx = adafruit_mlx90640.MLX90640(bus)
+    if args.simulate:
+        mlx.clock = clock = bus.now
+        charge_cpu = bus.sleep
+    else:
+        clock = time.perf_counter
+        charge_cpu = None
+
+    print(f"{'Rate':>6} {'ADC':>4} {'I2C clk':>8} {'NETD':>7} {'I2C/sp':>8} {'Conv/sp':>8} {'Drop':>5}")
+    results = []
+    for frequency in frequencies:
+        if frequency != frequencies[0]:
+            bus.deinit()
+            bus = open_bus(frequency)
+            mlx.reconnect(bus)
+        for rate_hz in rates:
+            # RefreshRate counts in powers of two from 0.5Hz
+            mlx.refresh_rate = max(0, min(7, round(rate_hz * 2).bit_length() - 1))
+            for bits in resolutions:
+                mlx.resolution = bits - 16
+                try:
+                    m = measure(mlx, args.frames, args.settle, clock, charge_cpu)
+                except adafruit_mlx90640.FrameError as e:
+                    # The sensor overwrites the subpage faster than it can be read
+                    print(f"{rate_hz:>5g}Hz {bits:>3}b {frequency // 1000:>5}kHz  cannot keep up ({e})")
+                    continue
+                m = m._replace(frequency=frequency)
+                results.append(m)
+                print(
+                    f"{m.rate_hz:>5g}Hz {m.bits:>3}b {m.frequency // 1000:>5}kHz {m.netd:>6.3f}K "
+                    f"{m.i2c_time * 1000:>6.1f}ms {m.conversion_time * 1000:>6.1f}ms {m.dropped:>5}"
+                    f"{'' if sustainable(m) else '  (too slow)'}"
+                )
+
+    # Leave the sensor at its factory configuration
+    mlx.refresh_rate = adafruit_mlx90640.RefreshRate.REFRESH_2_HZ
+    mlx.resolution = adafruit_mlx90640.Resolution.ADC_18_BIT
+
+    best = recommend(results, args.target_netd)
+    if best is None:
+        print(f"No sustainable setting reaches NETD <= {args.target_netd}K")
+    else:
+        print(
+            f"Recommended: {best.rate_hz:g}Hz, {best.bits}-bit ADC, I2C at {best.frequency // 1000}kHz"
+            f" (NETD {best.netd:.3f}K, {(best.i2c_time + best.conversion_time) * 1000:.1f}ms per subpage)"
+        )
+
+
+if __name__ == "__main__":
+    main()
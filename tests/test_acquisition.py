@@ -0,0 +1,51 @@
+from mlx90640_monitoring.acquisition import BUS, PollSchedule, SensorSupervisor
+from mlx90640_monitoring.adafruitmlx90640_librairie import MLX90640
+from mlx90640_monitoring.simulator import SimulatedI2C
+
+
+class FlakyI2C(SimulatedI2C):
+    """Simulated bus that does not answer until ``down_until``."""
+
+    down_until = 0.0
+
+    def _check(self, address):
+        if self.clock < self.down_until:
+            self.sleep(0.001)
+            raise OSError(121, "Remote I/O error")
+        super()._check(address)
+
+
+def sensor(bus):
+    mlx = MLX90640(bus)
+    mlx.clock = bus.now
+    mlx.sleep = bus.sleep
+    return mlx
+
+
+def test_outage_reported_while_it_lasts():
+    bus = FlakyI2C()
+    mlx = sensor(bus)
+    supervisor = SensorSupervisor(mlx, bus, lambda: bus, fault_interval=60.0, clock=bus.now, sleep=bus.sleep)
+    reports = []
+    supervisor.on_fault = lambda kind, failures, elapsed, error: reports.append((kind, elapsed))
+    frame = [0.0] * 768
+    assert supervisor.read(frame) is None
+
+    bus.down_until = bus.now() + 150.0
+    recovery = supervisor.read(frame)
+
+    assert 150.0 <= recovery < 160.0
+    assert [kind for kind, _ in reports] == [BUS] * 3
+    assert [round(elapsed, -1) for _, elapsed in reports] == [0.0, 60.0, 120.0]
+    assert supervisor.reconnects >= 1 and supervisor.recoveries == 1
+    assert 24.0 < frame[0] < 26.0  # Scene read again after the reconnect
+
+
+def test_poll_schedule_alert_cadence():
+    bus = SimulatedI2C()
+    schedule = PollSchedule(5.0, alert_interval=1.0, clock=bus.now, sleep=bus.sleep)
+    assert schedule.wait() == 0.0
+    assert schedule.wait() == 5.0
+    assert schedule.wait(alert=True) == 1.0
+    bus.sleep(3.0)  # A slow frame shortens the next wait
+    assert schedule.wait() == 2.0
@@ -0,0 +1,56 @@
+import numpy as np
+import pytest
+
+from mlx90640_monitoring import batch
+from mlx90640_monitoring.adafruitmlx90640_librairie import MLX90640
+from mlx90640_monitoring.simulator import SimulatedI2C
+
+
+def record(frames, **settings):
+    """Raw subpages read by getFrame and the frames it computed from them."""
+    bus = SimulatedI2C()
+    mlx = MLX90640(bus)
+    mlx.clock = bus.now
+    mlx.sleep = bus.sleep
+    for name, value in settings.items():
+        setattr(mlx, name, value)
+    subpages = []
+    read = mlx._GetFrameData
+
+    def recording_read(frameData):
+        status = read(frameData)
+        subpages.append(list(frameData))
+        return status
+
+    mlx._GetFrameData = recording_read
+    computed = []
+    frame = [0.0] * 768
+    for _ in range(frames):
+        mlx.getFrame(frame)
+        computed.append(list(frame))
+    return mlx, np.array(subpages), np.array(computed)
+
+
+@pytest.mark.parametrize("settings", [{}, {"emissivity": 0.8, "reflected_temperature": 20.0}])
+def test_convert_matches_getframe(settings):
+    mlx, subpages, computed = record(6, **settings)
+    cube = batch.convert(subpages, mlx.calibration, emissivity=mlx.emissivity,
+                         tr=mlx.reflected_temperature, dtype=np.float64)
+
+    assert cube.shape == (12, 24, 32)
+    # getFrame returns once both subpages of a frame are converted
+    np.testing.assert_array_equal(cube[1::2].reshape(-1, 768), computed)
+
+
+def test_chunks_workers_and_unmerged_subpages():
+    mlx, subpages, _ = record(3)
+    whole = batch.convert(subpages, mlx.calibration)
+    np.testing.assert_array_equal(batch.convert(subpages, mlx.calibration, chunk_size=4, workers=2), whole)
+
+    alone = batch.convert(subpages, mlx.calibration, merge=False).reshape(-1, 768)
+    assert (np.isnan(alone).sum(axis=1) == 384).all()
+    measured = ~np.isnan(alone)
+    np.testing.assert_array_equal(alone[measured], whole.reshape(-1, 768)[measured])
+
+    with pytest.raises(ValueError):
+        batch.convert(subpages[:, :832], mlx.calibration)
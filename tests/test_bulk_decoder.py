@@ -0,0 +1,33 @@
+import random
+from array import array
+
+import pytest
+
+from mlx90640_monitoring.adafruitmlx90640_librairie import Calibration
+from mlx90640_monitoring.benchmark import same_parameters
+from mlx90640_monitoring.simulator import SimulatedMLX90640
+
+np = pytest.importorskip("numpy")
+
+
+def fuzzed(seed):
+    """Simulated EEPROM with random calibration words: the scales, constants
+    and per-pixel fields take arbitrary values, plus a few broken pixels.
+    The alpha scales and references (words 32 to 47) and Tgc are kept, so the
+    sensitivities stay positive as on any real sensor."""
+    rng = random.Random(seed)
+    ee = list(SimulatedMLX90640(seed=seed).eeprom)
+    for addr in range(16, 64):
+        if not 32 <= addr < 48 and addr != 60:
+            ee[addr] = rng.getrandbits(16)
+    for addr in range(64, 832):
+        ee[addr] = rng.getrandbits(16) & 0xFFFE  # No outlier flag
+    for pixel in rng.sample(range(0, 768, 3), rng.randint(0, 2)):
+        ee[64 + pixel] = 0
+    return array("H", ee)
+
+
+@pytest.mark.parametrize("eeprom", [array("H", SimulatedMLX90640(seed=seed).eeprom) for seed in range(20)]
+                         + [fuzzed(seed) for seed in range(256)])
+def test_bulk_matches_loops(eeprom):
+    assert same_parameters(Calibration(eeprom, bulk=False), Calibration(eeprom, bulk=True))
@@ -0,0 +1,25 @@
+from array import array
+
+from mlx90640_monitoring.adafruitmlx90640_librairie import MLX90640, Calibration
+from mlx90640_monitoring.simulator import SimulatedI2C, SimulatedMLX90640
+
+
+def test_tables_are_typed_and_per_instance():
+    first = MLX90640(SimulatedI2C(SimulatedMLX90640(seed=1)))
+    second = MLX90640(SimulatedI2C(SimulatedMLX90640(seed=2)))
+
+    for name, typecode in (("alpha", "i"), ("offset", "i"), ("kta", "h"), ("kv", "h")):
+        table = getattr(first.calibration, name)
+        assert isinstance(table, array) and table.typecode == typecode and len(table) == 768
+        assert getattr(first, name) is table  # Melexis names still readable on the driver
+    assert first.offset is not second.offset
+    assert list(first.offset) != list(second.offset)
+    assert not hasattr(first.calibration, "__dict__")
+
+
+def test_calibration_from_eeprom_image():
+    device = SimulatedMLX90640()
+    calibration = Calibration(array("H", device.eeprom))
+    assert calibration.resolutionEE == 2  # 18 bits
+    assert [offset for offset in calibration.offset] == [int(offset) for offset in device._offset]
+    assert calibration.brokenPixels == [] and calibration.outlierPixels == []
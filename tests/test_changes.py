@@ -0,0 +1,51 @@
+import numpy as np
+
+from mlx90640_monitoring.adafruitmlx90640_librairie import MLX90640
+from mlx90640_monitoring.changes import CHANGE, FIRST, HEARTBEAT, ChangeDetector
+from mlx90640_monitoring.simulator import SimulatedI2C, SimulatedMLX90640
+
+SPOT = 11 * 32 + 15
+
+
+def spot_heating(t):
+    """Default scene until 20 s, then the hot spot warms by 0.5 degree per second."""
+    scene = SimulatedMLX90640.default_scene()
+    for y in range(10, 14):
+        for x in range(14, 18):
+            scene[y * 32 + x] += max(0.0, t - 20.0) * 0.5
+    return scene
+
+
+def run(detector, seconds):
+    bus = SimulatedI2C(SimulatedMLX90640(scene=spot_heating))
+    mlx = MLX90640(bus)
+    mlx.clock = bus.now
+    mlx.sleep = bus.sleep
+    frame = np.zeros(768)
+    reasons = []
+    while bus.now() < seconds:
+        mlx.getFrame(frame)
+        if detector.update(frame, bus.now()):
+            reasons.append((round(bus.now()), detector.last_reason))
+    return reasons
+
+
+def test_stable_scene_skipped_until_it_changes():
+    detector = ChangeDetector(heartbeat=15.0)
+    reasons = run(detector, 40.0)
+
+    assert reasons[0][1] == FIRST
+    before = [reason for t, reason in reasons if t < 20]
+    assert before[1:] == [HEARTBEAT]  # Sensor noise alone is not a change
+    after = [reason for t, reason in reasons if t > 23]
+    assert after and set(after) == {CHANGE}
+    assert 0.0 < detector.noise < 0.5
+    assert detector.skipped > detector.processed
+
+
+def test_level_crossing_is_a_change():
+    detector = ChangeDetector(pixel_threshold=100.0, block_threshold=100.0, levels=(46.0,), heartbeat=1e9)
+    reasons = run(detector, 26.0)
+    # Processed only when one of the spot pixels goes over 46 degrees
+    assert reasons[0][1] == FIRST and len(reasons) > 1
+    assert all(reason == CHANGE and 21 <= t <= 25 for t, reason in reasons[1:])
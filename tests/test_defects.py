@@ -0,0 +1,58 @@
+import numpy as np
+import pytest
+
+from mlx90640_monitoring import batch
+from mlx90640_monitoring.adafruitmlx90640_librairie import MLX90640
+from mlx90640_monitoring.simulator import SimulatedI2C, SimulatedMLX90640
+
+BROKEN = 0  # Corner pixel, two direct neighbours
+OUTLIER = 11 * 32 + 14  # Edge of the hot spot
+
+
+def sensor():
+    device = SimulatedMLX90640()
+    device.eeprom[64 + BROKEN] = 0
+    device.eeprom[64 + OUTLIER] |= 0x0001
+    bus = SimulatedI2C(device)
+    mlx = MLX90640(bus)
+    mlx.clock = bus.now
+    mlx.sleep = bus.sleep
+    return mlx
+
+
+def test_defects_interpolated_from_neighbours():
+    mlx = sensor()
+    assert mlx.calibration.brokenPixels == [BROKEN]
+    assert mlx.calibration.outlierPixels == [OUTLIER]
+    assert list(mlx.calibration.defectPixels) == [BROKEN, OUTLIER]
+
+    frame = [0.0] * 768
+    mlx.getFrame(frame)
+    assert frame[BROKEN] == pytest.approx((frame[1] + frame[32]) / 2)
+    neighbours = [OUTLIER - 32, OUTLIER + 32, OUTLIER - 1, OUTLIER + 1]
+    assert frame[OUTLIER] == pytest.approx(sum(frame[p] for p in neighbours) / 4)
+    assert 25.0 < frame[OUTLIER] < 45.0
+
+
+def test_numpy_buffer_and_batch_agree_with_lists():
+    mlx = sensor()
+    subpages = []
+    read = mlx._GetFrameData
+
+    def recording_read(frameData):
+        status = read(frameData)
+        subpages.append(list(frameData))
+        return status
+
+    mlx._GetFrameData = recording_read
+    frame = [0.0] * 768
+    mlx.getFrame(frame)
+    array_frame = np.zeros(768)
+    mlx._GetFrameData = read
+    for subpage in subpages:
+        mlx._CalculateTo(subpage, mlx.emissivity, mlx.reflected_temperature, array_frame)
+    mlx._CorrectDefects(array_frame)
+
+    np.testing.assert_allclose(array_frame, frame)
+    cube = batch.convert(np.array(subpages), mlx.calibration, dtype=np.float64)
+    np.testing.assert_array_equal(cube[-1].ravel(), frame)
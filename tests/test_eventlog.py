@@ -0,0 +1,65 @@
+import io
+import json
+import time
+
+from mlx90640_monitoring.eventlog import EventLog
+
+
+def read(path):
+    with open(path, encoding="utf-8") as log:
+        return [json.loads(line) for line in log]
+
+
+def test_alarms_never_deduplicated(tmp_path):
+    path = str(tmp_path / "events.jsonl")
+    events = EventLog(path, {"status": 10.0}, echo=False)
+    assert events.log("alarm", "!!! ALARM CONFIRMED", max_temp=41.2)
+    assert events.log("alarm", "!!! ALARM CONFIRMED", max_temp=41.2)
+    assert events.log("reset", "Alarm reset")
+    assert events.log("reset", "Alarm reset")
+    events.close()
+
+    assert [(e["kind"], e["msg"]) for e in read(path)] == [
+        ("alarm", "!!! ALARM CONFIRMED"),
+        ("alarm", "!!! ALARM CONFIRMED"),
+        ("reset", "Alarm reset"),
+        ("reset", "Alarm reset"),
+    ]
+    assert read(path)[0]["max_temp"] == 41.2
+
+
+def test_rate_limited_kinds_report_suppressed(tmp_path):
+    path = str(tmp_path / "events.jsonl")
+    events = EventLog(path, {"status": 0.0}, echo=False)
+    assert events.log("status", "Max temp 25.0")
+    assert not events.log("status", "Max temp 25.0")  # Same as the last one
+    assert not events.log("status", "Max temp 25.0")
+    assert events.log("status", "Max temp 25.5")
+    events.close()
+
+    lines = read(path)
+    assert [e["msg"] for e in lines] == ["Max temp 25.0", "Max temp 25.5"]
+    assert lines[1]["suppressed"] == 2 and events.suppressed == 2
+
+
+
+def test_failed_writes_close_the_file(tmp_path):
+    opened = []
+
+    class FullCard(io.StringIO):
+        def write(self, text):
+            raise OSError(28, "No space left on device")
+
+    def open_full_card(stream, size):
+        opened.append(FullCard())
+        return opened[-1], 0
+
+    events = EventLog(str(tmp_path / "events.jsonl"), echo=False)
+    events._open = open_full_card
+    for i in range(3):
+        events.log("alarm", f"alarm {i}")
+        time.sleep(0.05)  # One write, and one failure, each
+    events.close()
+
+    assert events.errors == len(opened) >= 2
+    assert all(stream.closed for stream in opened)
@@ -0,0 +1,96 @@
+import numpy as np
+import pytest
+
+from mlx90640_monitoring.acquisition import SensorSupervisor
+from mlx90640_monitoring.adafruitmlx90640_librairie import MLX90640
+from mlx90640_monitoring.benchmark import run_integrity
+from mlx90640_monitoring.integrity import CONTROL, GAIN, PIXELS, VDD, FrameValidator
+from mlx90640_monitoring.simulator import SimulatedI2C, SimulatedMLX90640
+
+
+class Setup:
+    """Validated sensor whose next subpage read can be corrupted."""
+
+    def __init__(self):
+        bus = SimulatedI2C()
+        self.mlx = MLX90640(bus)
+        self.mlx.clock = bus.now
+        self.mlx.sleep = bus.sleep
+        self.mlx.validator = FrameValidator(self.mlx)
+        self.supervisor = SensorSupervisor(self.mlx, bus, lambda: bus, clock=bus.now, sleep=bus.sleep)
+        self.corrupt = None
+        read = self.mlx._GetFrameData
+
+        def corrupted_read(frameData):
+            status = read(frameData)
+            if self.corrupt is not None:
+                self.corrupt(frameData)
+                self.corrupt = None
+            return status
+
+        self.mlx._GetFrameData = corrupted_read
+        self.frame = [0.0] * 768
+        for _ in range(2):
+            self.supervisor.read(self.frame)
+
+    def read(self, corrupt):
+        self.corrupt = corrupt
+        self.supervisor.read(self.frame)
+        return np.array(self.frame)
+
+
+def subpage_pixels(frameData, count, start):
+    # Pixels measured by this subpage in chess mode, spread over the frame
+    pixel = np.arange(768)
+    measured = pixel[((pixel // 32) % 2 ^ pixel % 2) == frameData[833]]
+    return measured[start :: len(measured) // count][:count]
+
+
+def flip(*words):
+    def corrupt(frameData):
+        for word, mask in words:
+            frameData[word] ^= mask
+    return corrupt
+
+
+@pytest.mark.parametrize("reason, corrupt", [
+    (CONTROL, flip((832, 0x1000))),  # Reading pattern bit of the control register
+    (GAIN, flip((778, 0x4000))),
+    (VDD, flip((810, 0x0800))),
+])
+def test_corrupted_auxiliary_words_rejected(reason, corrupt):
+    setup = Setup()
+    frame = setup.read(corrupt)
+    assert setup.mlx.validator.rejected[reason] == 1
+    assert setup.mlx.validator.rejected_subpages == 1
+    np.testing.assert_allclose(frame, SimulatedMLX90640.default_scene(), atol=1.0)
+
+
+def test_isolated_pixels_repaired_and_many_rejected():
+    setup = Setup()
+    validator = setup.mlx.validator
+
+    # A pixel corrupted twice in a row would pass for a real change: each
+    # read corrupts other pixels
+    def spikes(count, start):
+        def corrupt(frameData):
+            for pixel in subpage_pixels(frameData, count, start):
+                frameData[pixel] ^= 0x0400  # About 90 degrees colder
+        return corrupt
+
+    frame = setup.read(spikes(3, 0))
+    assert validator.repaired == 3 and validator.rejected_subpages == 0
+    np.testing.assert_allclose(frame, SimulatedMLX90640.default_scene(), atol=1.0)
+
+    frame = setup.read(spikes(validator.max_repairs + 1, 5))
+    assert validator.rejected[PIXELS] == 1
+    np.testing.assert_allclose(frame, SimulatedMLX90640.default_scene(), atol=1.0)
+
+
+def test_bit_errors_kept_out_of_the_frames():
+    unchecked = run_integrity(False, 1e-4, 20)
+    checked = run_integrity(True, 1e-4, 20)
+    assert unchecked[2] == checked[2] > 0  # Same bit errors on the bus
+    assert unchecked[0] > 0 and unchecked[1] > 50
+    assert checked[1] < unchecked[1] / 10
+    assert checked[4].repaired > 0
@@ -0,0 +1,52 @@
+import numpy as np
+import pytest
+
+from mlx90640_monitoring.adafruitmlx90640_librairie import MLX90640
+from mlx90640_monitoring.pixelmaps import load_mask, pixel_map
+from mlx90640_monitoring.simulator import SimulatedI2C
+
+
+def frame_with(**settings):
+    bus = SimulatedI2C()
+    mlx = MLX90640(bus)
+    mlx.clock = bus.now
+    mlx.sleep = bus.sleep
+    for name, value in settings.items():
+        setattr(mlx, name, value)
+    frame = [0.0] * 768
+    mlx.getFrame(frame)
+    return np.array(frame)
+
+
+def test_mask_to_emissivity_map(tmp_path):
+    mask = np.zeros((24, 32), dtype=int)
+    mask[:, 16:] = 255
+    np.savetxt(tmp_path / "materials.txt", mask, fmt="%d")
+    emissivity = pixel_map(load_mask(str(tmp_path / "materials.txt")), {255: 0.5}, default=0.95)
+
+    assert len(emissivity) == 768
+    assert emissivity[0] == 0.95 and emissivity[16] == 0.5 and emissivity[767] == 0.5
+
+
+def test_maps_apply_per_pixel():
+    uniform = frame_with(emissivity=0.95)
+    assert np.array_equal(frame_with(emissivity=[0.95] * 768), uniform)
+
+    left = np.tile(np.arange(32) < 16, 24)
+    mapped = frame_with(emissivity=np.where(left, 0.95, 0.5).tolist())
+    np.testing.assert_array_equal(mapped[left], uniform[left])
+    # A low emissivity surface at the same reading is hotter than it looks
+    assert (mapped[~left] > uniform[~left]).all()
+
+    mapped = frame_with(reflected_temperature=np.where(left, 10.0, 40.0).tolist())
+    uniform = frame_with(reflected_temperature=10.0)
+    np.testing.assert_array_equal(mapped[left], uniform[left])
+    assert (mapped[~left] < uniform[~left]).all()
+
+
+def test_invalid_maps_rejected():
+    mlx = MLX90640(SimulatedI2C())
+    with pytest.raises(ValueError):
+        mlx.emissivity = [0.95] * 767
+    with pytest.raises(ValueError):
+        mlx.emissivity = [0.95] * 767 + [0.0]
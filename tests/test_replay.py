@@ -0,0 +1,94 @@
+import sys
+
+import numpy as np
+import pytest
+
+from mlx90640_monitoring import replay
+from mlx90640_monitoring.analysis import DisplayFilter
+from mlx90640_monitoring.adafruitmlx90640_librairie import MLX90640
+from mlx90640_monitoring.changes import ChangeDetector
+from mlx90640_monitoring.simulator import SimulatedI2C, SimulatedMLX90640
+
+
+def heating(t):
+    """25 C scene whose hot spot appears at 10 s and reaches 45 C at 20 s."""
+    scene = [25.0] * 768
+    for y in range(10, 14):
+        for x in range(14, 18):
+            scene[y * 32 + x] = 25.0 + 20.0 * min(1.0, max(0.0, (t - 10.0) / 10.0))
+    return scene
+
+
+@pytest.fixture(scope="module")
+def recording(tmp_path_factory):
+    bus = SimulatedI2C(SimulatedMLX90640(scene=heating))
+    mlx = MLX90640(bus)
+    mlx.clock = bus.now
+    mlx.sleep = bus.sleep
+    frames = []
+    frame = [0.0] * 768
+    for _ in range(90):  # 1 frame per second
+        mlx.getFrame(frame)
+        frames.append(list(frame))
+    path = tmp_path_factory.mktemp("recordings") / "heating.npy"
+    np.save(path, np.array(frames, dtype=np.float32))
+    return str(path)
+
+
+def test_replay_is_deterministic(recording):
+    loaded = replay.load_recording(recording, fps=1.0)
+    parameters = dict(replay.PARAMETERS, threshold=35.0, required_duration=10.0)
+    first = replay.replay(loaded, parameters, onset_temperature=35.0)
+    again = replay.replay(replay.load_recording(recording, fps=1.0), parameters, onset_temperature=35.0)
+    assert first == again
+
+    alarms, latency, _, analysed = first
+    assert len(alarms) == 1 and 0.0 < latency <= parameters["required_duration"] + 1.0
+    assert analysed < len(loaded.frames)  # Unchanged frames reuse the last analysis
+
+
+def test_display_scale_converges_despite_gating(recording):
+    loaded = replay.load_recording(recording, fps=1.0)
+    # Image updated on every frame once the scene changed
+    every_frame = replay.replay(loaded, dict(replay.PARAMETERS, display_settle=1e9), onset_temperature=35.0)[2]
+    # As image_VFINAL.py does, frames of a steady scene are skipped only once
+    # the colour scale reached its target
+    gated = replay.replay(loaded, dict(replay.PARAMETERS), onset_temperature=35.0)[2]
+    assert every_frame is not None and gated is not None
+    assert gated <= every_frame + 2.0
+
+
+def test_static_scene_scale_leaves_initial_range():
+    frame = np.array(SimulatedMLX90640.default_scene())
+    detector = ChangeDetector(heartbeat=10.0, settle=4.0)
+    display = DisplayFilter(range_=(20.0, 35.0))
+    updates = 0
+    for i in range(240):  # 1 minute at 4 frames per second
+        changed = detector.update(frame, i * 0.25)
+        if changed or not display.converged(0.5):
+            display.update(frame)
+            updates += 1
+    target = display.blur(frame.reshape(24, 32))
+    assert abs(display.minimum - target.min()) <= 0.6
+    assert abs(display.maximum - target.max()) <= 0.6
+    # More frames than the change detection lets through, far fewer than all
+    assert detector.processed < updates < 120
+
+
+def test_sweep_results_and_onset(recording, monkeypatch, capsys, tmp_path):
+    replay._load([recording], 1.0)
+    sets = replay.sweep(["threshold=30,35", "required_duration=5,10"])
+    assert len(sets) == 4
+    results = [replay.run(s, 32.0, 1.0) for s in sets]
+    assert results == [replay.run(s, 32.0, 1.0) for s in sets]
+    assert all(r.missed == 0 and r.false_alarms == 0 for r in results)
+
+    monkeypatch.setattr(sys, "argv", ["mlx-replay", recording, "--fps", "1", "--set", "threshold=30,35"])
+    with pytest.raises(SystemExit):
+        replay.main()
+    assert "--onset is required" in capsys.readouterr().err
+
+    monkeypatch.setattr(sys, "argv", ["mlx-replay", recording, "--fps", "1", "--set", "required_duration=5,10",
+                                      "--workers", "1"])
+    replay.main()
+    assert "hottest pixel reaching 20.0 C" in capsys.readouterr().out
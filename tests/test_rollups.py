@@ -0,0 +1,54 @@
+import sqlite3
+
+import numpy as np
+import pytest
+
+from mlx90640_monitoring.rollups import RollupEngine
+
+REGIONS = {"left": (0, 24, 0, 16), "right": (0, 24, 16, 32)}
+
+
+def frames(seconds, fps=2):
+    # Left half at 20 degrees, right half at 30 with one 50 degree pixel
+    image = np.full((24, 32), 20.0)
+    image[:, 16:] = 30.0
+    image[5, 20] = 50.0
+    for i in range(int(seconds * fps)):
+        yield image.ravel(), 1000.0 * 60 + i / fps
+
+
+def test_buckets_persisted_and_queried(tmp_path):
+    database = str(tmp_path / "rollups.sqlite")
+    engine = RollupEngine(database, REGIONS, threshold=25.0, batch_size=4)
+    for frame, stamp in frames(180):
+        engine.update(frame, stamp)
+    engine.close()
+
+    assert engine.rows_dropped == 0
+    with sqlite3.connect(database) as db:
+        minutes = db.execute("SELECT COUNT(*) FROM rollup WHERE resolution = 60").fetchone()[0]
+        seconds = db.execute("SELECT COUNT(*) FROM rollup WHERE resolution = 1").fetchone()[0]
+    assert minutes == 3 * len(REGIONS)
+    assert seconds == 0  # 1 s buckets stay in memory
+
+    rows = RollupEngine(database, REGIONS, threshold=25.0).query("right", 60, since=0)
+    assert [row[0] for row in rows] == [60000.0, 60060.0, 60120.0]
+    start, maximum, mean, hot_mean, hot_max, samples = rows[0]
+    assert maximum == 50.0
+    assert mean == pytest.approx((30.0 * 383 + 50.0) / 384)
+    assert hot_mean == hot_max == 384
+    assert samples == 120
+
+
+def test_on_close_and_memory_ring():
+    closed = []
+    engine = RollupEngine(None, REGIONS, threshold=25.0)
+    engine.on_close = lambda seconds, rows: closed.append((seconds, rows))
+    for frame, stamp in frames(2.5):
+        engine.update(frame, stamp)
+
+    # Two whole seconds closed so far, one row per region each
+    assert [seconds for seconds, _ in closed] == [1, 1]
+    assert [row[0] for row in closed[0][1]] == ["left", "right"]
+    left = engine.query("left", 1, since=0)
+    assert [(row[1], row[2], row[4], row[5]) for row in left] == [(20.0, 20.0, 0, 2)] * 2
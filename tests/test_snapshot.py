@@ -0,0 +1,51 @@
+import time
+
+import numpy as np
+
+from mlx90640_monitoring.snapshot import SnapshotRecorder
+
+
+def test_window_around_trigger(tmp_path):
+    recorder = SnapshotRecorder(str(tmp_path), pre_seconds=5.0, post_seconds=2.0, max_fps=2.0)
+    for i in range(40):  # 20 s at 2 frames per second, frame i filled with i
+        stamp = i * 0.5
+        recorder.push(np.full(768, i, dtype=np.float32), stamp)
+        if stamp == 10.0:
+            recorder.trigger(stamp)
+    recorder.close()
+
+    assert recorder.saved == 1 and recorder.dropped == 0
+    with np.load(recorder.last_path) as snapshot:
+        offsets = snapshot["offsets"]
+        frames = snapshot["frames"]
+        assert str(snapshot["label"]) == "alarm"
+    assert offsets[0] == -5.0 and offsets[-1] == 2.0
+    np.testing.assert_array_equal(np.diff(offsets), 0.5)
+    # Oldest first, each frame matching its time
+    np.testing.assert_array_equal(frames[:, 0], 20 + offsets * 2)
+
+
+def test_close_writes_open_window(tmp_path):
+    recorder = SnapshotRecorder(str(tmp_path), pre_seconds=1.0, post_seconds=10.0)
+    for i in range(4):
+        recorder.push(np.zeros(768), i * 0.5)
+    recorder.trigger(1.5, label="manual")
+    recorder.close()
+
+    assert recorder.saved == 1
+    assert recorder.last_path.startswith(str(tmp_path / "manual_"))
+    with np.load(recorder.last_path) as snapshot:
+        np.testing.assert_array_equal(snapshot["offsets"], [-1.0, -0.5, 0.0])
+
+
+def test_triggers_in_the_same_second_kept(tmp_path, monkeypatch):
+    monkeypatch.setattr(time, "time", lambda: 1718000000.25)
+    recorder = SnapshotRecorder(str(tmp_path), pre_seconds=1.0, post_seconds=0.0, max_fps=2.0)
+    for i in range(3):  # Fewer windows than the writer queue holds
+        recorder.push(np.full(768, i, dtype=np.float32), i * 0.5)
+        recorder.trigger(i * 0.5)
+    recorder.close()
+
+    names = sorted(p.name for p in tmp_path.iterdir())
+    assert recorder.saved == 3 and len(names) == 3
+    assert names[0].startswith("alarm_") and names[0].endswith("_250.npz")
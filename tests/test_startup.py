@@ -0,0 +1,55 @@
+import io
+import os
+import subprocess
+import sys
+
+import numpy as np
+import pytest
+
+from mlx90640_monitoring.palettes import NAMES, get_palette
+from mlx90640_monitoring.startup import StartupProfile
+
+
+def test_precomputed_palettes():
+    for name in NAMES:
+        palette = get_palette(name)
+        assert palette.shape == (256, 3) and palette.dtype == np.uint8
+    jet = get_palette("jet")
+    assert jet[0].tolist() == [0, 0, 127] and jet[-1].tolist() == [127, 0, 0]
+
+
+def test_palettes_match_matplotlib():
+    pytest.importorskip("matplotlib")
+    from mlx90640_monitoring.palettes import _from_matplotlib
+
+    for name in NAMES:
+        np.testing.assert_array_equal(get_palette(name), _from_matplotlib(name))
+
+
+def test_image_pipeline_imports_stay_light():
+    code = (
+        "import sys\n"
+        "from mlx90640_monitoring import analysis, changes, palettes\n"
+        "palettes.get_palette('jet')\n"
+        "print(' '.join(m for m in ('matplotlib', 'scipy', 'cmapy') if m in sys.modules))\n"
+    )
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    result = subprocess.run([sys.executable, "-c", code], cwd=root, capture_output=True, text=True, check=True)
+    assert result.stdout.strip() == ""
+
+
+def test_profile_report():
+    profile = StartupProfile()
+    profile.mark("imports")
+    profile.mark("sensor")
+    stream = io.StringIO()
+    profile.report(stream)
+    lines = stream.getvalue().splitlines()
+    assert [line.split()[0] for line in lines][-2:] == ["imports", "sensor"]
+    assert lines[-1].split()[2].startswith("+")
+
+    disabled = StartupProfile(enabled=False)
+    disabled.mark("imports")
+    stream = io.StringIO()
+    disabled.report(stream)
+    assert disabled.marks == [] and stream.getvalue() == ""
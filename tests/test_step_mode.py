@@ -0,0 +1,38 @@
+import pytest
+
+from mlx90640_monitoring.adafruitmlx90640_librairie import MLX90640
+from mlx90640_monitoring.benchmark import run_duty
+from mlx90640_monitoring.simulator import SimulatedI2C
+
+
+def test_step_mode_measures_only_on_request():
+    continuous = run_duty(step=False, interval=5.0, seconds=60.0, rate=2)
+    step = run_duty(step=True, interval=5.0, seconds=60.0, rate=2)
+
+    assert step[0] == continuous[0]  # Same frames taken
+    assert continuous[4] == pytest.approx(1.0, abs=0.05)
+    assert step[4] < 0.25  # The sensor idles between frames
+    assert step[1] < continuous[1]  # No polling of the status register meanwhile
+
+
+def test_step_frames_and_simulated_sleeps():
+    bus = SimulatedI2C()
+    mlx = MLX90640(bus)
+    mlx.clock = bus.now
+    sleeps = []
+
+    def sleep(seconds):
+        sleeps.append(seconds)
+        bus.sleep(seconds)
+
+    mlx.sleep = sleep
+    mlx.step_mode = True
+    assert mlx.step_mode
+    assert 0.001 in sleeps  # Register writes wait on the driver's clock
+
+    frame = [0.0] * 768
+    start = bus.now()
+    mlx.getFrame(frame)
+    assert bus.now() - start >= 2 * mlx.subpage_period
+    assert frame[0] == pytest.approx(25.0, abs=0.5)
+    assert frame[11 * 32 + 15] == pytest.approx(45.0, abs=0.5)
@@ -0,0 +1,38 @@
+import math
+
+from mlx90640_monitoring.adafruitmlx90640_librairie import MLX90640
+from mlx90640_monitoring.simulator import SimulatedI2C
+
+
+def sensor():
+    bus = SimulatedI2C()
+    mlx = MLX90640(bus)
+    mlx.clock = bus.now
+    mlx.sleep = bus.sleep
+    return mlx, bus
+
+
+def test_back_to_back_frames_drop_nothing():
+    mlx, _ = sensor()
+    assert all(math.isinf(age) for age in mlx.pixel_age())
+    frame = [0.0] * 768
+    for _ in range(4):
+        mlx.getFrame(frame)
+
+    assert mlx.subpages_read == 8
+    assert mlx.dropped_subpages == 0 and mlx.duplicated_subpages == 0
+    # One subpage period at most, plus the time to read the subpage
+    assert max(mlx.pixel_age()) <= mlx.subpage_period + 0.01
+
+
+def test_slow_loop_counts_dropped_subpages():
+    mlx, bus = sensor()
+    frame = [0.0] * 768
+    mlx.getFrame(frame)
+    bus.sleep(5 * mlx.subpage_period)  # The sensor keeps producing subpages meanwhile
+    mlx.getFrame(frame)
+
+    assert mlx.subpages_read == 4
+    assert mlx.dropped_subpages == 4
+    ages = mlx.pixel_age()
+    assert min(ages) == 0.0 and max(ages) <= mlx.subpage_period + 0.01
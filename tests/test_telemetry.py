@@ -0,0 +1,161 @@
+import json
+import os
+import socket
+import time
+import types
+import zlib
+
+import pytest
+
+from mlx90640_monitoring import telemetry
+from mlx90640_monitoring.telemetry import TelemetryPublisher, _DiskQueue, downsample
+
+
+class FakeInfo:
+    def __init__(self, client):
+        self._client = client
+
+    def is_published(self):
+        return self._client.ack
+
+
+class FakeClient:
+    """paho client keeping what it publishes, acknowledged when ``ack`` is set."""
+
+    def __init__(self, *args):
+        self.ack = True
+        self.sent = []
+
+    def publish(self, topic, payload, qos=0):
+        self.sent.append((topic, payload))
+        return FakeInfo(self)
+
+    def __getattr__(self, name):  # connect_async, loop_start, disconnect...
+        return lambda *args, **kwargs: None
+
+
+@pytest.fixture
+def fake_mqtt(monkeypatch):
+    monkeypatch.setattr(telemetry, "mqtt", types.SimpleNamespace(Client=FakeClient))
+
+
+def wait_for(condition, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not condition() and time.monotonic() < deadline:
+        time.sleep(0.01)
+    return condition()
+
+
+def decode(sent):
+    return [json.loads(zlib.decompress(payload)) for topic, payload in sent]
+
+
+def test_disk_queue_order_bound_and_restart(tmp_path):
+    directory = str(tmp_path / "queue")
+    spool = _DiskQueue(directory, max_bytes=250)
+    for i in range(5):
+        spool.append(bytes([i]) * 100, "json")
+
+    # Oldest batches dropped to stay under max_bytes, the newest one kept
+    assert len(spool) == 2 and spool.dropped == 3
+    name, payload = spool.oldest()
+    assert name == "000000000003.json" and payload == bytes([3]) * 100
+    assert not [n for n in os.listdir(directory) if n.endswith(".tmp")]
+
+    # Batches survive a restart, numbering goes on
+    spool = _DiskQueue(directory, max_bytes=250)
+    assert len(spool) == 2 and spool.next_seq == 5
+    spool.remove(name)
+    assert spool.oldest()[0] == "000000000004.json"
+    spool.remove("000000000004.json")
+    assert spool.oldest() is None and os.listdir(directory) == []
+
+
+def test_downsample():
+    frame = [float(i // 32) for i in range(768)]  # Row number
+    values = downsample(frame, 4)
+    assert len(values) == 48
+    assert values[:8] == [1.5] * 8 and values[-1] == 21.5
+
+
+def test_batches_kept_on_disk_while_the_broker_is_down(tmp_path):
+    pytest.importorskip("paho.mqtt.client")
+    with socket.socket() as unused:  # Nothing listens on this port
+        unused.bind(("127.0.0.1", 0))
+        port = unused.getsockname()[1]
+    directory = str(tmp_path / "queue")
+    telemetry = TelemetryPublisher("127.0.0.1", port, "mlx90640/test", "test-site", directory)
+    assert telemetry.publish("alarm", max_temp=41.2)
+    assert telemetry.publish("status", max_temp=30.0)
+    telemetry.close(timeout=2.0)
+
+    assert telemetry.published == 0 and telemetry.pending >= 1
+    spool = _DiskQueue(directory, 10 << 20)
+    messages = []
+    while spool.oldest() is not None:
+        name, payload = spool.oldest()
+        batch = json.loads(zlib.decompress(payload))
+        assert batch["site"] == "test-site"
+        messages.extend(batch["messages"])
+        spool.remove(name)
+    assert [(m["kind"], m["max_temp"]) for m in messages] == [("alarm", 41.2), ("status", 30.0)]
+
+
+def test_batches_sent_from_memory_while_connected(tmp_path, fake_mqtt):
+    directory = str(tmp_path / "queue")
+    publisher = TelemetryPublisher("broker", topic="mlx90640/test", site="test-site", queue_dir=directory)
+    publisher._on_connect(publisher._client, None, {}, 0)
+    writes = []
+    append = publisher._spool.append
+    publisher._spool.append = lambda *args: writes.append(args) or append(*args)
+    for value in (41.2, 42.0):
+        assert publisher.publish("alarm", max_temp=value)
+        assert wait_for(lambda: len(publisher._client.sent) == 1 + (value == 42.0))
+    publisher.close()
+
+    batches = decode(publisher._client.sent)
+    assert [b["seq"] for b in batches] == [0, 1]
+    assert [b["messages"][0]["max_temp"] for b in batches] == [41.2, 42.0]
+    assert {topic for topic, payload in publisher._client.sent} == {"mlx90640/test/json.zlib"}
+    assert publisher.published == 2 and publisher.errors == 0
+    assert publisher.bytes_sent == sum(len(payload) for topic, payload in publisher._client.sent)
+    assert writes == [] and os.listdir(directory) == []
+
+
+def test_spooled_batches_sent_in_order_once_reconnected(tmp_path, fake_mqtt):
+    directory = str(tmp_path / "queue")
+    publisher = TelemetryPublisher("broker", site="test-site", queue_dir=directory)
+    for value in (41.2, 42.0, 43.5):  # Broker down: on disk
+        assert publisher.publish("alarm", max_temp=value)
+        assert wait_for(lambda: publisher.pending == 1 + [41.2, 42.0, 43.5].index(value))
+    assert len(os.listdir(directory)) == 3
+
+    publisher._on_connect(publisher._client, None, {}, 0)
+    assert wait_for(lambda: publisher.pending == 0)
+    assert publisher.publish("alarm", max_temp=44.0)  # Then straight from memory
+    assert wait_for(lambda: len(publisher._client.sent) == 4)
+    publisher.close()
+
+    batches = decode(publisher._client.sent)
+    assert [b["seq"] for b in batches] == [0, 1, 2, 3]
+    assert [b["messages"][0]["max_temp"] for b in batches] == [41.2, 42.0, 43.5, 44.0]
+    assert publisher.published == 4 and os.listdir(directory) == []
+    assert publisher.bytes_sent == sum(len(payload) for topic, payload in publisher._client.sent)
+
+
+def test_unacknowledged_batch_spilled_to_disk(tmp_path, fake_mqtt):
+    directory = str(tmp_path / "queue")
+    publisher = TelemetryPublisher("broker", queue_dir=directory, compress=False, ack_timeout=0.1)
+    publisher._on_connect(publisher._client, None, {}, 0)
+    publisher._client.ack = False
+    assert publisher.publish("alarm", max_temp=41.2)
+    assert wait_for(lambda: publisher.pending == 1)
+    assert publisher.published == 0 and publisher.errors >= 1
+
+    publisher._client.ack = True  # Acknowledged on the retry
+    assert wait_for(lambda: publisher.pending == 0)
+    publisher.close()
+    # The same batch published again until acknowledged
+    ((topic, payload),) = set(publisher._client.sent)
+    assert topic == "mlx90640/json" and json.loads(payload)["messages"][0]["max_temp"] == 41.2
+    assert publisher.published == 1 and os.listdir(directory) == []
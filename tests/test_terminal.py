@@ -0,0 +1,88 @@
+import io
+import re
+
+import numpy as np
+
+from mlx90640_monitoring.adafruitmlx90640_librairie import MLX90640
+from mlx90640_monitoring.simulator import SimulatedI2C
+from mlx90640_monitoring.terminal import ASCII, BOTH, TEMPERATURES, TerminalView
+
+
+class Terminal(io.StringIO):
+    def isatty(self):
+        return True
+
+
+def screen(output, rows=27, columns=200):
+    """Characters left on a VT100 screen by ``output``, colours ignored."""
+    cells = [[" "] * columns for _ in range(rows)]
+    row = column = 0
+    for sequence, text in re.findall(r"(\x1b\[[0-9;]*[A-Za-z]|\x1b[78])|([^\x1b])", output):
+        if sequence.endswith("H"):
+            row, column = (int(n) - 1 for n in sequence[2:-1].split(";"))
+        elif sequence.endswith("2J"):
+            cells = [[" "] * columns for _ in range(rows)]
+        elif text and text != "\n" and row < rows:
+            cells[row][column] = text
+            column += 1
+    return ["".join(line).rstrip() for line in cells]
+
+
+def simulated_frame():
+    bus = SimulatedI2C()
+    mlx = MLX90640(bus)
+    mlx.clock = bus.now
+    mlx.sleep = bus.sleep
+    frame = np.zeros(768)
+    mlx.getFrame(frame)
+    return frame
+
+
+def test_plain_output_when_not_a_terminal():
+    stream = io.StringIO()
+    view = TerminalView(ASCII, colour=False, stream=stream)
+    assert view.draw(simulated_frame(), "status", now=0.0)
+    lines = stream.getvalue().splitlines()
+    assert lines[0] == "status" and len(lines) == 25
+    # 25 C background, on the boundary of two levels, and the 45 C hot spot
+    assert lines[1 + 11][14:18] == "&&&&"
+    assert set(lines[1 + 11][:14] + lines[1 + 11][18:]) <= set("-*")
+
+
+def test_only_changed_cells_redrawn():
+    stream = Terminal()
+    view = TerminalView(TEMPERATURES, colour=True, max_fps=2.0, stream=stream)
+    frame = simulated_frame()
+    view.draw(frame, "first", now=0.0)
+    first = stream.getvalue()
+    assert not view.draw(frame, "skipped", now=0.1)  # Rate-limited
+
+    warmer = frame.copy()
+    warmer[11 * 32 + 15] += 5.0
+    warmer[0] += 0.1  # Within the deadband
+    view.draw(warmer, "second", now=1.0)
+    second = stream.getvalue()[len(first):]
+    assert len(second) < 60
+
+    shown = screen(first + second)
+    assert shown[0] == "second"
+    assert shown[2].startswith("%6.1f" % frame[0])
+    assert shown[2 + 11][15 * 6 : 16 * 6] == "%6.1f" % warmer[11 * 32 + 15]
+    assert (view.drawn, view.skipped) == (2, 1)
+
+
+def test_both_grids_shown():
+    frame = np.full(768, 22.0)
+    frame[5] = 40.0
+    stream = io.StringIO()
+    TerminalView(BOTH, colour=False, stream=stream).draw(frame, "status", now=0.0)
+    assert stream.getvalue().splitlines()[1].startswith("  22.0.  22.0.  22.0.  22.0.  22.0.  40.0&")
+
+    stream = Terminal()
+    view = TerminalView(BOTH, colour=True, stream=stream)
+    view.draw(frame, "first", now=0.0)
+    first = stream.getvalue()
+    frame[6] = 38.0
+    view.draw(frame, "first", now=1.0)
+    shown = screen(first + stream.getvalue()[len(first):], columns=240)
+    assert shown[2][5 * 7 : 7 * 7] == "  40.0&  38.0&"
@@ -0,0 +1,59 @@
+import pytest
+
+from mlx90640_monitoring import tune
+from mlx90640_monitoring.adafruitmlx90640_librairie import MLX90640, ReadingPattern, RefreshRate, Resolution
+from mlx90640_monitoring.simulator import SimulatedI2C
+
+
+def sensor():
+    bus = SimulatedI2C()
+    mlx = MLX90640(bus)
+    mlx.clock = bus.now
+    mlx.sleep = bus.sleep
+    return mlx, bus
+
+
+def test_controls_share_the_control_register():
+    mlx, _ = sensor()
+    mlx.refresh_rate = RefreshRate.REFRESH_4_HZ
+    mlx.resolution = Resolution.ADC_16_BIT
+    mlx.reading_pattern = ReadingPattern.INTERLEAVED
+
+    assert mlx.refresh_rate == RefreshRate.REFRESH_4_HZ
+    assert mlx.resolution == Resolution.ADC_16_BIT
+    assert mlx.reading_pattern == ReadingPattern.INTERLEAVED
+    assert mlx.subpage_period == 0.25
+
+
+@pytest.mark.parametrize("pattern", [ReadingPattern.CHESS, ReadingPattern.INTERLEAVED])
+def test_lower_resolution_is_noisier(pattern):
+    netd = {}
+    for bits in (Resolution.ADC_16_BIT, Resolution.ADC_19_BIT):
+        mlx, bus = sensor()
+        mlx.resolution = bits
+        mlx.reading_pattern = pattern
+        m = tune.measure(mlx, frames=8, settle=2, clock=bus.now)
+        assert m.bits == 16 + bits and m.dropped == 0
+        netd[bits] = m.netd
+
+        frame = [0.0] * 768
+        mlx.getFrame(frame)
+        assert frame[0] == pytest.approx(25.0, abs=0.5)
+        assert frame[10 * 32 + 15] == pytest.approx(45.0, abs=0.5)  # Hot spot of the default scene
+    assert netd[Resolution.ADC_16_BIT] > netd[Resolution.ADC_19_BIT]
+
+
+def test_recommend_fastest_sustainable_under_target():
+    def m(rate, netd, i2c, dropped=0):
+        return tune.Measurement(rate, 18, 400000, netd, i2c, 0.01, dropped)
+
+    results = [
+        m(16, 0.1, 0.1),  # Transfer longer than a subpage period
+        m(8, 0.3, 0.01),  # Too noisy
+        m(4, 0.15, 0.05, dropped=2),
+        m(4, 0.15, 0.02),
+        m(4, 0.1, 0.03),
+        m(2, 0.05, 0.01),
+    ]
+    assert tune.recommend(results, target_netd=0.2) == results[3]
+    assert tune.recommend(results, target_netd=0.01) is None